@@ -0,0 +1,391 @@
+import csv
+import ssl
+import json
+import time
+import random
+import asyncio
+import argparse
+import bisect
+import datetime
+from collections import Counter
+from urllib.parse import urlparse
+
+
+class LatencyHistogram:
+    """
+    HDR 방식의 로그-선형 지연 시간 히스토그램 (마이크로초 단위).
+    2의 거듭제곱 구간마다 2 ** sub_bucket_bits 개의 하위 버킷을 두어
+    전 구간에서 약 1 / 2 ** sub_bucket_bits 의 상대 오차를 유지합니다.
+    """
+    def __init__(self, sub_bucket_bits=7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = Counter()
+        self.total = 0
+        self.max = 0
+
+    def bucket(self, value):
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return (value >> shift) << shift
+
+    def record(self, seconds):
+        value = max(int(seconds * 1_000_000), 0)
+        self.counts[self.bucket(value)] += 1
+        self.total += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        if not self.total:
+            return 0.0
+        rank = max(int(round(self.total * q / 100)), 1)
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= rank:
+                return value / 1000
+        return self.max / 1000
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        return {
+            "count": self.total,
+            **{f"p{q}_ms": round(self.percentile(q), 3) for q in percentiles},
+            "max_ms": round(self.max / 1000, 3),
+        }
+
+    def buckets(self):
+        """ 리포트용 (상한 ms, 누적 비율) 목록 """
+        seen = 0
+        result = []
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            result.append((round(value / 1000, 3), round(seen / self.total, 6)))
+        return result
+
+
+class UserSampler:
+    """ 요청 대상 user_id 분포 (uniform / zipf / replay) """
+    def __init__(
+        self,
+        distribution,
+        num_users=10000,
+        zipf_s=1.1,
+        replay_path=None,
+        seed=0
+    ):
+        self.distribution = distribution
+        self.rng = random.Random(seed)
+        if distribution == "uniform":
+            self.num_users = num_users
+        elif distribution == "zipf":
+            weights = [1 / (rank ** zipf_s) for rank in range(1, num_users + 1)]
+            total = sum(weights)
+            cumulative = 0.0
+            self.cdf = []
+            for weight in weights:
+                cumulative += weight / total
+                self.cdf.append(cumulative)
+            # 인기 순위와 user_id가 일치하지 않도록 섞어줍니다
+            self.ranked_users = list(range(num_users))
+            self.rng.shuffle(self.ranked_users)
+        elif distribution == "replay":
+            with open(replay_path, "r") as f:
+                self.replay = [row["user_id"] for row in csv.DictReader(f)]
+            self.position = 0
+        else:
+            raise ValueError(f"지원하지 않는 분포입니다 : {distribution}")
+
+    def sample(self):
+        if self.distribution == "uniform":
+            return self.rng.randrange(self.num_users)
+        if self.distribution == "zipf":
+            index = bisect.bisect_left(self.cdf, self.rng.random())
+            return self.ranked_users[min(index, len(self.ranked_users) - 1)]
+        user = self.replay[self.position % len(self.replay)]
+        self.position += 1
+        return user
+
+
+class ConnectionPool:
+    """ keep-alive HTTP/1.1 커넥션 풀 """
+    def __init__(self, host, port, use_ssl, size):
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if use_ssl else None
+        self.idle = asyncio.Queue()
+        self.slots = asyncio.Semaphore(size)
+
+    async def acquire(self):
+        await self.slots.acquire()
+        if not self.idle.empty():
+            return self.idle.get_nowait()
+        try:
+            return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, connection, reusable=True):
+        if reusable:
+            self.idle.put_nowait(connection)
+        else:
+            connection[1].close()
+        self.slots.release()
+
+    async def close(self):
+        while not self.idle.empty():
+            _, writer = self.idle.get_nowait()
+            writer.close()
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("서버가 연결을 종료했습니다")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = b""
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if size == 0:
+                await reader.readline()
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers, body
+
+
+class LoadTest:
+    """
+    개루프(open-loop) 고정 비율 부하 생성기.
+    요청은 응답 여부와 무관하게 예정된 시각에 출발하며, 지연 시간은 예정 시각부터
+    측정하므로 서버가 밀릴 때의 대기 시간(coordinated omission)도 포함됩니다.
+    """
+    def __init__(
+        self,
+        url,
+        sampler,
+        rate,
+        duration,
+        connections,
+        headers=None,
+        timeout=10
+    ):
+        parsed = urlparse(url)
+        self.url = url
+        self.path = parsed.path or "/"
+        self.host = parsed.hostname
+        self.use_ssl = parsed.scheme == "https"
+        self.port = parsed.port or (443 if self.use_ssl else 80)
+        self.sampler = sampler
+        self.rate = rate
+        self.duration = duration
+        self.connections = connections
+        self.headers = headers or {}
+        self.timeout = timeout
+
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.status_counts = Counter()
+        self.cache_counts = Counter()
+        self.user_counts = Counter()
+        self.errors = Counter()
+
+    def make_request(self, user):
+        lines = [
+            f"GET {self.path}?user={user} HTTP/1.1",
+            f"Host: {self.host}",
+            "Connection: keep-alive",
+            *[f"{key}: {value}" for key, value in self.headers.items()],
+        ]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def send(self, pool, scheduled_at, user):
+        self.user_counts[user] += 1
+        try:
+            connection = await pool.acquire()
+        except Exception as e:
+            self.errors[type(e).__name__] += 1
+            return
+
+        reusable = False
+        try:
+            sent_at = time.perf_counter()
+            reader, writer = connection
+            writer.write(self.make_request(user))
+            await writer.drain()
+            status, headers, _ = await asyncio.wait_for(
+                read_response(reader), timeout=self.timeout
+            )
+            finished_at = time.perf_counter()
+            reusable = headers.get("connection", "").lower() != "close"
+
+            self.latency.record(finished_at - scheduled_at)
+            self.service_time.record(finished_at - sent_at)
+            self.status_counts[status] += 1
+            if "x-cache" in headers:
+                self.cache_counts[headers["x-cache"].upper()] += 1
+        except Exception as e:
+            self.errors[type(e).__name__] += 1
+        finally:
+            pool.release(connection, reusable=reusable)
+
+    async def run(self):
+        pool = ConnectionPool(self.host, self.port, self.use_ssl, self.connections)
+        loop = asyncio.get_running_loop()
+        total_requests = int(self.rate * self.duration)
+        started_at = time.perf_counter()
+        tasks = []
+        for i in range(total_requests):
+            scheduled_at = started_at + i / self.rate
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(loop.create_task(
+                self.send(pool, scheduled_at, self.sampler.sample())
+            ))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started_at
+        await pool.close()
+        return self.report(total_requests, elapsed)
+
+    def report(self, total_requests, elapsed):
+        top_users = self.user_counts.most_common(10)
+        cache_total = sum(self.cache_counts.values())
+        return {
+            "created_at": datetime.datetime.utcnow().isoformat(),
+            "target": {
+                "url": self.url,
+                "distribution": self.sampler.distribution,
+                "rate": self.rate,
+                "duration": self.duration,
+                "connections": self.connections,
+            },
+            "requests": total_requests,
+            "completed": self.latency.total,
+            "elapsed_seconds": round(elapsed, 3),
+            "achieved_rate": round(self.latency.total / elapsed, 2) if elapsed else 0,
+            "status": {str(k): v for k, v in sorted(self.status_counts.items())},
+            "errors": dict(self.errors),
+            "latency": self.latency.summary(),
+            "service_time": self.service_time.summary(),
+            "latency_histogram": self.latency.buckets(),
+            "keys": {
+                "unique_users": len(self.user_counts),
+                "top_users": [[str(user), count] for user, count in top_users],
+                "top_user_share": round(
+                    top_users[0][1] / total_requests, 4
+                ) if top_users else 0,
+            },
+            "cache": {
+                **dict(self.cache_counts),
+                "hit_ratio": round(
+                    self.cache_counts["HIT"] / cache_total, 4
+                ) if cache_total else None,
+            },
+        }
+
+
+def to_markdown(report):
+    latency = report["latency"]
+    service_time = report["service_time"]
+    rows = [
+        "# Load Test Report",
+        "",
+        f"- url : `{report['target']['url']}`",
+        f"- distribution : {report['target']['distribution']}",
+        f"- target rate : {report['target']['rate']} req/s "
+        f"(achieved {report['achieved_rate']} req/s)",
+        f"- requests : {report['completed']} / {report['requests']}",
+        f"- status : {report['status']}",
+        f"- errors : {report['errors'] or '-'}",
+        f"- unique users : {report['keys']['unique_users']} "
+        f"(top user share {report['keys']['top_user_share']:.2%})",
+        f"- cache hit ratio : {report['cache']['hit_ratio']}",
+        "",
+        "| metric | " + " | ".join(k for k in latency if k != "count") + " |",
+        "|---|" + "---|" * (len(latency) - 1),
+        "| latency | " + " | ".join(
+            str(v) for k, v in latency.items() if k != "count"
+        ) + " |",
+        "| service time | " + " | ".join(
+            str(v) for k, v in service_time.items() if k != "count"
+        ) + " |",
+    ]
+    return "\n".join(rows) + "\n"
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", type=str, default=None)
+    parser.add_argument("--local", action="store_true")
+    parser.add_argument("--rate", type=float, default=50)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--connections", type=int, default=5)
+    parser.add_argument(
+        "--distribution", type=str, default="zipf", choices=["uniform", "zipf", "replay"]
+    )
+    parser.add_argument("--num_users", type=int, default=10000)
+    parser.add_argument("--zipf_s", type=float, default=1.1)
+    parser.add_argument(
+        "--replay_path", type=str, default="local/input/data/watch_log.csv"
+    )
+    parser.add_argument("--header", type=str, action="append", default=[])
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report_json", type=str, default="load_test_report.json")
+    parser.add_argument("--report_md", type=str, default="load_test_report.md")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_arguments()
+
+    server = None
+    url = args.url
+    if args.local:
+        from stub_server import start_background_server
+        server, base_url = start_background_server()
+        url = f"{base_url}/like/movie"
+    if not url:
+        raise ValueError("--url 또는 --local 이 필요합니다")
+
+    headers = dict(
+        (key.strip(), value.strip())
+        for key, _, value in (header.partition(":") for header in args.header)
+    )
+    sampler = UserSampler(
+        distribution=args.distribution,
+        num_users=args.num_users,
+        zipf_s=args.zipf_s,
+        replay_path=args.replay_path,
+        seed=args.seed,
+    )
+    load_test = LoadTest(
+        url=url,
+        sampler=sampler,
+        rate=args.rate,
+        duration=args.duration,
+        connections=args.connections,
+        headers=headers,
+        timeout=args.timeout,
+    )
+    result = asyncio.run(load_test.run())
+
+    if server:
+        server.shutdown()
+
+    with open(args.report_json, "w") as f:
+        json.dump(result, f, indent=2)
+    with open(args.report_md, "w") as f:
+        f.write(to_markdown(result))
+    print(to_markdown(result))
@@ -1,9 +1,14 @@
 #!/bin/bash
 
-wrk \
-  -t 2 \ 
-  -c 5 \
-  -d 30s \
-  --latency \
-  -H "x-api-key <API_KEY>" \
-  <API_ENDPOINT>/like/movie?user=0
+SCRIPT=`readlink -f $0`
+SCRIPT_PATH=`dirname ${SCRIPT}`
+
+# 로컬 대역 서버 대상으로 실행하려면 --url 대신 --local 을 사용합니다.
+python ${SCRIPT_PATH}/load_test.py \
+  --url <API_ENDPOINT>/like/movie \
+  --header "x-api-key: <API_KEY>" \
+  --rate 50 \
+  --duration 30 \
+  --connections 5 \
+  --distribution zipf \
+  --num_users 10000
@@ -0,0 +1,123 @@
+import json
+import time
+import random
+import argparse
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class LRUCache:
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            if len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+
+class RecommendStubHandler(BaseHTTPRequestHandler):
+    """
+    /like/movie?user={user_id} API 대역 서버.
+    캐시 히트/미스에 따라 지연 시간을 다르게 주고 X-Cache 헤더로 알려줍니다.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *_):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/like/movie":
+            return self.respond(404, {"message": "Not Found"})
+
+        user = parse_qs(url.query).get("user", [""])[0]
+        if not user:
+            return self.respond(400, {"message": "user is required"})
+
+        cache = self.server.cache
+        items = cache.get(user)
+        if items is None:
+            time.sleep(self.server.miss_latency_ms / 1000)
+            rng = random.Random(user)
+            items = [
+                {"ContentID": rng.randint(1, 1000000), "Score": round(rng.random(), 4)}
+                for _ in range(self.server.contents_limit)
+            ]
+            cache.put(user, items)
+            cache_status = "MISS"
+        else:
+            time.sleep(self.server.hit_latency_ms / 1000)
+            cache_status = "HIT"
+
+        self.respond(200, {"user": user, "items": items}, {"X-Cache": cache_status})
+
+    def respond(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(
+    host="127.0.0.1",
+    port=0,
+    cache_size=1000,
+    hit_latency_ms=1.0,
+    miss_latency_ms=10.0,
+    contents_limit=30
+):
+    server = ThreadingHTTPServer((host, port), RecommendStubHandler)
+    server.daemon_threads = True
+    server.cache = LRUCache(cache_size)
+    server.hit_latency_ms = hit_latency_ms
+    server.miss_latency_ms = miss_latency_ms
+    server.contents_limit = contents_limit
+    return server
+
+
+def start_background_server(**kwargs):
+    """ 대역 서버를 백그라운드 스레드로 실행하고 (server, base_url)을 반환합니다. """
+    server = make_server(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache_size", type=int, default=1000)
+    parser.add_argument("--hit_latency_ms", type=float, default=1.0)
+    parser.add_argument("--miss_latency_ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    stub = make_server(
+        host=args.host,
+        port=args.port,
+        cache_size=args.cache_size,
+        hit_latency_ms=args.hit_latency_ms,
+        miss_latency_ms=args.miss_latency_ms,
+    )
+    print(f"serving on http://{args.host}:{args.port}")
+    stub.serve_forever()
@@ -0,0 +1,311 @@
+import os
+import json
+import time
+import logging
+import datetime
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import fire
+
+from config_controller import get_config, get_run_argv, project_dir
+
+
+logging.basicConfig(level=logging.INFO)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+def date_range(start_date, end_date):
+    start = datetime.datetime.strptime(str(start_date), "%Y-%m-%d")
+    end = datetime.datetime.strptime(str(end_date), "%Y-%m-%d")
+    if start > end:
+        raise ValueError(f"시작일이 종료일보다 늦습니다 : {start_date} ~ {end_date}")
+    return [
+        (start + datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+        for i in range((end - start).days + 1)
+    ]
+
+
+def make_job_name(namespace, model_name, task_name, tag, attempt):
+    # SageMaker 작업 이름은 63자 이하의 영문/숫자/하이픈만 허용됩니다
+    return f"{namespace}-{model_name}-{task_name}-bf{tag}-a{attempt}"[:63]
+
+
+def plan_jobs(
+    namespace,
+    service_name,
+    start_date,
+    end_date,
+    tasks=None
+):
+    """
+    날짜 범위의 작업 계획을 만듭니다.
+
+    - 태스크 간 선행 관계는 설정 파일의 dag.dependencies 를 따릅니다.
+    - 모든 태스크의 입출력 경로가 기준일(year=/month=/day=)로 나뉘므로 날짜마다 하나씩 수행합니다.
+    """
+    config = get_config(namespace=namespace, service_name=service_name)
+    task_params = config["parameters"]["tasks"]
+    dependencies = config.get("dag", {}).get("dependencies", {})
+    task_names = [
+        name.replace("_", "-")
+        for name in task_params
+        if tasks is None or name.replace("_", "-") in tasks
+    ]
+    dates = date_range(start_date, end_date)
+
+    jobs = {}
+    for base_date in dates:
+        for task_name in task_names:
+            key = task_name.replace("-", "_")
+            params = task_params[key]
+            job_id = f"{task_name}@{base_date}"
+            upstream_ids = [
+                f"{upstream.replace('_', '-')}@{base_date}"
+                for upstream in dependencies.get(key, [])
+                if upstream.replace("_", "-") in task_names
+            ]
+
+            jobs[job_id] = {
+                "id": job_id,
+                "task": task_name,
+                "base_date": base_date,
+                "model_name": params.get("model_name"),
+                "instance_type": params.get("instance_type", "local"),
+                "upstream": upstream_ids,
+                "status": PENDING,
+                "attempt": 0,
+                "job_name": None,
+                "started_at": None,
+                "finished_at": None,
+            }
+    return jobs
+
+
+class Backfill:
+    """
+    날짜 범위 재생성 작업을 동시성 제한 하에 병렬로 수행합니다.
+    진행 상태는 state 파일에 기록되며 중단 이후 같은 명령으로 이어서 수행합니다.
+    """
+    def __init__(
+        self,
+        namespace,
+        service_name,
+        start_date,
+        end_date,
+        max_concurrency=4,
+        quotas=None,
+        tasks=None,
+        state_dir=".backfill",
+        dry_run=False
+    ):
+        self.namespace = namespace
+        self.service_name = service_name
+        self.max_concurrency = max_concurrency
+        self.quotas = quotas or {}
+        self.dry_run = dry_run
+        self.state_path = os.path.join(
+            state_dir, f"{namespace}-{service_name}-{start_date}-{end_date}.json"
+        )
+        self.log_dir = os.path.join(state_dir, "logs")
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        self.jobs = self.load_state()
+        if self.jobs is None:
+            self.jobs = plan_jobs(
+                namespace=namespace,
+                service_name=service_name,
+                start_date=start_date,
+                end_date=end_date,
+                tasks=tasks,
+            )
+            self.save_state()
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, "r") as f:
+            jobs = json.load(f)
+        for job in jobs.values():
+            # 중단 시점에 수행 중이던 작업은 다시 수행합니다
+            if job["status"] in (RUNNING, FAILED, BLOCKED):
+                job["status"] = PENDING
+        logging.info(f"resume backfill : {self.state_path}")
+        return jobs
+
+    def save_state(self):
+        # dry_run 은 명령만 출력하므로 실제 수행이 이어받을 state 파일을 건드리지 않습니다
+        if self.dry_run:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.jobs, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def make_command(self, job):
+        upstream_job_names = [
+            self.jobs[upstream]["job_name"] for upstream in job["upstream"]
+        ]
+        argv = get_run_argv(
+            namespace=self.namespace,
+            service_name=self.service_name,
+            task_name=job["task"],
+            base_date=job["base_date"],
+            job=job["job_name"],
+            dependency_job=upstream_job_names[0] if upstream_job_names else None,
+        )
+        return ["python", "main_with_sagemaker.py", *argv]
+
+    def execute(self, job):
+        command = self.make_command(job)
+        logging.info(f"run {job['id']} : {' '.join(command)}")
+        if self.dry_run:
+            return 0
+
+        log_path = os.path.join(self.log_dir, f"{job['job_name']}.log")
+        with open(log_path, "w") as log:
+            return subprocess.run(
+                command,
+                cwd=os.path.join(project_dir, "src"),
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            ).returncode
+
+    def is_ready(self, job):
+        return job["status"] == PENDING and all(
+            self.jobs[upstream]["status"] == SUCCEEDED for upstream in job["upstream"]
+        )
+
+    def has_capacity(self, job, running):
+        if len(running) >= self.max_concurrency:
+            return False
+        quota = self.quotas.get(job["instance_type"])
+        if quota is None:
+            return True
+        in_use = sum(
+            1 for job_id in running.values()
+            if self.jobs[job_id]["instance_type"] == job["instance_type"]
+        )
+        return in_use < quota
+
+    def block_dependents(self, failed_id):
+        for job in self.jobs.values():
+            if failed_id in job["upstream"] and job["status"] == PENDING:
+                job["status"] = BLOCKED
+                self.block_dependents(job["id"])
+
+    def progress(self, started_at):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+
+        durations = [
+            job["finished_at"] - job["started_at"]
+            for job in self.jobs.values()
+            if job["status"] == SUCCEEDED and job["started_at"] and job["finished_at"]
+        ]
+        remaining = counts.get(PENDING, 0) + counts.get(RUNNING, 0)
+        eta = None
+        if durations:
+            mean_duration = sum(durations) / len(durations)
+            eta = datetime.timedelta(
+                seconds=int(mean_duration * remaining / self.max_concurrency)
+            )
+        elapsed = datetime.timedelta(seconds=int(time.time() - started_at))
+        logging.info(
+            f"[{counts.get(SUCCEEDED, 0)}/{len(self.jobs)}] "
+            f"running {counts.get(RUNNING, 0)}, failed {counts.get(FAILED, 0)}, "
+            f"blocked {counts.get(BLOCKED, 0)} | elapsed {elapsed} | eta {eta or '-'}"
+        )
+        return counts
+
+    def run(self):
+        started_at = time.time()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while True:
+                for job in self.jobs.values():
+                    if not self.is_ready(job) or not self.has_capacity(job, running):
+                        continue
+                    job["attempt"] += 1
+                    job["job_name"] = make_job_name(
+                        namespace=self.namespace,
+                        model_name=job["model_name"],
+                        task_name=job["task"],
+                        tag=job["base_date"].replace("-", ""),
+                        attempt=job["attempt"],
+                    )
+                    job["status"] = RUNNING
+                    job["started_at"] = time.time()
+                    running[executor.submit(self.execute, job)] = job["id"]
+                self.save_state()
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = self.jobs[running.pop(future)]
+                    job["finished_at"] = time.time()
+                    try:
+                        succeeded = future.result() == 0
+                    except Exception as e:
+                        logging.error(f"{job['id']} : {e}")
+                        succeeded = False
+                    job["status"] = SUCCEEDED if succeeded else FAILED
+                    if not succeeded:
+                        self.block_dependents(job["id"])
+                self.save_state()
+                self.progress(started_at)
+
+        return self.progress(started_at)
+
+
+def plan(namespace, service_name, start_date, end_date, tasks=None):
+    """ 수행 계획만 출력합니다. """
+    jobs = plan_jobs(namespace, service_name, start_date, end_date, tasks=tasks)
+    for job in jobs.values():
+        print(f"{job['id']:<40} <- {', '.join(job['upstream']) or '-'}")
+    return len(jobs)
+
+
+def run(
+    namespace,
+    service_name,
+    start_date,
+    end_date,
+    max_concurrency=4,
+    quotas=None,
+    tasks=None,
+    state_dir=".backfill",
+    dry_run=False
+):
+    """
+    :param quotas: 인스턴스 타입별 동시 작업 수 제한 (예: {"ml.m5.large": 2})
+    :param dry_run: 수행 순서대로 명령만 출력합니다. state 파일은 만들거나 바꾸지 않습니다.
+    """
+    counts = Backfill(
+        namespace=namespace,
+        service_name=service_name,
+        start_date=start_date,
+        end_date=end_date,
+        max_concurrency=max_concurrency,
+        quotas=quotas,
+        tasks=tasks,
+        state_dir=state_dir,
+        dry_run=dry_run,
+    ).run()
+    if counts.get(FAILED) or counts.get(BLOCKED):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    fire.Fire({
+        "plan": plan,
+        "run": run,
+    })
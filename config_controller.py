@@ -1,59 +1,188 @@
 import os
+import time
 import yaml
 
-import fire
-
 
 project_dir = os.path.dirname(os.path.abspath(__file__))
 config_file_path = os.path.join(
-    project_dir, 
-    "scripts", 
-    "build", 
-    "{SERVICE_NAME}", 
+    project_dir,
+    "scripts",
+    "build",
+    "{SERVICE_NAME}",
     "config-{NAMESPACE}.yaml"
 )
 
+# libyaml 이 설치되어 있다면 C 구현 로더를 사용합니다
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# {설정 파일 경로: (mtime_ns, 파싱 결과)}
+config_cache = {}
+
+
+def load_config_file(path):
+    """
+    설정 파일을 파싱합니다. 파일의 수정 시각이 같다면 캐시된 결과를 반환합니다.
+    반환 값은 캐시와 공유되므로 수정하지 않아야 합니다.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = config_cache.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(path, "r") as f:
+        config = yaml.load(f, Loader=YamlLoader)
+    config_cache[path] = (mtime_ns, config)
+    return config
+
 
 def get_config(namespace, service_name):
-    with open(
-        config_file_path.format(NAMESPACE=namespace, SERVICE_NAME=service_name), 
-        "r"
-    ) as f:
-        return yaml.load(f, Loader=yaml.FullLoader)
+    return load_config_file(
+        config_file_path.format(NAMESPACE=namespace, SERVICE_NAME=service_name)
+    )
 
 
-def make_script(namespace, task_name, base_date, job, dependency_job, params):
-    ns_arg = f"--namespace {namespace}"
-    task_arg = f"--task {task_name}"
-    base_date_arg = f"--base_date {base_date}"
-    job_arg = f"--job_name {job}"
-    args = [f"--{key} {val}" for key, val in params.items()]
+def make_argv(namespace, task_name, base_date, job, dependency_job, params):
+    """ main.py / main_with_sagemaker.py 에 그대로 전달할 인자 리스트를 만듭니다. """
+    argv = [
+        "--namespace", str(namespace),
+        "--task", str(task_name),
+        "--base_date", str(base_date),
+        "--job_name", str(job),
+    ]
+    for key, val in params.items():
+        argv.extend([f"--{key}", str(val)])
     if dependency_job:
-        args.extend(["--dependency_job_name", dependency_job])
-    return ' '.join([ns_arg, task_arg, base_date_arg, job_arg, *args])
+        argv.extend(["--dependency_job_name", str(dependency_job)])
+    return argv
 
 
-def get_run_script(
-    namespace, 
-    service_name, 
-    task_name, 
-    base_date, 
-    job, 
+def make_script(namespace, task_name, base_date, job, dependency_job, params):
+    return ' '.join(
+        make_argv(namespace, task_name, base_date, job, dependency_job, params)
+    )
+
+
+def get_task_params(config, task_name):
+    return config["parameters"]["tasks"][task_name.lower().replace("-", "_")]
+
+
+def get_run_argv(
+    namespace,
+    service_name,
+    task_name,
+    base_date,
+    job,
     dependency_job=None
 ):
     config = get_config(namespace=namespace, service_name=service_name)
-    params = config["parameters"]["tasks"][task_name.lower().replace("-", "_")]
-    return make_script(
+    return make_argv(
         namespace=namespace,
         task_name=task_name,
         base_date=base_date,
         job=job,
         dependency_job=dependency_job,
-        params=params
+        params=get_task_params(config, task_name)
     )
 
 
+def get_run_script(
+    namespace,
+    service_name,
+    task_name,
+    base_date,
+    job,
+    dependency_job=None
+):
+    return ' '.join(get_run_argv(
+        namespace=namespace,
+        service_name=service_name,
+        task_name=task_name,
+        base_date=base_date,
+        job=job,
+        dependency_job=dependency_job,
+    ))
+
+
+def render_service_tasks(
+    namespace,
+    service_name,
+    base_date,
+    jobs=None,
+    dependency_jobs=None
+):
+    """
+    서비스의 모든 태스크 인자를 한 번에 만듭니다.
+
+    :param jobs: {태스크명: 작업 이름}. 없으면 "{namespace}-{model_name}-{task}" 를 사용
+    :param dependency_jobs: {태스크명: 선행 작업 이름}
+    :return: {태스크명: 인자 리스트}
+    """
+    config = get_config(namespace=namespace, service_name=service_name)
+    jobs = jobs or {}
+    dependency_jobs = dependency_jobs or {}
+    rendered = {}
+    for key, params in config["parameters"]["tasks"].items():
+        task_name = key.replace("_", "-")
+        rendered[task_name] = make_argv(
+            namespace=namespace,
+            task_name=task_name,
+            base_date=base_date,
+            job=jobs.get(
+                task_name, f"{namespace}-{params.get('model_name')}-{task_name}"
+            ),
+            dependency_job=dependency_jobs.get(task_name),
+            params=params,
+        )
+    return rendered
+
+
+def benchmark_render(namespace="dev", service_name="like-movie", count=1000):
+    """
+    태스크 인자 count 회 생성 시간을 비교합니다.
+    (기존 방식: 매번 FullLoader 파싱 + 문자열 / 현재 방식: 캐시 + 인자 리스트)
+    """
+    path = config_file_path.format(NAMESPACE=namespace, SERVICE_NAME=service_name)
+    task_names = list(get_config(namespace, service_name)["parameters"]["tasks"])
+
+    started_at = time.perf_counter()
+    for i in range(count):
+        with open(path, "r") as f:
+            config = yaml.load(f, Loader=yaml.FullLoader)
+        task_name = task_names[i % len(task_names)]
+        make_script(
+            namespace, task_name, "2024-03-06", "job", None,
+            config["parameters"]["tasks"][task_name]
+        )
+    full_loader_seconds = time.perf_counter() - started_at
+
+    config_cache.clear()
+    started_at = time.perf_counter()
+    for i in range(count):
+        get_run_argv(
+            namespace, service_name, task_names[i % len(task_names)], "2024-03-06", "job"
+        )
+    cached_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(count // len(task_names)):
+        render_service_tasks(namespace, service_name, "2024-03-06")
+    service_seconds = time.perf_counter() - started_at
+
+    result = {
+        "renders": count,
+        "loader": YamlLoader.__name__,
+        "full_loader_total_ms": round(full_loader_seconds * 1000, 2),
+        "cached_total_ms": round(cached_seconds * 1000, 2),
+        "cached_by_service_total_ms": round(service_seconds * 1000, 2),
+        "speedup": round(full_loader_seconds / cached_seconds, 1),
+    }
+    return result
+
+
 if __name__ == '__main__':
+    import fire
+
     fire.Fire({
-        "get-run-script": get_run_script
+        "get-run-script": get_run_script,
+        "benchmark-render": benchmark_render,
     })
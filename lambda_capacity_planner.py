@@ -0,0 +1,383 @@
+import csv
+import json
+import math
+import pprint
+import logging
+import datetime
+
+import fire
+
+
+logging.basicConfig(level=logging.INFO)
+
+# 서울 리전 프로비저닝 동시성 단가 (USD / GB-second)
+PROVISIONED_PRICE_PER_GB_SECOND = 0.0000041667
+
+
+def percentile(values, q):
+    """ 선형 보간 백분위수 (q: 0 ~ 100) """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return float(ordered[lower])
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def load_metrics_from_file(path):
+    """
+    파일로 내보낸 람다 지표를 불러옵니다.
+    CSV/JSON 모두 Timestamp, ConcurrentExecutions, Invocations 컬럼을 가져야 합니다.
+
+    :return: timestamp 오름차순 (timestamp, concurrency, invocations) 리스트
+    """
+    with open(path, "r") as f:
+        if path.endswith(".json"):
+            records = json.load(f)
+        else:
+            records = list(csv.DictReader(f))
+
+    metrics = [
+        (
+            datetime.datetime.fromisoformat(str(record["Timestamp"])),
+            float(record["ConcurrentExecutions"]),
+            float(record.get("Invocations") or 0),
+        )
+        for record in records
+    ]
+    return sorted(metrics)
+
+
+def fetch_metrics_from_cloudwatch(
+    cw,
+    function_name,
+    alias,
+    lookup_days=14,
+    period=300
+):
+    """ CloudWatch GetMetricData로 별칭의 동시성/호출 수 지표를 가져옵니다. """
+    dimensions = [
+        {"Name": "FunctionName", "Value": function_name},
+        {"Name": "Resource", "Value": f"{function_name}:{alias}"},
+    ]
+    queries = [
+        {
+            "Id": query_id,
+            "MetricStat": {
+                "Metric": {
+                    "Namespace": "AWS/Lambda",
+                    "MetricName": metric_name,
+                    "Dimensions": dimensions,
+                },
+                "Period": period,
+                "Stat": stat,
+            },
+        }
+        for query_id, metric_name, stat in [
+            ("concurrency", "ConcurrentExecutions", "Maximum"),
+            ("invocations", "Invocations", "Sum"),
+        ]
+    ]
+
+    end_time = datetime.datetime.utcnow()
+    start_time = end_time - datetime.timedelta(days=lookup_days)
+    values = {"concurrency": {}, "invocations": {}}
+    paginator = cw.get_paginator("get_metric_data")
+    for page in paginator.paginate(
+        MetricDataQueries=queries,
+        StartTime=start_time,
+        EndTime=end_time,
+    ):
+        for result in page["MetricDataResults"]:
+            values[result["Id"]].update(zip(result["Timestamps"], result["Values"]))
+
+    return sorted(
+        (
+            timestamp.replace(tzinfo=None),
+            concurrency,
+            values["invocations"].get(timestamp, 0.0),
+        )
+        for timestamp, concurrency in values["concurrency"].items()
+    )
+
+
+def recommend_capacity(
+    metrics,
+    min_percentile=50,
+    headroom=1.5,
+    burst_percentile=95,
+    min_target=0.1,
+    max_target=0.9
+):
+    """
+    과거 동시성 지표로 오토스케일링 설정값을 추천합니다.
+
+    - min_capacity : 평상시(min_percentile) 동시성
+    - max_capacity : 최대 동시성 * headroom
+    - target_value : 한 주기 동안의 급증 비율(burst_percentile)을 흡수할 수 있는 사용률
+      (다음 스케일 아웃 전까지 동시성이 r배 늘어나도 1 / r 사용률이면 콜드 스타트가 없음)
+    """
+    concurrency = [value for _, value, _ in metrics]
+    if not concurrency:
+        raise ValueError("추천에 사용할 지표가 없습니다")
+
+    growth = [
+        current / previous
+        for previous, current in zip(concurrency, concurrency[1:])
+        if previous > 0
+    ]
+    burst = max(percentile(growth, burst_percentile), 1.0) if growth else 1.0
+    target_value = round(min(max(1 / burst, min_target), max_target), 2)
+
+    min_capacity = max(1, math.ceil(percentile(concurrency, min_percentile)))
+    max_capacity = max(
+        min_capacity, math.ceil(max(concurrency) * headroom / max(target_value, 0.5))
+    )
+    return {
+        "min_capacity": min_capacity,
+        "max_capacity": max_capacity,
+        "target_value": target_value,
+    }
+
+
+def find_daily_peak_hours(metrics, peak_ratio=1.5):
+    """ 시간대별 평균 동시성이 전체 중앙값의 peak_ratio배 이상인 시간대를 찾습니다. """
+    by_hour = {}
+    for timestamp, concurrency, _ in metrics:
+        by_hour.setdefault(timestamp.hour, []).append(concurrency)
+
+    hourly_mean = {hour: sum(vals) / len(vals) for hour, vals in by_hour.items()}
+    baseline = percentile(list(hourly_mean.values()), 50)
+    return sorted(
+        hour for hour, mean in hourly_mean.items()
+        if baseline > 0 and mean >= baseline * peak_ratio
+    ), by_hour
+
+
+def make_scheduled_actions(
+    metrics,
+    recommendation,
+    peak_ratio=1.5,
+    lead_minutes=15,
+    timezone="UTC"
+):
+    """
+    일별 피크 시간대에 맞춘 예약 스케일링 액션을 만듭니다.
+    피크 시작 lead_minutes 전에 최소 용량을 올리고 피크가 끝나면 원래대로 되돌립니다.
+    (지표의 timestamp는 timezone 기준이어야 합니다)
+    """
+    peak_hours, by_hour = find_daily_peak_hours(metrics, peak_ratio=peak_ratio)
+
+    windows = []
+    for hour in peak_hours:
+        if windows and windows[-1][1] == hour:
+            windows[-1][1] = hour + 1
+        else:
+            windows.append([hour, hour + 1])
+
+    actions = []
+    for start, end in windows:
+        peak_values = [v for hour in range(start, end) for v in by_hour[hour]]
+        peak_min = max(
+            recommendation["min_capacity"],
+            math.ceil(percentile(peak_values, 50) / recommendation["target_value"]),
+        )
+        peak_min = min(peak_min, recommendation["max_capacity"])
+        scale_out_at = (
+            datetime.datetime(2000, 1, 1, start % 24)
+            - datetime.timedelta(minutes=lead_minutes)
+        )
+        actions.extend([
+            {
+                "name": f"peak-{start:02d}-{end % 24:02d}-scale-out",
+                "schedule": f"cron({scale_out_at.minute} {scale_out_at.hour} * * ? *)",
+                "timezone": timezone,
+                "min_capacity": peak_min,
+                "max_capacity": recommendation["max_capacity"],
+            },
+            {
+                "name": f"peak-{start:02d}-{end % 24:02d}-scale-in",
+                "schedule": f"cron(0 {end % 24} * * ? *)",
+                "timezone": timezone,
+                "min_capacity": recommendation["min_capacity"],
+                "max_capacity": recommendation["max_capacity"],
+            },
+        ])
+    return actions
+
+
+def _scheduled_min_capacity(actions, timestamp, default):
+    """ timestamp 시점에 유효한 예약 스케일링의 최소 용량 """
+    events = []
+    for action in actions:
+        minute, hour = action["schedule"][len("cron("):].split()[:2]
+        events.append((int(hour) * 60 + int(minute), action["min_capacity"]))
+    if not events:
+        return default
+
+    now = timestamp.hour * 60 + timestamp.minute
+    events.sort()
+    active = [capacity for at, capacity in events if at <= now]
+    return active[-1] if active else events[-1][1]
+
+
+def simulate(
+    metrics,
+    min_capacity,
+    max_capacity,
+    target_value,
+    actions=None,
+    memory_mb=512,
+    period=300,
+    price_per_gb_second=PROVISIONED_PRICE_PER_GB_SECOND
+):
+    """
+    트래픽 곡선을 재생하며 오토스케일링 결과를 추정합니다.
+
+    - 타겟 트래킹은 한 주기 늦게 반응한다고 가정합니다.
+    - 프로비저닝 용량을 넘는 동시성 중 직전 주기보다 늘어난 만큼을 콜드 스타트로 봅니다.
+    """
+    capacity = min_capacity
+    previous_spill = 0.0
+    cold_starts = 0.0
+    provisioned_seconds = 0.0
+    for timestamp, concurrency, _ in metrics:
+        floor = _scheduled_min_capacity(actions or [], timestamp, min_capacity)
+        capacity = min(max(capacity, floor), max_capacity)
+
+        spill = max(0.0, concurrency - capacity)
+        cold_starts += max(0.0, spill - previous_spill)
+        previous_spill = spill
+        provisioned_seconds += capacity * period
+
+        capacity = min(
+            max(math.ceil(concurrency / target_value), floor), max_capacity
+        )
+
+    gb_seconds = provisioned_seconds * memory_mb / 1024
+    return {
+        "periods": len(metrics),
+        "predicted_cold_starts": round(cold_starts, 2),
+        "provisioned_gb_seconds": round(gb_seconds, 2),
+        "provisioned_cost_usd": round(gb_seconds * price_per_gb_second, 4),
+    }
+
+
+def _load_metrics(metrics_path=None, function_name=None, alias=None, lookup_days=14):
+    if metrics_path:
+        return load_metrics_from_file(metrics_path)
+    if not (function_name and alias):
+        raise ValueError("metrics_path 또는 function_name/alias 가 필요합니다")
+
+    import boto3
+    return fetch_metrics_from_cloudwatch(
+        cw=boto3.client("cloudwatch"),
+        function_name=function_name,
+        alias=alias,
+        lookup_days=lookup_days,
+    )
+
+
+def recommend(
+    metrics_path=None,
+    function_name=None,
+    alias=None,
+    lookup_days=14,
+    peak_ratio=1.5,
+    timezone="UTC"
+):
+    """ 추천 설정값과 예약 스케일링 액션을 출력합니다. """
+    metrics = _load_metrics(metrics_path, function_name, alias, lookup_days)
+    recommendation = recommend_capacity(metrics)
+    actions = make_scheduled_actions(
+        metrics, recommendation, peak_ratio=peak_ratio, timezone=timezone
+    )
+    result = {"recommendation": recommendation, "scheduled_actions": actions}
+    logging.info(pprint.pformat(result))
+    return result
+
+
+def run_simulation(
+    metrics_path,
+    memory_mb=512,
+    period=300,
+    peak_ratio=1.5,
+    min_capacity=None,
+    max_capacity=None,
+    target_value=None
+):
+    """
+    현재 하드코딩 설정(1/10/0.3)과 추천 설정(예약 스케일링 포함)의
+    콜드 스타트 / 비용 추정치를 비교합니다.
+    """
+    metrics = load_metrics_from_file(metrics_path)
+    recommendation = recommend_capacity(metrics)
+    actions = make_scheduled_actions(metrics, recommendation, peak_ratio=peak_ratio)
+    candidates = {
+        "current": ({"min_capacity": 1, "max_capacity": 10, "target_value": 0.3}, []),
+        "recommended": (recommendation, actions),
+    }
+    if min_capacity and max_capacity and target_value:
+        candidates["custom"] = ({
+            "min_capacity": min_capacity,
+            "max_capacity": max_capacity,
+            "target_value": target_value,
+        }, [])
+
+    report = {
+        name: {
+            **config,
+            "scheduled_actions": len(scheduled),
+            **simulate(
+                metrics,
+                actions=scheduled,
+                memory_mb=memory_mb,
+                period=period,
+                **config
+            ),
+        }
+        for name, (config, scheduled) in candidates.items()
+    }
+    logging.info(pprint.pformat(report))
+    return report
+
+
+def apply(
+    env,
+    function_name,
+    alias,
+    metrics_path=None,
+    lookup_days=14,
+    peak_ratio=1.5,
+    timezone="UTC"
+):
+    """ 추천 설정값과 예약 스케일링을 대상 별칭의 오토스케일링에 적용합니다. """
+    from lambda_update import LambdaUpdate
+
+    result = recommend(
+        metrics_path=metrics_path,
+        function_name=function_name,
+        alias=alias,
+        lookup_days=lookup_days,
+        peak_ratio=peak_ratio,
+        timezone=timezone,
+    )
+    LambdaUpdate(env=env, function_name=function_name) \
+        .add_provisioned_concurrency_autoscaling(
+            alias=alias, **result["recommendation"]
+        ) \
+        .add_provisioned_concurrency_scheduled_actions(
+            alias=alias, actions=result["scheduled_actions"]
+        )
+    return result
+
+
+if __name__ == '__main__':
+    fire.Fire({
+        "recommend": recommend,
+        "simulate": run_simulation,
+        "apply": apply,
+    })
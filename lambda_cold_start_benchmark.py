@@ -0,0 +1,176 @@
+"""
+MWAA 트리거 람다 콜드 스타트 벤치마크.
+
+    # 모듈 임포트(init) 시간과 첫 호출 준비(클라이언트 생성) 시간 비교
+    python lambda_cold_start_benchmark.py startup --baseline_ref HEAD~1
+
+    # 패키징 프로필별 패키지 크기 비교
+    python lambda_cold_start_benchmark.py package --src_dir <람다 프로젝트>/src
+"""
+import os
+import sys
+import json
+import shutil
+import logging
+import tempfile
+import subprocess
+import statistics
+
+import fire
+
+from lambda_update import PACKAGE_PROFILES, build_package
+
+
+logging.basicConfig(level=logging.INFO)
+
+PROJECT_SRC = os.path.dirname(os.path.abspath(__file__))
+
+# 모듈 임포트(init), 첫 호출, 두 번째 호출(웜 스타트)에서 클라이언트를 준비하는 시간을 잽니다.
+# 기존 핸들러는 호출마다 SSM 클라이언트와 PoolManager 를 새로 만듭니다.
+STARTUP_SCRIPT = """
+import json, time
+started_at = time.perf_counter()
+import {module} as handler
+imported_at = time.perf_counter()
+
+def prepare():
+    if hasattr(handler, "get_client"):
+        handler.get_client("mwaa")
+        handler.get_client("ssm")
+        handler.get_http()
+    else:
+        import boto3, urllib3
+        boto3.client("ssm")
+        urllib3.PoolManager()
+
+prepare()
+first_call_at = time.perf_counter()
+prepare()
+warm_call_at = time.perf_counter()
+print(json.dumps({{
+    "import": imported_at - started_at,
+    "first_call": first_call_at - imported_at,
+    "warm_call": warm_call_at - first_call_at,
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력을 파싱합니다.
+
+    :return: [(module, self_us, cumulative_us)] (출력 순서)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_startup(module_dir, module, env):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT.format(module=module)],
+        cwd=module_dir, env=env, capture_output=True, text=True, check=True
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(result.stderr)
+    module_row = [row for row in rows if row[0] == module][-1]
+    return timings, module_row[2], rows
+
+
+def measure_startup(module_dir, module, repeat, top, env):
+    imports, first_calls, warm_calls, cumulative = [], [], [], []
+    rows = []
+    for _ in range(repeat):
+        timings, module_us, rows = run_startup(module_dir, module, env)
+        imports.append(timings["import"] * 1000)
+        first_calls.append(timings["first_call"] * 1000)
+        warm_calls.append(timings["warm_call"] * 1000)
+        cumulative.append(module_us / 1000)
+
+    # importtime 은 처음 임포트되는 모듈만 기록하므로 모듈 임포트 이전 항목은 인터프리터 기동분입니다
+    heaviest = sorted(
+        (row for row in rows if row[0] != module), key=lambda row: row[2], reverse=True
+    )[:top]
+    return {
+        "import_ms": round(statistics.median(imports), 1),
+        "importtime_cumulative_ms": round(statistics.median(cumulative), 1),
+        "first_call_ms": round(statistics.median(first_calls), 1),
+        "cold_start_ms": round(statistics.median(
+            [i + f for i, f in zip(imports, first_calls)]
+        ), 1),
+        "warm_call_ms": round(statistics.median(warm_calls), 2),
+        "imported_modules": len(rows),
+        "heaviest_imports_ms": {name: round(us / 1000, 1) for name, _, us in heaviest},
+    }
+
+
+def startup(module="lambda_function", baseline_ref=None, repeat=5, top=10, region="ap-northeast-2"):
+    """
+    python -X importtime 으로 핸들러 모듈 임포트 시간을 측정합니다.
+    baseline_ref 를 주면 해당 git 리비전의 모듈과 비교합니다.
+
+    :param module: 핸들러 모듈명
+    :param baseline_ref: 비교할 git 리비전 (예: HEAD~1)
+    :param repeat: 반복 횟수 (중앙값 사용)
+    :param top: 누적 임포트 시간 상위 모듈 수
+    :param region: boto3 클라이언트 생성에 사용할 리전
+    """
+    env = dict(os.environ, AWS_DEFAULT_REGION=region, PYTHONDONTWRITEBYTECODE="1")
+    results = {"current": measure_startup(PROJECT_SRC, module, repeat, top, env)}
+
+    if baseline_ref:
+        source = subprocess.run(
+            ["git", "show", f"{baseline_ref}:{module}.py"],
+            cwd=PROJECT_SRC, capture_output=True, text=True, check=True
+        ).stdout
+        with tempfile.TemporaryDirectory() as baseline_dir:
+            with open(os.path.join(baseline_dir, f"{module}.py"), "w") as f:
+                f.write(source)
+            results["baseline"] = measure_startup(baseline_dir, module, repeat, top, env)
+
+    for name, result in results.items():
+        logging.info(
+            f"{name:<8} import {result['import_ms']}ms, first call {result['first_call_ms']}ms, "
+            f"cold start {result['cold_start_ms']}ms, warm call {result['warm_call_ms']}ms"
+        )
+    print(json.dumps(results, indent=2))
+
+
+def package(src_dir=None, profiles=tuple(PACKAGE_PROFILES)):
+    """
+    패키징 프로필별 배포 패키지 파일 수와 크기를 비교합니다.
+
+    :param src_dir: 패키징할 람다 소스 디렉토리 (기본값: 이 프로젝트의 src)
+    :param profiles: 비교할 패키징 프로필
+    """
+    src_dir = os.path.abspath(src_dir or os.path.join(PROJECT_SRC, "src"))
+    results = []
+    output_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(src_dir)
+        for profile in profiles:
+            zip_file_name = os.path.join(output_dir, f"{profile}.zip")
+            results.append(build_package(zip_file_name, profile))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(output_dir)
+
+    for result in results:
+        logging.info(
+            f"{result['profile']:<8} files {result['files']:>6}, "
+            f"source {result['source_bytes'] / 2 ** 20:.2f}MB, "
+            f"package {result['package_bytes'] / 2 ** 20:.2f}MB"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    fire.Fire({
+        "startup": startup,
+        "package": package,
+    })
@@ -1,26 +1,38 @@
 import os
 import json
-import base64
-import pprint
 import logging
-import urllib3
+from functools import lru_cache
 from http.client import responses
 
-import boto3
-
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
-client = boto3.client('mwaa')
 
 
 class MWAACliRequestException(Exception):
     pass
 
 
+@lru_cache(maxsize=None)
+def get_client(service_name):
+    """
+    boto3 클라이언트는 처음 필요할 때 만들고 이후 호출(웜 스타트)에서는 재사용합니다.
+    boto3 임포트와 서비스 모델 로딩이 모듈 임포트(콜드 스타트 init) 시점에서 빠집니다.
+    """
+    import boto3
+    return boto3.client(service_name)
+
+
+@lru_cache(maxsize=None)
+def get_http():
+    import urllib3
+    return urllib3.PoolManager()
+
+
+@lru_cache(maxsize=None)
 def get_mwaa_environment_name(env):
-    client = boto3.client("ssm")
-    return client.get_parameter(
+    """ 환경별 MWAA 환경명은 바뀌지 않으므로 실행 환경(컨테이너)이 살아있는 동안 캐시합니다. """
+    return get_client("ssm").get_parameter(
         Name=f"/<유저명>/{env}/mwaa/env-name",  # 수정
         WithDecryption=True
     )["Parameter"]["Value"]
@@ -28,7 +40,7 @@ def get_mwaa_environment_name(env):
 
 def request_with_cli(mwaa_env_name, command):
     logger.debug(f"run command : {command}")
-    mwaa_cli_token = client.create_cli_token(
+    mwaa_cli_token = get_client("mwaa").create_cli_token(
         Name=mwaa_env_name
     )
 
@@ -36,8 +48,7 @@ def request_with_cli(mwaa_env_name, command):
     mwaa_webserver_hostname = \
         f"https://{mwaa_cli_token['WebServerHostname']}/aws_mwaa/cli"
 
-    http = urllib3.PoolManager()
-    mwaa_response = http.request(
+    mwaa_response = get_http().request(
         method="POST",
         url=mwaa_webserver_hostname,
         headers={
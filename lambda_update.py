@@ -3,10 +3,11 @@ import glob
 import yaml
 import pprint
 import logging
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED
 from time import sleep
 
 import boto3
+import fire
 
 logging.basicConfig(level=logging.INFO)
 
@@ -23,22 +24,81 @@ class LambdaUpdateException(Exception):
     pass
 
 
+DEFAULT_EXCLUDE_PACKAGE_PATTERNS = [
+    "venv",
+    "venv/**",
+    "scripts",
+    "scripts/**",
+    "update_lambda.py",
+    "*.zip"
+]
+
+# 람다 런타임에 포함되어 있거나 실행에 필요 없는 파일
+SLIM_EXCLUDE_PACKAGE_PATTERNS = DEFAULT_EXCLUDE_PACKAGE_PATTERNS + [
+    "**/__pycache__",
+    "**/__pycache__/**",
+    "**/*.py[co]",
+    "**/*.dist-info",
+    "**/*.dist-info/**",
+    "**/*.egg-info",
+    "**/*.egg-info/**",
+    "**/tests",
+    "**/tests/**",
+    "**/*.md",
+    "**/*.pyi",
+    "boto3",
+    "boto3/**",
+    "botocore",
+    "botocore/**",
+    "s3transfer",
+    "s3transfer/**",
+]
+
+PACKAGE_PROFILES = {
+    "default": {"exclude": DEFAULT_EXCLUDE_PACKAGE_PATTERNS, "compression": ZIP_STORED},
+    "slim": {"exclude": SLIM_EXCLUDE_PACKAGE_PATTERNS, "compression": ZIP_DEFLATED},
+}
+
+
+def get_package_files(exclude_patterns):
+    """ 현재 디렉토리 기준 배포 대상 파일 리스트 (exclude_patterns 에 해당하는 파일 제외) """
+    targets = set(glob.glob("**", recursive=True))
+    for pattern in exclude_patterns:
+        targets -= set(glob.glob(pattern, recursive=True))
+    return sorted(targets)
+
+
+def build_package(zip_file_name, profile="default"):
+    """
+    현재 디렉토리를 profile 설정으로 압축하고 패키지 크기를 반환합니다.
+
+    :return: {"profile", "files", "source_bytes", "package_bytes"}
+    """
+    package_profile = PACKAGE_PROFILES[profile]
+    targets = get_package_files(package_profile["exclude"])
+    with ZipFile(zip_file_name, "w", compression=package_profile["compression"]) as zf:
+        for target in targets:
+            zf.write(target)
+    return {
+        "profile": profile,
+        "files": len([target for target in targets if os.path.isfile(target)]),
+        "source_bytes": sum(os.path.getsize(target) for target in targets if os.path.isfile(target)),
+        "package_bytes": os.path.getsize(zip_file_name),
+    }
+
+
 class LambdaUpdate(LambdaAutoScalingMeta):
     """
     람다 업데이트 자동화를 위한 기능
     """
-    EXCLUDE_PACKAGE_PATTERNS = [
-        "venv",
-        "venv/**",
-        "scripts",
-        "scripts/**",
-        "update_lambda.py",
-        "*.zip"
-    ]
-
-    def __init__(self, env, function_name):
+    EXCLUDE_PACKAGE_PATTERNS = DEFAULT_EXCLUDE_PACKAGE_PATTERNS
+
+    def __init__(self, env, function_name, package_profile="default"):
         super().__init__(function_name)
+        if package_profile not in PACKAGE_PROFILES:
+            raise LambdaUpdateException(f"지원하지 않는 패키징 프로필입니다 : {package_profile}")
         self.env = env
+        self.package_profile = package_profile
         self.client = boto3.client("lambda")
         self.autoscaler = boto3.client("application-autoscaling")
         self.function_name = function_name
@@ -62,21 +122,15 @@ class LambdaUpdate(LambdaAutoScalingMeta):
     def get_target_files(self):
         """
         업데이트 코드 리스트 가져오기.
-        EXCLUDE_PACKAGE_PATTERNS 패턴에 해당하는 파일은 제외됩니다.
+        패키징 프로필의 제외 패턴에 해당하는 파일은 제외됩니다.
         """
-        targets = set(glob.glob("**", recursive=True))
-        for pattern in self.EXCLUDE_PACKAGE_PATTERNS:
-            targets -= set(glob.glob(pattern, recursive=True))
-        return list(targets)
+        return get_package_files(PACKAGE_PROFILES[self.package_profile]["exclude"])
 
     def compress_code(self):
-        """ 배포 대상 코드를 압축합니다 """
-        logging.info("Compress Code...")
-        targets = self.get_target_files()
-        zip_file_name = f"{self.function_name}.zip"
-        with ZipFile(zip_file_name, "w") as zf:
-            for target in targets:
-                zf.write(target)
+        """ 배포 대상 코드를 패키징 프로필 설정으로 압축합니다 """
+        logging.info(f"Compress Code... (profile: {self.package_profile})")
+        package = build_package(f"{self.function_name}.zip", self.package_profile)
+        logging.info(pprint.pformat(package))
 
     def get_compressed_code(self):
         return open(f"{self.function_name}.zip", "rb").read()
@@ -287,6 +341,29 @@ class LambdaUpdate(LambdaAutoScalingMeta):
         logging.info(pprint.pformat(response))
         return self
 
+    def add_provisioned_concurrency_scheduled_actions(self, alias, actions):
+        """
+        프로비저닝 동시성 예약 스케일링을 추가합니다.
+        (일별 피크 시간대 이전에 최소 용량을 미리 올려두기 위함)
+
+        :param actions: name, schedule, min_capacity, max_capacity 를 가진 dict 리스트
+        """
+        for action in actions:
+            response = self.autoscaler.put_scheduled_action(
+                ServiceNamespace=self.service_name,
+                ScheduledActionName=action["name"],
+                ResourceId=self.resource_id.format(ALIAS=alias),
+                ScalableDimension=self.scalable_dimension,
+                Schedule=action["schedule"],
+                Timezone=action.get("timezone", "UTC"),
+                ScalableTargetAction={
+                    "MinCapacity": action["min_capacity"],
+                    "MaxCapacity": action["max_capacity"],
+                },
+            )
+            logging.info(pprint.pformat(response))
+        return self
+
     def delete_provisioned_concurrency_autoscaling(self, alias):
         """
         대상 별칭의 프로비저닝 동시성 오토스케일링을 삭제합니다.
@@ -353,6 +430,142 @@ class LambdaUpdate(LambdaAutoScalingMeta):
         )
         self.add_provisioned_concurrency_autoscaling(alias=self.next_alias)
 
+    def wait_for_provisioned_concurrency_ready(
+        self,
+        alias,
+        wait_interval_seconds=5,
+        max_wait_seconds=600
+    ):
+        """
+        대상 별칭의 프로비저닝 동시성 할당이 READY 상태가 될 때까지 기다립니다.
+        할당에 실패(FAILED)하거나 대기 시간을 초과하면 예외가 발생합니다.
+        """
+        logging.info("Wait For Provisioned Concurrency Ready")
+        wait_count = max_wait_seconds // wait_interval_seconds
+        response = None
+        for _ in range(wait_count):
+            response = self.client.get_provisioned_concurrency_config(
+                FunctionName=self.function_name,
+                Qualifier=alias,
+            )
+            status = response["Status"].upper()
+
+            if status == "READY":
+                logging.info(pprint.pformat(response))
+                return self
+
+            if status == "FAILED":
+                raise LambdaUpdateException(
+                    f"프로비저닝 동시성 할당에 실패했습니다! - {response.get('StatusReason')}"
+                )
+
+            logging.info(
+                f"{alias} : {status} "
+                f"({response.get('AvailableProvisionedConcurrentExecutions', 0)}"
+                f"/{response.get('RequestedProvisionedConcurrentExecutions', 0)})"
+            )
+            sleep(wait_interval_seconds)
+
+        raise LambdaUpdateException(
+            f"프로비저닝 동시성이 준비되지 않았습니다! - {pprint.pformat(response)}"
+        )
+
+    def shift_alias_traffic(
+        self,
+        alias,
+        weights=(0.1, 0.25, 0.5),
+        step_interval_seconds=60
+    ):
+        """
+        가중치 별칭 라우팅(RoutingConfig)으로 트래픽을 신규 버전으로 단계적으로 전환합니다.
+        API Gateway가 호출하는 기존 별칭에 신규 버전의 가중치를 단계별로 늘린 뒤
+        마지막에 별칭이 신규 버전을 가리키도록 변경합니다.
+
+        :param alias: 트래픽을 전환할 별칭 (API Gateway가 호출 중인 별칭)
+        :param weights: 단계별 신규 버전 트래픽 비율 (0 < weight < 1)
+        :param step_interval_seconds: 단계 사이의 대기 시간
+        """
+        logging.info("Shift Alias Traffic")
+        if not self.published_version:
+            raise LambdaUpdateException("발행 된 버전이 없습니다!")
+
+        for weight in weights:
+            if not 0 < weight < 1:
+                raise LambdaUpdateException(f"잘못 된 가중치입니다! - {weight}")
+
+            logging.info(f"{alias} -> {self.published_version} : {weight:.0%}")
+            response = self.client.update_alias(
+                FunctionName=self.function_name,
+                Name=alias,
+                RoutingConfig={
+                    "AdditionalVersionWeights": {self.published_version: weight}
+                },
+            )
+            logging.info(pprint.pformat(response))
+            sleep(step_interval_seconds)
+
+        logging.info(f"{alias} -> {self.published_version} : 100%")
+        response = self.client.update_alias(
+            FunctionName=self.function_name,
+            Name=alias,
+            FunctionVersion=self.published_version,
+            RoutingConfig={"AdditionalVersionWeights": {}},
+        )
+        logging.info(pprint.pformat(response))
+        return self
+
+    def run_deploy_with_readiness_gate_process(
+        self,
+        serving_alias=None,
+        weights=(0.1, 0.25, 0.5),
+        step_interval_seconds=60
+    ):
+        """
+        프로비저닝 동시성 준비 이후 트래픽을 전환하는 배포를 수행합니다.
+
+        1. 신규 별칭에 서비스 별칭과 같은 프로비저닝 동시성을 설정하고 READY 까지 대기
+           (신규 버전이 초기화에 실패하면 트래픽을 옮기기 전에 중단합니다)
+        2. 서비스 별칭의 트래픽을 신규 버전으로 단계적 전환
+           (서비스 별칭의 프로비저닝 동시성은 가중치에 따라 두 버전에 나뉘어 유지됩니다)
+        3. 서비스 별칭의 프로비저닝 동시성이 신규 버전으로 READY 가 될 때까지 대기
+        4. 확인용으로 쓴 신규 별칭의 프로비저닝 동시성 삭제
+        서비스 별칭의 프로비저닝 동시성과 오토스케일링은 그대로 둡니다.
+        (이전 별칭이 없는 최초 배포는 신규 별칭을 서비스 별칭으로 두고 2 ~ 4 단계를 생략합니다)
+
+        :param serving_alias: API Gateway가 호출 중인 별칭. 최초 배포 이후의 신규 별칭은 확인용이라
+            API Gateway가 호출하지 않으므로 가장 최근 별칭으로 추정하지 않고 반드시 지정해야 합니다.
+        """
+        logging.info("Run Deploy With Readiness Gate Process")
+        if not self.previous_alias:
+            raise LambdaUpdateException("이전 별칭 정보가 없습니다!")
+
+        if not self.next_alias:
+            raise LambdaUpdateException("배포 된 별칭이 없습니다!")
+
+        if self.previous_alias == "v0":
+            logging.info("이전 별칭이 없어 트래픽 전환을 생략합니다.")
+            self.run_set_provisioning_autoscaling_process()
+            self.wait_for_provisioned_concurrency_ready(alias=self.next_alias)
+            return self
+
+        if not serving_alias:
+            raise LambdaUpdateException("서비스 별칭(API Gateway가 호출 중인 별칭)이 없습니다!")
+
+        self.set_provisioned_concurrency(
+            alias=self.next_alias,
+            need=self.get_provisioned_concurrency(alias=serving_alias)
+        )
+        self.wait_for_provisioned_concurrency_ready(alias=self.next_alias)
+
+        self.shift_alias_traffic(
+            alias=serving_alias,
+            weights=weights,
+            step_interval_seconds=step_interval_seconds,
+        )
+        self.wait_for_provisioned_concurrency_ready(alias=serving_alias)
+        self.delete_provisioned_concurrency(alias=self.next_alias)
+        return self
+
     def run_delete_previous_provisioning_autoscaling_process(self):
         """
         프로비저닝 동시성 오토스케일링 삭제를 수행합니다.
@@ -368,4 +581,48 @@ class LambdaUpdate(LambdaAutoScalingMeta):
         self.delete_provisioned_concurrency_autoscaling(alias=self.previous_alias)
 
 
+def deploy(
+    env,
+    function_name,
+    description,
+    gateway_arn=None,
+    serving_alias=None,
+    weights=(0.1, 0.25, 0.5),
+    step_interval_seconds=60,
+    package_profile="default"
+):
+    """
+    코드/설정 업데이트 후 신규 버전과 별칭을 발행하고
+    프로비저닝 동시성 준비를 확인한 뒤 서비스 별칭의 트래픽을 전환합니다.
+    최초 배포에서 만든 별칭(v1)이 서비스 별칭이 되며 이후 배포에서는 --serving_alias 로 지정합니다.
 
+        python lambda_update.py deploy --env dev --function_name <함수명> \
+            --description "..." --serving_alias v1
+    """
+    update = LambdaUpdate(env=env, function_name=function_name, package_profile=package_profile)
+
+    def wait_for_function_updated():
+        updated, response = update.wait_for_function_updated()
+        if not updated:
+            raise LambdaUpdateException(f"람다 업데이트가 끝나지 않았습니다! - {pprint.pformat(response)}")
+
+    update.update_function_code()
+    wait_for_function_updated()
+    update.update_function_configuration()
+    wait_for_function_updated()
+    update.publish_version(description)
+    update.create_alias()
+    if gateway_arn:
+        update.add_invoke_permission_to_gateway(gateway_arn)
+    update.run_deploy_with_readiness_gate_process(
+        serving_alias=serving_alias,
+        weights=weights,
+        step_interval_seconds=step_interval_seconds,
+    )
+    return update.next_alias
+
+
+if __name__ == '__main__':
+    fire.Fire({
+        "deploy": deploy,
+    })
@@ -0,0 +1,138 @@
+"""
+DAG 파일 파싱 시간 벤치마크.
+
+임시 AIRFLOW_HOME 에 sqlite 메타 DB 를 만들고 Variable 을 채운 뒤,
+DAG 파일별 DagBag 로드 시간과 파싱 중 실행된 메타 DB 쿼리 수를 측정합니다.
+
+    python mlops-dags/benchmark_dag_parse.py --repeat 20
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+
+dags_dir = os.path.dirname(os.path.abspath(__file__))
+
+default_variables = {
+    "env": "dev",
+    "mwaa": {"subnets": ["subnet-0"], "security_groups": ["sg-0"]},
+    "recommend/like-movie/variables": {
+        "repo": {
+            "base_uri": "<ACCOUNT>.dkr.ecr.ap-northeast-2.amazonaws.com",
+            "name": "mlops",
+        },
+        "image": {"version": "1.0.0"},
+    },
+}
+
+
+def prepare_airflow_home(airflow_home):
+    """ airflow 를 import 하기 전에 호출해야 합니다. """
+    os.environ["AIRFLOW_HOME"] = airflow_home
+    os.environ["AIRFLOW__DATABASE__SQL_ALCHEMY_CONN"] = \
+        f"sqlite:///{os.path.join(airflow_home, 'airflow.db')}"
+    os.environ["AIRFLOW__CORE__SQL_ALCHEMY_CONN"] = \
+        os.environ["AIRFLOW__DATABASE__SQL_ALCHEMY_CONN"]
+    os.environ["AIRFLOW__CORE__LOAD_EXAMPLES"] = "False"
+    os.environ["AIRFLOW__CORE__DAGS_FOLDER"] = dags_dir
+
+
+def init_metadata_db(variables):
+    from airflow.utils import db
+    from airflow.models import Variable
+
+    db.initdb()
+    for key, value in variables.items():
+        Variable.set(key, value, serialize_json=not isinstance(value, str))
+
+
+class QueryCounter:
+    """ 메타 DB 로 실행된 SQL 문 수를 셉니다. """
+    def __init__(self):
+        from sqlalchemy import event
+        from airflow import settings
+
+        self.count = 0
+        event.listen(settings.engine, "before_cursor_execute", self.on_execute)
+
+    def on_execute(self, *_):
+        self.count += 1
+
+
+def benchmark_dag_file(dag_file, repeat, query_counter):
+    from airflow.models import DagBag
+
+    elapsed = []
+    queries = []
+    dag_ids = []
+    for _ in range(repeat):
+        query_counter.count = 0
+        started_at = time.perf_counter()
+        dagbag = DagBag(dag_folder=dag_file, include_examples=False, safe_mode=False)
+        elapsed.append(time.perf_counter() - started_at)
+        queries.append(query_counter.count)
+        dag_ids = sorted(dagbag.dag_ids)
+        if dagbag.import_errors:
+            raise RuntimeError(json.dumps(dagbag.import_errors, indent=2))
+
+    return {
+        "file": os.path.relpath(dag_file, dags_dir),
+        "dag_ids": dag_ids,
+        "repeat": repeat,
+        "mean_ms": round(statistics.mean(elapsed) * 1000, 2),
+        "median_ms": round(statistics.median(elapsed) * 1000, 2),
+        "max_ms": round(max(elapsed) * 1000, 2),
+        "db_queries_per_parse": max(queries),
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dag_files", type=str, nargs="*", default=None)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--variables", type=str, default=None)
+    parser.add_argument("--output", type=str, default=None)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_arguments()
+    dag_files = args.dag_files or sorted(
+        path for path in glob.glob(os.path.join(dags_dir, "*.py"))
+        if os.path.basename(path) != os.path.basename(__file__)
+    )
+
+    variables = default_variables
+    if args.variables:
+        with open(args.variables, "r") as f:
+            variables = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp_airflow_home:
+        prepare_airflow_home(tmp_airflow_home)
+        sys.path.insert(0, dags_dir)
+        init_metadata_db(variables)
+        counter = QueryCounter()
+
+        results = [
+            benchmark_dag_file(dag_file, args.repeat, counter)
+            for dag_file in dag_files
+        ]
+
+    print(
+        f"{'file':<40} {'mean(ms)':>10} {'median(ms)':>11} "
+        f"{'max(ms)':>10} {'queries':>8}"
+    )
+    for result in results:
+        print(
+            f"{result['file']:<40} {result['mean_ms']:>10} {result['median_ms']:>11} "
+            f"{result['max_ms']:>10} {result['db_queries_per_parse']:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,129 @@
+import json
+import hashlib
+import logging
+
+from botocore.exceptions import ClientError
+
+
+CONTAINER_FINGERPRINT_KEYS = [
+    "name", "image", "cpu", "memory", "essential", "environment", "logConfiguration",
+]
+TASK_FINGERPRINT_KEYS = [
+    "family", "cpu", "memory", "networkMode", "requiresCompatibilities",
+    "taskRoleArn", "executionRoleArn",
+]
+
+
+def make_task_definition(
+    family,
+    container_name,
+    image_uri,
+    cpu,
+    memory,
+    task_role_arn,
+    execution_role_arn,
+    region="ap-northeast-2"
+):
+    """ register_task_definition 요청 인자를 만듭니다. """
+    return {
+        "containerDefinitions": [
+            {
+                "name": container_name,
+                "image": image_uri,
+                "cpu": int(cpu),
+                "memory": int(memory),
+                "portMappings": [],
+                "essential": True,
+                "environment": [],
+                "mountPoints": [],
+                "volumesFrom": [],
+                "logConfiguration": {
+                    "logDriver": "awslogs",
+                    "options": {
+                        "awslogs-group": f"/ecs/{family}",
+                        "awslogs-region": region,
+                        "awslogs-create-group": "true",
+                        "awslogs-stream-prefix": "ecs"
+                    }
+                }
+            }
+        ],
+        "taskRoleArn": task_role_arn,
+        "executionRoleArn": execution_role_arn,
+        "family": family,
+        "networkMode": "awsvpc",
+        "requiresCompatibilities": ["FARGATE"],
+        "cpu": str(cpu),
+        "memory": str(memory),
+    }
+
+
+def fingerprint(task_definition):
+    """
+    태스크 정의의 변경 여부를 판단하는 해시.
+    describe_task_definition 응답에 붙는 기본값/메타데이터는 제외하고
+    등록 요청에 지정하는 값만 비교합니다.
+    """
+    containers = [
+        {
+            key: str(container.get(key)) if key in ("cpu", "memory")
+            else container.get(key)
+            for key in CONTAINER_FINGERPRINT_KEYS
+        }
+        for container in task_definition["containerDefinitions"]
+    ]
+    task = {key: task_definition.get(key) for key in TASK_FINGERPRINT_KEYS}
+    task["cpu"] = str(task["cpu"])
+    task["memory"] = str(task["memory"])
+    task["requiresCompatibilities"] = sorted(task["requiresCompatibilities"] or [])
+
+    payload = json.dumps(
+        {"task": task, "containers": sorted(containers, key=lambda c: c["name"])},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TaskDefinitionRegistry:
+    """
+    변경이 있을 때만 ECS 태스크 정의를 등록합니다.
+
+    1. 같은 프로세스에서 이미 확인한 정의는 캐시된 ARN을 반환합니다.
+    2. 최신 ACTIVE 리비전과 fingerprint 가 같으면 해당 리비전 ARN을 반환합니다.
+    3. 다르거나 없으면 신규 리비전을 등록합니다.
+    """
+    def __init__(self, ecs):
+        self.ecs = ecs
+        self.cache = {}
+
+    def describe_latest(self, family):
+        try:
+            response = self.ecs.describe_task_definition(taskDefinition=family)
+        except ClientError as e:
+            # 등록 이력이 없는 family
+            if e.response["Error"]["Code"] in (
+                "ClientException", "InvalidParameterException"
+            ):
+                return None
+            raise
+        return response["taskDefinition"]
+
+    def ensure(self, task_definition):
+        """ :return: (태스크 정의 ARN, 신규 등록 여부) """
+        desired = fingerprint(task_definition)
+        if desired in self.cache:
+            return self.cache[desired], False
+
+        latest = self.describe_latest(task_definition["family"])
+        if latest and latest.get("status", "ACTIVE") == "ACTIVE" \
+                and fingerprint(latest) == desired:
+            arn = latest["taskDefinitionArn"]
+            logging.info(f"reuse task definition : {arn}")
+            self.cache[desired] = arn
+            return arn, False
+
+        response = self.ecs.register_task_definition(**task_definition)
+        arn = response["taskDefinition"]["taskDefinitionArn"]
+        logging.info(f"register task definition : {arn}")
+        self.cache[desired] = arn
+        return arn, True
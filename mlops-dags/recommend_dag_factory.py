@@ -0,0 +1,263 @@
+import os
+import sys
+import glob
+import json
+import hashlib
+import datetime
+import tempfile
+
+import boto3
+from pytz import timezone
+from airflow import DAG
+from airflow.models import Variable
+from airflow.providers.amazon.aws.operators.ecs import EcsRunTaskOperator
+
+
+project_dir = os.environ.get(
+    "MLOPS_PROJECT_DIR",
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from config_controller import config_file_path, get_config  # noqa: E402
+from ecs_task_definition import (  # noqa: E402
+    TaskDefinitionRegistry, make_task_definition
+)
+
+
+user = "<유저명>"  # 수정
+prefix = "mlops"
+service_type = "recommend"
+# 설정 파일 경로를 정하기 위해 파싱 시점에 읽습니다. 값이 없으면 KeyError 로 실패합니다.
+# Variable.get 은 환경 변수(AIRFLOW_VAR_ENV)를 먼저 확인하므로 설정되어 있으면 메타 DB 를 조회하지 않습니다.
+namespace = Variable.get("env")
+cache_dir = os.environ.get(
+    "MLOPS_DAG_SPEC_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "mlops-dag-specs")
+)
+
+# 아래 값들은 태스크 실행 시점에 템플릿으로 렌더링 됩니다.
+mwaa_subnets = "{{ var.json.mwaa.subnets }}"
+mwaa_security_groups = "{{ var.json.mwaa.security_groups }}"
+run_datetime = "{{ macros.datetime.utcnow().strftime('%Y%m%d-%H%M%S') }}"
+task_definition_registry = None
+ecs_task_network_configuration = {
+    "awsvpcConfiguration": {
+        "subnets": mwaa_subnets,
+        "securityGroups": mwaa_security_groups,
+    },
+}
+
+
+def get_service_variables(service_name):
+    """ 서비스 Variable 을 JSON 한 번으로 조회합니다. (태스크 실행 시점에만 호출) """
+    return Variable.get(
+        f"{service_type}/{service_name}/variables", deserialize_json=True
+    )
+
+
+def get_container_image_uri(service_name):
+    variables = get_service_variables(service_name)
+    repository_base_uri = variables.get("repo").get("base_uri")
+    repository_name = variables.get("repo").get("name")
+    image_version = variables.get("image").get("version")
+    return f"{repository_base_uri}/{repository_name}/{service_name}:{image_version}"
+
+
+def get_task_definition_registry():
+    global task_definition_registry
+    if task_definition_registry is None:
+        task_definition_registry = TaskDefinitionRegistry(boto3.client("ecs"))
+    return task_definition_registry
+
+
+def register_ecs_task(context):
+    """
+    태스크 정의가 바뀐 경우에만 신규 리비전을 등록하고,
+    실행할 태스크가 확인된 리비전 ARN을 사용하도록 지정합니다.
+    """
+    params = context["params"]
+    task_definition = make_task_definition(
+        family=params["task_definition"],
+        container_name=params["container_name"],
+        image_uri=get_container_image_uri(params["service_name"]),
+        cpu=params["cpu"],
+        memory=params["memory"],
+        task_role_arn="arn:aws:iam::<ACCOUNT>:role/MLOpsECSTaskExecutionRole",  # 수정
+        execution_role_arn="arn:aws:iam::<ACCOUNT>:role/MLOpsECSTaskExecutionRole",  # 수정
+    )
+    arn, registered = get_task_definition_registry().ensure(task_definition)
+    print(f"task definition : {arn} (registered : {registered})")
+    context["task"].task_definition = arn
+
+    # 후속 태스크가 --dependency_job_name 으로 넘길 수 있도록 렌더링 된 작업 이름을 남깁니다
+    command = context["task"].overrides["containerOverrides"][0]["command"]
+    context["ti"].xcom_push(key="job_name", value=command[command.index("-j") + 1])
+
+
+def make_dag_spec(service_name, config):
+    """ DAG 생성에 필요한 값만 추려 JSON 직렬화 가능한 형태로 만듭니다. """
+    tasks = config["parameters"]["tasks"]
+    dag_config = config.get("dag", {})
+    dependencies = dag_config.get("dependencies", {})
+    unknown = {
+        upstream for upstreams in dependencies.values() for upstream in upstreams
+    } - set(tasks)
+    if unknown:
+        raise ValueError(f"정의되지 않은 선행 태스크입니다 : {service_name} - {unknown}")
+
+    return {
+        "service_name": service_name,
+        "namespace": config.get("namespace", namespace),
+        "version": config["parameters"]["version"],
+        "description": dag_config.get("description", f"{service_name} 모델 워크플로우"),
+        "doc_md": dag_config.get("doc_md"),
+        "schedule_interval": dag_config.get("schedule_interval", "0 0 * * *"),
+        "start_date": str(dag_config.get("start_date", "2024-03-06")),
+        "timezone": dag_config.get("timezone", "Asia/Seoul"),
+        "tags": dag_config.get("tags", [service_type, service_name]),
+        "ecs": {"cpu": "512", "memory": "1024", **dag_config.get("ecs", {})},
+        "tasks": [
+            {
+                "task_id": task_name.replace("_", "-"),
+                "model_name": params.get("model_name"),
+                "upstream": [
+                    upstream.replace("_", "-")
+                    for upstream in dependencies.get(task_name, [])
+                ],
+            }
+            for task_name, params in tasks.items()
+        ],
+    }
+
+
+def load_dag_spec(service_name):
+    """
+    설정 파일과 이 팩토리 코드의 해시로 캐싱 된 DAG 명세를 불러옵니다.
+    둘 다 바뀌지 않았다면 YAML 파싱 없이 캐시 JSON 만 읽습니다.
+    """
+    path = config_file_path.format(NAMESPACE=namespace, SERVICE_NAME=service_name)
+    spec_hash = hashlib.sha256()
+    for source in [path, os.path.abspath(__file__)]:
+        with open(source, "rb") as f:
+            spec_hash.update(f.read())
+    spec_hash = spec_hash.hexdigest()[:16]
+
+    cache_path = os.path.join(
+        cache_dir, f"{service_name}-{namespace}-{spec_hash}.json"
+    )
+    if os.path.exists(cache_path):
+        with open(cache_path, "r") as f:
+            return json.load(f)
+
+    spec = make_dag_spec(
+        service_name, get_config(namespace=namespace, service_name=service_name)
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(spec, f)
+    os.replace(tmp_path, cache_path)
+    return spec
+
+
+def find_service_names():
+    pattern = config_file_path.format(NAMESPACE=namespace, SERVICE_NAME="*")
+    return sorted(
+        os.path.basename(os.path.dirname(path)) for path in glob.glob(pattern)
+    )
+
+
+def create_dag(spec):
+    service_name = spec["service_name"]
+    ecs_cluster = f"{prefix}-airflow-ecs-cluster-{user}"
+    ecs_task_definition = f"{prefix}-airflow-{service_name}-task-{user}"
+    ecs_task_container_name = f"airflow-{service_name}-container"
+    target_date = (
+        f"{{{{ var.json.get('{service_type}/{service_name}/variables', {{}})"
+        ".get('manual_execution_date') "
+        f"or execution_date.in_timezone('{spec['timezone']}').strftime('%Y-%m-%d') }}}}"
+    )
+
+    with DAG(
+        dag_id=f"{service_type}-{service_name}-v{spec['version']}",
+        description=spec["description"],
+        default_args={
+            "owner": "MLOps",
+            "depends_on_past": False,
+            "retries": 0,
+        },
+        start_date=datetime.datetime.strptime(
+            spec["start_date"], "%Y-%m-%d"
+        ).replace(tzinfo=timezone(spec["timezone"])),
+        schedule_interval=spec["schedule_interval"],
+        max_active_runs=1,
+        concurrency=3,
+        catchup=False,
+        dagrun_timeout=datetime.timedelta(hours=5),
+        tags=spec["tags"],
+        doc_md=spec["doc_md"],
+        # 서브넷/보안그룹 템플릿이 문자열이 아닌 리스트로 렌더링 되도록 합니다
+        render_template_as_native_obj=True,
+    ) as dag:
+        operators = {}
+        for task in spec["tasks"]:
+            task_id = task["task_id"]
+            job_name = (
+                f"{spec['namespace']}-{task['model_name']}-{task_id}-{run_datetime}"
+            )
+            command = [
+                "/app/scripts/run/sagemaker/99_run_with_config.sh",
+                "-n", spec["namespace"],
+                "-s", service_name,
+                "-t", task_id,
+                "-d", target_date,
+                "-j", job_name,
+            ]
+            if task["upstream"]:
+                # 첫 번째 선행 태스크의 작업 이름 (99_run_with_config.sh 가 --dependency_job_name 으로 전달)
+                command.extend([
+                    "-p",
+                    f"{{{{ ti.xcom_pull(task_ids='{task['upstream'][0]}', key='job_name') }}}}",
+                ])
+            operators[task_id] = EcsRunTaskOperator(
+                task_id=task_id,
+                dag=dag,
+                cluster=ecs_cluster,
+                task_definition=ecs_task_definition,
+                launch_type="FARGATE",
+                overrides={
+                    "containerOverrides": [
+                        {
+                            "name": ecs_task_container_name,
+                            "command": command
+                        },
+                    ],
+                },
+                network_configuration=ecs_task_network_configuration,
+                execution_timeout=datetime.timedelta(hours=1),
+                awslogs_region="ap-northeast-2",
+                awslogs_group=f"/ecs/{ecs_task_definition}",
+                awslogs_stream_prefix=f"ecs/{ecs_task_container_name}",
+                awslogs_fetch_interval=datetime.timedelta(seconds=5),
+                params={
+                    "service_name": service_name,
+                    "container_name": ecs_task_container_name,
+                    "task_definition": ecs_task_definition,
+                    "cpu": spec["ecs"]["cpu"],
+                    "memory": spec["ecs"]["memory"],
+                },
+                on_execute_callback=register_ecs_task,
+            )
+
+        for task in spec["tasks"]:
+            for upstream in task["upstream"]:
+                operators[upstream] >> operators[task["task_id"]]
+
+    return dag
+
+
+for _service_name in find_service_names():
+    _dag = create_dag(load_dag_spec(_service_name))
+    globals()[_dag.dag_id] = _dag
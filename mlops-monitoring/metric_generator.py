@@ -1,3 +1,5 @@
+import sys
+import json
 import time
 import datetime
 import pprint
@@ -64,6 +66,50 @@ def generate_metrics(cw, namespace, metric_info):
                 raise CustomPutMetricsError(pprint.pformat(response))
 
 
+def put_metrics(cw, namespace, metrics, dimensions, unit="None", timestamp=None):
+    """
+    {매트릭 이름: 값} 을 한 번에 게시합니다. (요청당 최대 1000개)
+    """
+    timestamp = timestamp or datetime.datetime.utcnow()
+    metric_data = [
+        {
+            'MetricName': name,
+            'Dimensions': dimensions,
+            'Timestamp': timestamp,
+            'Value': round(float(value), 6),
+            'Unit': unit,
+        }
+        for name, value in metrics.items()
+    ]
+    for i in range(0, len(metric_data), 1000):
+        response = cw.put_metric_data(
+            Namespace=namespace, MetricData=metric_data[i:i + 1000]
+        )
+        if response["ResponseMetadata"]["HTTPStatusCode"] != 200:
+            raise CustomPutMetricsError(pprint.pformat(response))
+
+
+def publish_evaluation_metrics(cw, namespace, metrics_path, job_name):
+    """
+    평가 단계(src/evaluate)가 남긴 metrics.json 을 학습 작업 차원으로 게시합니다.
+    NDCG@K 는 기존 대시보드와 같은 이름(NDCG)으로도 게시합니다.
+    """
+    with open(metrics_path, "r") as f:
+        metrics = json.load(f)
+    metrics.update({
+        name.split("@")[0]: value
+        for name, value in metrics.items()
+        if name.startswith("NDCG@")
+    })
+    print(f"put evaluation metrics : {job_name}, {metrics}")
+    put_metrics(
+        cw=cw,
+        namespace=namespace,
+        metrics=metrics,
+        dimensions=[{"Name": "TrainingJobName", "Value": job_name}],
+    )
+
+
 def copy_metrics(cw, namespace, copy_namespace, metric_info, period=300, lookup_hours=6):
     for name, info in metric_info.items():
         print(info)
@@ -158,6 +204,15 @@ if __name__ == '__main__':
     }
 
     cw = boto3.client("cloudwatch")
+    if len(sys.argv) > 1:
+        # python metric_generator.py <metrics.json> <학습 작업명> : 실제 평가 결과를 게시합니다
+        if len(sys.argv) != 3:
+            sys.exit("usage: python metric_generator.py <metrics.json> <training_job_name>")
+        publish_evaluation_metrics(
+            cw=cw, namespace=copy_namespace, metrics_path=sys.argv[1], job_name=sys.argv[2]
+        )
+        sys.exit(0)
+
     generate_metrics(cw=cw, namespace=namespace, metric_info=metric_info)
     time.sleep(60)
     copy_metrics(
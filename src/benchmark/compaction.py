@@ -0,0 +1,149 @@
+"""
+파티션 병합 벤치마크 (로컬 디렉터리 / moto 로컬 S3).
+
+마이크로 배치처럼 날짜마다 작은 parquet 파일이 여러 개 쌓인 데이터셋을 만들고,
+병합 전(파티션 나열 + 작은 파일 읽기)과 병합 후(manifest + 정렬된 큰 파일 읽기)의
+여러 날짜 읽기 시간과 S3 요청 수, 유저 구간 조회 시 통계로 건너뛴 파일 수를 비교합니다.
+
+    cd src
+    python -m benchmark.compaction --days 7 --files_per_day 96 --users 200000
+
+moto 는 프로세스 내부에서 응답하므로 --request_latency_ms 로 요청마다 지연을 넣어
+S3 의 첫 바이트 지연을 흉내냅니다.
+"""
+import io
+import os
+import json
+import time
+import logging
+import argparse
+import datetime
+import tempfile
+
+import numpy as np
+import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
+from moto import mock_aws
+
+from common.compaction import (
+    LocalStorage, S3Storage, compact_range, partition_key, plan_reads, read_range
+)
+from benchmark.synthetic import make_watch_log
+
+
+BUCKET = "mlops-recommend-system-benchmark"
+PREFIX = "ns=dev/input/data"
+DATASET = dict(dataset_name="watch_log", dataset_version=1)
+
+
+def put_small_files(storage, df, start_date, days, files_per_day, seed=0):
+    """ 시청 로그를 날짜 x 파일로 무작위로 흩어 작은 parquet 파일로 씁니다. """
+    rng = np.random.default_rng(seed)
+    slots = rng.integers(0, days * files_per_day, size=len(df))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    order = np.argsort(slots, kind="stable")
+    bounds = np.searchsorted(slots[order], np.arange(days * files_per_day + 1))
+    for slot in range(days * files_per_day):
+        base_date = start_date + datetime.timedelta(days=slot // files_per_day)
+        sink = io.BytesIO()
+        pq.write_table(table.take(order[bounds[slot]:bounds[slot + 1]]), sink, compression="snappy")
+        storage.put(
+            f"{partition_key(base_date, **DATASET)}/part-{slot % files_per_day:05d}.snappy.parquet",
+            sink.getvalue(),
+        )
+
+
+def measure_read(storage, start_date, end_date, counter, user_range=None):
+    files = len(plan_reads(storage, start_date, end_date, user_range=user_range, **DATASET))
+    counter["requests"] = 0
+    started_at = time.perf_counter()
+    table = read_range(storage, start_date, end_date, user_range=user_range, **DATASET)
+    return {
+        "seconds": round(time.perf_counter() - started_at, 4),
+        "files": files,
+        "rows": table.num_rows,
+        "requests": counter["requests"],
+    }
+
+
+def run(storage, df, args, counter):
+    first_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d")
+    start_date = args.start_date
+    end_date = (first_date + datetime.timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+    put_small_files(storage, df, first_date, args.days, args.files_per_day)
+    user_range = (args.users // 2, args.users // 2 + args.users // 100)
+
+    result = {
+        "before": measure_read(storage, start_date, end_date, counter),
+        "before_user_range": measure_read(storage, start_date, end_date, counter, user_range),
+    }
+    counter["requests"] = 0
+    started_at = time.perf_counter()
+    compact_range(
+        storage, start_date, end_date,
+        target_file_mb=args.target_file_mb, row_group_rows=args.row_group_rows, **DATASET
+    )
+    result["compaction"] = {
+        "seconds": round(time.perf_counter() - started_at, 4),
+        "requests": counter["requests"],
+    }
+    result["after"] = measure_read(storage, start_date, end_date, counter)
+    result["after_user_range"] = measure_read(storage, start_date, end_date, counter, user_range)
+    assert result["before"]["rows"] == result["after"]["rows"] == len(df)
+    assert result["before_user_range"]["rows"] == result["after_user_range"]["rows"]
+    result["speedup"] = round(result["before"]["seconds"] / result["after"]["seconds"], 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--files_per_day", type=int, default=96)
+    parser.add_argument("--start_date", type=str, default="2024-03-01")
+    parser.add_argument("--target_file_mb", type=int, default=1)
+    parser.add_argument("--row_group_rows", type=int, default=50000)
+    parser.add_argument("--request_latency_ms", type=float, default=20)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    df = make_watch_log(args.users)
+    results = {"rows": len(df), "days": args.days, "files_per_day": args.files_per_day}
+
+    counter = {"requests": 0}
+    with tempfile.TemporaryDirectory() as root:
+        results["local"] = run(LocalStorage(root), df, args, counter)
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=BUCKET)
+
+        def before_send(**kwargs):
+            counter["requests"] += 1
+            time.sleep(args.request_latency_ms / 1000)
+
+        s3.meta.events.register("before-send.s3.*", before_send)
+        results["s3"] = run(S3Storage(f"s3://{BUCKET}/{PREFIX}", s3_client=s3), df, args, counter)
+        results["s3"]["request_latency_ms"] = args.request_latency_ms
+
+    for name in ["local", "s3"]:
+        result = results[name]
+        logging.info(
+            f"{name:<5} read {result['before']['files']} files {result['before']['seconds']}s "
+            f"({result['before']['requests']} requests) -> {result['after']['files']} files "
+            f"{result['after']['seconds']}s ({result['after']['requests']} requests), "
+            f"user range files {result['before_user_range']['files']} "
+            f"-> {result['after_user_range']['files']}"
+        )
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
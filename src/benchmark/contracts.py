@@ -0,0 +1,168 @@
+"""
+단계 간 데이터 계약 벤치마크.
+
+1. 잘못된 items 컬럼(list<int64>)을 가진 추론 결과를 parquet footer 만 읽어 거르는 시간과
+   기존처럼 파일 전체를 읽은 뒤에야 알게 되는 시간을 비교합니다.
+2. 로컬 파이프라인(추론 결과 → fold_in → postprocess 로드 → evaluate)을 한 프로세스에서
+   parquet 파일로 주고받을 때와 Handoff 로 Arrow Table 을 그대로 넘길 때의 단계별 시간을 비교합니다.
+
+    cd src
+    python -m benchmark.contracts --num_users 100000
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from common.contracts import (
+    INFERENCE_RESULT, ContractError, Handoff, put_output, validate_parquet
+)
+from evaluate.evaluate import WatchLogNCFEvaluation
+from evaluate.metrics import RelevanceIndex
+from postprocess.postprocess import WatchLogNCFPostProcess
+from refresh.fold_in import WatchLogNCFNewUserFoldIn
+from benchmark.data_path import make_postprocess_args
+from benchmark.fold_in import make_new_user_log
+from benchmark.incremental_refresh import make_store
+from benchmark.synthetic import make_inference_result
+
+
+def measure(stages, name, func):
+    started_at = time.perf_counter()
+    result = func()
+    stages[name] = round(time.perf_counter() - started_at, 4)
+    return result
+
+
+def run_validation(inference_df, output_dir):
+    """ 잘못된 추론 결과를 알아채기까지 걸리는 시간 """
+    path = os.path.join(output_dir, "bad_inference_result.snappy.parquet")
+    bad_df = inference_df.assign(
+        items=[[item["code"] for item in items] for items in inference_df["items"]]
+    )
+    bad_df.to_parquet(path, compression="snappy")
+
+    started_at = time.perf_counter()
+    try:
+        validate_parquet(path, INFERENCE_RESULT)
+        metadata_error = None
+    except ContractError as e:
+        metadata_error = str(e)
+    metadata_seconds = time.perf_counter() - started_at
+
+    # 기존 방식: 전체를 읽고 첫 행을 변환할 때 실패합니다
+    started_at = time.perf_counter()
+    df = pd.read_parquet(path)
+    try:
+        df["items"].iloc[0][0]["code"]
+        full_read_error = None
+    except (IndexError, TypeError) as e:
+        full_read_error = repr(e)
+    full_read_seconds = time.perf_counter() - started_at
+    return {
+        "file_mb": round(os.path.getsize(path) / 2 ** 20, 2),
+        "metadata_seconds": round(metadata_seconds, 5),
+        "metadata_error": metadata_error,
+        "full_read_seconds": round(full_read_seconds, 4),
+        "full_read_error": full_read_error,
+        "speedup": round(full_read_seconds / metadata_seconds, 1),
+    }
+
+
+def make_task_args(output_dir, args):
+    task_args = make_postprocess_args(output_dir)
+    task_args.dataset_dir = os.path.join(output_dir, "input")
+    task_args.dataset_name = "watch_log"
+    task_args.model_dir = os.path.join(output_dir, "model")
+    task_args.refresh_embedding_path = None
+    task_args.fold_in_reg = 0.1
+    task_args.fold_in_alpha = 1.0
+    task_args.fold_in_top_k = 16
+    task_args.fold_in_min_interactions = 1
+    task_args.eval_top_k = 10
+    task_args.eval_chunk_size = 10000
+    task_args.eval_holdout_path = None
+    for target_dir in [task_args.dataset_dir, task_args.model_dir]:
+        os.makedirs(target_dir, exist_ok=True)
+    return task_args
+
+
+def run_pipeline(store, inference_df, new_user_log, index, handoff, args):
+    stages = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        task_args = make_task_args(output_dir, args)
+        store.save(os.path.join(task_args.model_dir, "embeddings.npz"))
+        new_user_log.to_csv(os.path.join(task_args.dataset_dir, "watch_log.csv"), index=False)
+        inference_path = os.path.join(output_dir, "inference", INFERENCE_RESULT.file_name())
+
+        postprocess = WatchLogNCFPostProcess(task_args, handoff=handoff)
+        measure(stages, "inference_output", lambda: put_output(
+            handoff, INFERENCE_RESULT, inference_df, inference_path
+        ))
+        measure(stages, "fold_in", WatchLogNCFNewUserFoldIn(task_args, handoff=handoff).run)
+        df = measure(stages, "postprocess_load", postprocess.load_dataset)
+        result = measure(
+            stages, "evaluate", lambda: WatchLogNCFEvaluation(task_args, handoff=handoff).evaluate(index)
+        )
+    stages["total"] = round(sum(stages.values()), 4)
+    return {"stages": stages, "rows": len(df), "ndcg": result[f"NDCG@{task_args.eval_top_k}"]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=100000)
+    parser.add_argument("--new_users", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    store = make_store(args.num_users, args.dim)
+    inference_df = make_inference_result(args.num_users)
+    new_user_log, _ = make_new_user_log(store, args.new_users)
+    index = RelevanceIndex(new_user_log, new_user_log)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        results = {"validation": run_validation(inference_df, output_dir)}
+    for name, make_handoff in [("disk", lambda: None), ("handoff", Handoff)]:
+        # 단계별로 repeat 회 중 가장 빠른 시간을 사용합니다
+        runs = [
+            run_pipeline(store, inference_df, new_user_log, index, make_handoff(), args)
+            for _ in range(args.repeat)
+        ]
+        results[name] = {
+            **runs[0],
+            "stages": {
+                stage: min(run["stages"][stage] for run in runs) for stage in runs[0]["stages"]
+            },
+        }
+    assert results["disk"]["rows"] == results["handoff"]["rows"]
+    assert np.isclose(results["disk"]["ndcg"], results["handoff"]["ndcg"])
+    results["saved_seconds"] = {
+        name: round(seconds - results["handoff"]["stages"][name], 4)
+        for name, seconds in results["disk"]["stages"].items()
+    }
+
+    logging.info(
+        f"bad items detected : footer {results['validation']['metadata_seconds']}s / "
+        f"full read {results['validation']['full_read_seconds']}s"
+    )
+    for name in results["disk"]["stages"]:
+        logging.info(
+            f"{name:<17} disk {results['disk']['stages'][name]:>8}s "
+            f"handoff {results['handoff']['stages'][name]:>8}s"
+        )
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,266 @@
+"""
+추천 데이터 경로 오프라인 벤치마크.
+
+    cd src
+    python -m benchmark.data_path run --scale 10k --output ../bench/head.json
+    python -m benchmark.data_path compare ../bench/base.json ../bench/head.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import datetime
+import resource
+import tempfile
+import subprocess
+from types import SimpleNamespace
+
+from common.ddb import DynamoDB
+from postprocess.postprocess import WatchLogNCFPostProcess
+from utils.utils import make_s3_dataset_path, make_s3_model_output_path
+from benchmark.stubs import StubDynamoDBResource
+from benchmark.synthetic import (
+    WatchLogShape, make_inference_result, make_watch_log, parse_scale
+)
+
+
+def peak_rss_mb():
+    """ 마지막 reset_peak_rss 이후의 최대 RSS (VmHWM). /proc 이 없으면 프로세스 전체 최대값 """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # 리눅스의 ru_maxrss 단위는 KB 입니다
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def reset_peak_rss():
+    """
+    VmHWM 을 현재 RSS 로 되돌립니다. (리눅스 4.0 이상)
+    :return: 되돌렸는지 여부. 실패하면 peak_rss_mb 는 단계별 값이 아닙니다.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            "git rev-parse --short HEAD", shell=True, stderr=subprocess.DEVNULL
+        ).strip().decode("utf-8")
+    except subprocess.CalledProcessError:
+        return None
+
+
+class StageTimer:
+    def __init__(self, repeat=1):
+        self.repeat = repeat
+        self.stages = {}
+        self.process_peak_rss_mb = 0.0
+
+    def process_peak(self):
+        """ 단계마다 VmHWM 을 되돌리므로 되돌리기 전 값까지 포함한 프로세스 최대 RSS """
+        return max(self.process_peak_rss_mb, peak_rss_mb())
+
+    def measure(self, name, func, rows=None):
+        """
+        func 를 repeat 회 실행하고 가장 빠른 시간을 기록합니다.
+        peak_rss_mb 는 단계 시작 시 VmHWM 을 되돌린 뒤 잰 단계 중 최대 RSS 이며,
+        되돌릴 수 없는 환경에서는 None 입니다.
+        """
+        self.process_peak_rss_mb = self.process_peak()
+        per_stage = reset_peak_rss()
+        elapsed = []
+        result = None
+        for _ in range(self.repeat):
+            started_at = time.perf_counter()
+            result = func()
+            elapsed.append(time.perf_counter() - started_at)
+
+        seconds = min(elapsed)
+        self.stages[name] = {
+            "seconds": round(seconds, 6),
+            "rows": rows,
+            "rows_per_second": round(rows / seconds, 2) if rows and seconds else None,
+            "peak_rss_mb": round(peak_rss_mb(), 2) if per_stage else None,
+        }
+        logging.info(f"{name} : {self.stages[name]}")
+        return result
+
+
+def make_postprocess_args(output_dir):
+    return SimpleNamespace(
+        base_date=datetime.date.today().strftime("%Y-%m-%d"),
+        output_dir=output_dir,
+        aws_region="ap-northeast-2",
+        timezone="Asia/Seoul",
+        serve_data_version=1,
+        serve_recommend_type="like",
+        serve_contents_type="movie",
+        serve_contents_limit=30,
+        serve_data_ttl=3600 * 24 * 3,
+        serve_ddb_table_name="benchmark",
+        serve_popular_shard_count=1,
+        serve_ttl_jitter_seconds=0,
+        serve_ttl_stale_extend_seconds=0,
+        serve_ttl_max_expiry_ratio_per_hour=1.0,
+        serve_ddb_wcu_budget=0,
+        serve_ddb_partition_buckets=8,
+    )
+
+
+def run_benchmark(scale, repeat=1, path_calls=100_000, seed=0):
+    num_users = parse_scale(scale)
+    timer = StageTimer(repeat=repeat)
+    shape = WatchLogShape()
+
+    watch_log = timer.measure(
+        "generate_watch_log",
+        lambda: make_watch_log(num_users, shape=shape, seed=seed),
+        rows=num_users,
+    )
+    inference_df = timer.measure(
+        "generate_inference_result",
+        lambda: make_inference_result(num_users, shape=shape, seed=seed),
+        rows=num_users,
+    )
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        postprocess = WatchLogNCFPostProcess(make_postprocess_args(output_dir))
+        src = os.path.join(postprocess.dataset_src, "inference_result.snappy.parquet")
+
+        timer.measure(
+            "write_inference_parquet",
+            lambda: inference_df.to_parquet(src, compression="snappy"),
+            rows=num_users,
+        )
+        del inference_df
+        df = timer.measure("load_dataset", postprocess.load_dataset, rows=num_users)
+        recommend_data = timer.measure(
+            "convert_ddb_recommend_schema",
+            lambda: postprocess.make_recommend_data(df),
+            rows=num_users,
+        )
+
+        ddb = DynamoDB(aws_region=None, resource=StubDynamoDBResource())
+        timer.measure(
+            "batch_write_df_to_ddb",
+            lambda: postprocess.write_recommend_data(ddb, recommend_data),
+            rows=num_users,
+        )
+
+    base_date = datetime.datetime(2024, 3, 6)
+    timer.measure(
+        "make_s3_dataset_path",
+        lambda: [
+            make_s3_dataset_path("s3://bucket/input/data", "watch_log", 1, base_date)
+            for _ in range(path_calls)
+        ],
+        rows=path_calls,
+    )
+    timer.measure(
+        "make_s3_model_output_path",
+        lambda: [
+            make_s3_model_output_path("s3://bucket/output", "ncf", base_date)
+            for _ in range(path_calls)
+        ],
+        rows=path_calls,
+    )
+
+    return {
+        "commit": get_commit(),
+        "created_at": datetime.datetime.utcnow().isoformat(),
+        "scale": str(scale),
+        "num_users": num_users,
+        "watch_log_rows": len(watch_log),
+        "repeat": repeat,
+        "python": sys.version.split()[0],
+        "peak_rss_mb": round(timer.process_peak(), 2),
+        "stages": timer.stages,
+    }
+
+
+def compare(base, head, threshold=0.1):
+    """
+    두 결과의 단계별 시간을 비교합니다.
+    head 가 base 보다 threshold 비율 이상 느린 단계를 회귀로 판단합니다.
+
+    :return: (리포트 행 리스트, 회귀 단계 리스트)
+    """
+    rows = []
+    regressions = []
+    for name, base_stage in base["stages"].items():
+        head_stage = head["stages"].get(name)
+        if not head_stage:
+            continue
+        ratio = head_stage["seconds"] / base_stage["seconds"] \
+            if base_stage["seconds"] else float("inf")
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        rows.append(
+            f"{'!' if regressed else ' '} {name:<30} "
+            f"{base_stage['seconds']:>10.4f}s {head_stage['seconds']:>10.4f}s "
+            f"{ratio:>6.2f}x"
+        )
+    return rows, regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--scale", type=str, default="10k")
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", type=str, default=None)
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("base", type=str)
+    compare_parser.add_argument("head", type=str)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+
+    if args.command == "run":
+        result = run_benchmark(scale=args.scale, repeat=args.repeat, seed=args.seed)
+        output = args.output or f"benchmark-{result['commit'] or 'local'}-{args.scale}.json"
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(result, f, indent=2)
+        logging.info(f"saved : {output}")
+    else:
+        with open(args.base, "r") as f:
+            base_result = json.load(f)
+        with open(args.head, "r") as f:
+            head_result = json.load(f)
+        if base_result["scale"] != head_result["scale"]:
+            logging.warning(
+                f"scale 이 다릅니다 : {base_result['scale']} / {head_result['scale']}"
+            )
+
+        report, regressed_stages = compare(
+            base_result, head_result, threshold=args.threshold
+        )
+        print(
+            f"  {'stage':<30} {str(base_result['commit'] or '-'):>11} "
+            f"{str(head_result['commit'] or '-'):>11}"
+        )
+        print("\n".join(report))
+        if regressed_stages:
+            print(f"regressions : {', '.join(regressed_stages)}")
+            sys.exit(1)
@@ -0,0 +1,118 @@
+"""
+DynamoDB 쓰기 스케줄링 벤치마크 (파티션 용량을 흉내내는 로컬 대역, 시뮬레이션 시계).
+
+boto3 batch_writer 로 추론 결과 순서 그대로 쓰는 기존 방식과 WriteScheduler
+(중복 제거 + 파티션 버킷 라운드 로빈 + WCU 토큰 버킷)의 스로틀링 건수와 총 적재 시간을 비교합니다.
+
+    cd src
+    python -m benchmark.ddb_write_schedule --num_users 50000 --duplicate_ratio 0.01
+"""
+import json
+import random
+import logging
+import argparse
+import tempfile
+
+from boto3.dynamodb.table import BatchWriter
+from botocore.exceptions import ClientError
+
+from common.write_scheduler import WriteScheduler
+from postprocess.postprocess import WatchLogNCFPostProcess
+from benchmark.data_path import make_postprocess_args
+from benchmark.stubs import SimulatedClock, ThrottlingDynamoDBResource
+from benchmark.synthetic import make_inference_result
+
+
+TABLE_NAME = "benchmark"
+
+
+def make_items(num_users, duplicate_ratio, seed=0):
+    with tempfile.TemporaryDirectory() as output_dir:
+        postprocess = WatchLogNCFPostProcess(make_postprocess_args(output_dir))
+        items = postprocess.make_recommend_data(make_inference_result(num_users, seed=seed))
+
+    # 같은 유저가 추론 결과에 다시 나타나는 경우를 흉내냅니다
+    rng = random.Random(seed)
+    for _ in range(int(len(items) * duplicate_ratio)):
+        position = rng.randrange(1, len(items))
+        items.insert(min(len(items), position + rng.randrange(1, 10)), dict(items[position]))
+    return items
+
+
+def run_batch_writer(items, args):
+    clock = SimulatedClock()
+    resource = ThrottlingDynamoDBResource(
+        clock, args.num_partitions, args.partition_wcu, args.request_latency
+    )
+    failed = None
+    try:
+        with BatchWriter(TABLE_NAME, resource) as writer:
+            for item in items:
+                writer.put_item(Item=item)
+    except ClientError as e:
+        failed = e.response["Error"]["Code"]
+    return {
+        "failed": failed,
+        "written": len(resource.Table(TABLE_NAME).items),
+        "requests": resource.batch_requests,
+        "throttled_items": resource.throttled_items,
+        "seconds": round(clock.time(), 3),
+    }
+
+
+def run_scheduler(items, args):
+    clock = SimulatedClock()
+    resource = ThrottlingDynamoDBResource(
+        clock, args.num_partitions, args.partition_wcu, args.request_latency
+    )
+    scheduler = WriteScheduler(
+        resource,
+        wcu_budget=int(args.num_partitions * args.partition_wcu * args.budget_ratio),
+        num_buckets=args.num_partitions,
+        clock=clock.time,
+        sleep=clock.sleep,
+    )
+    stats = scheduler.write(TABLE_NAME, items)
+    return {
+        "failed": None,
+        "written": len(resource.Table(TABLE_NAME).items),
+        "requests": resource.batch_requests,
+        "throttled_items": resource.throttled_items,
+        "duplicates_removed": stats["duplicates"],
+        "rate_limited_seconds": stats["rate_limited_seconds"],
+        "seconds": round(clock.time(), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=50000)
+    parser.add_argument("--duplicate_ratio", type=float, default=0.01)
+    parser.add_argument("--num_partitions", type=int, default=4)
+    parser.add_argument("--partition_wcu", type=int, default=1000)
+    parser.add_argument("--budget_ratio", type=float, default=0.9)
+    parser.add_argument("--request_latency", type=float, default=0.002)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    items = make_items(args.num_users, args.duplicate_ratio)
+    unique_items = list({(item["PK"], item["SK"]): item for item in items}.values())
+    results = {
+        "items": len(items),
+        "unique_items": len(unique_items),
+        "batch_writer": run_batch_writer(items, args),
+        "batch_writer_deduped": run_batch_writer(unique_items, args),
+        "scheduler": run_scheduler(items, args),
+    }
+    for name in ["batch_writer", "batch_writer_deduped", "scheduler"]:
+        logging.info(f"{name:<21} {results[name]}")
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,125 @@
+"""
+CPU 데이터 병렬(gloo) 학습 확장성 벤치마크.
+
+합성 학습 데이터를 parquet 로 쓰고 프로세스 수별로 샤드를 나눠 읽어
+고정 step 동안 학습한 뒤 전체 처리량(samples/sec)을 비교합니다.
+
+    cd src
+    python -m benchmark.ddp_scaling --nproc 1 2 4
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+import torch
+
+from common.distributed import (
+    all_reduce_scalar, launch, make_ddp_model, make_optimizers, read_parquet_shard
+)
+from benchmark.toy_model import ToyNCF
+
+
+def write_dataset(path, num_users, num_items, num_samples, row_group_size, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "user_id": rng.integers(0, num_users, num_samples),
+        "contents_code": rng.integers(0, num_items, num_samples),
+        "label": (rng.random(num_samples) > 0.5).astype("float32"),
+    }).to_parquet(path, row_group_size=row_group_size)
+
+
+def train_worker(rank, world_size, args):
+    df = read_parquet_shard(args.dataset_path, rank, world_size)
+    users = torch.tensor(df["user_id"].to_numpy())
+    items = torch.tensor(df["contents_code"].to_numpy())
+    labels = torch.tensor(df["label"].to_numpy())
+
+    torch.manual_seed(args.seed)
+    model = make_ddp_model(
+        ToyNCF(args.num_users, args.num_items, dim=args.dim, sparse=args.sparse),
+        bucket_cap_mb=args.bucket_cap_mb,
+    )
+    optimizers = make_optimizers(model, lr=1e-3)
+    loss_fn = torch.nn.BCEWithLogitsLoss()
+
+    def step(i):
+        start = (i * args.batch_size) % max(1, len(labels) - args.batch_size)
+        batch = slice(start, start + args.batch_size)
+        for optimizer in optimizers:
+            optimizer.zero_grad()
+        loss = loss_fn(model(users[batch], items[batch]), labels[batch])
+        loss.backward()
+        for optimizer in optimizers:
+            optimizer.step()
+        return len(labels[batch])
+
+    for i in range(args.warmup_steps):
+        step(i)
+
+    started_at = time.perf_counter()
+    samples = sum(step(i) for i in range(args.steps))
+    elapsed = time.perf_counter() - started_at
+
+    total_samples = all_reduce_scalar(samples)
+    max_elapsed = all_reduce_scalar(elapsed, op=torch.distributed.ReduceOp.MAX)
+    if rank == 0:
+        with open(args.result_path, "w") as f:
+            json.dump({
+                "world_size": world_size,
+                "samples": int(total_samples),
+                "seconds": round(max_elapsed, 3),
+                "samples_per_second": round(total_samples / max_elapsed, 1),
+            }, f)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nproc", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--num_users", type=int, default=100000)
+    parser.add_argument("--num_items", type=int, default=20000)
+    parser.add_argument("--num_samples", type=int, default=400000)
+    parser.add_argument("--row_group_size", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--batch_size", type=int, default=1024)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--warmup_steps", type=int, default=5)
+    parser.add_argument("--bucket_cap_mb", type=int, default=25)
+    parser.add_argument("--dense", dest="sparse", action="store_false")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        args.dataset_path = os.path.join(tmp_dir, "prepared_watch_log.parquet")
+        write_dataset(
+            args.dataset_path, args.num_users, args.num_items,
+            args.num_samples, args.row_group_size, seed=args.seed
+        )
+        for nproc in args.nproc:
+            args.result_path = os.path.join(tmp_dir, f"result-{nproc}.json")
+            launch(train_worker, nproc, args)
+            with open(args.result_path, "r") as f:
+                result = json.load(f)
+            logging.info(result)
+            results.append(result)
+
+    base = results[0]["samples_per_second"]
+    for result in results:
+        result["speedup"] = round(result["samples_per_second"] / base, 2)
+
+    summary = {"cpu_count": os.cpu_count(), "sparse": args.sparse, "results": results}
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,176 @@
+"""
+새 유저 fold-in 지연 시간 벤치마크.
+
+합성 임베딩과 새 유저 시청 이력으로 배치 최소 제곱 / 유저별 반복 최소 제곱 / SGD fold-in 의
+1만 명당 소요 시간과 top-K 중 새 유저 취향 콘텐츠 비율을 비교하고,
+WatchLogNCFNewUserFoldIn 작업 전체(로드 → fold-in → 추론 결과 추가)를 실행합니다.
+
+    cd src
+    python -m benchmark.fold_in --new_users 10000 50000
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from common.embeddings import fold_in_least_squares, fold_in_sgd, topk_items
+from refresh.fold_in import WatchLogNCFNewUserFoldIn
+from refresh.refresh import aggregate_events
+from benchmark.data_path import make_postprocess_args
+from benchmark.incremental_refresh import make_store
+from benchmark.synthetic import WatchLogShape, make_inference_result
+
+
+def make_new_user_log(store, num_users, seed=0):
+    """ 학습에 없던 유저의 시청 이력. 유저마다 무작위 취향 방향의 상위 콘텐츠를 시청합니다. """
+    rng = np.random.default_rng(seed)
+    counts = rng.choice(WatchLogShape().items_per_user, size=num_users)
+    tastes = rng.normal(size=(num_users, store.dim)) @ store.item_vectors.T
+    taste_rows = np.argsort(-tastes, axis=1)[:, :50]
+    watched = np.concatenate([
+        rng.choice(rows, size=min(count, len(rows)), replace=False)
+        for rows, count in zip(taste_rows, counts)
+    ])
+    user_ids = len(store.user_ids) + np.repeat(np.arange(num_users), np.minimum(counts, 50))
+    return pd.DataFrame({
+        "user_id": user_ids,
+        "contents_code": store.item_codes[watched],
+        "watch_seconds": rng.integers(60, 3600, size=len(watched)),
+    }), taste_rows
+
+
+def taste_ratio(user_vectors, item_vectors, taste_rows, k):
+    topk, _ = topk_items(user_vectors, item_vectors, k)
+    return float(np.mean([np.isin(row, taste).mean() for row, taste in zip(topk, taste_rows)]))
+
+
+def least_squares_loop(item_vectors, pair_users, pair_items, num_users, weights, reg, alpha):
+    """ 비교용: 같은 식을 유저마다 따로 풉니다. """
+    dim = item_vectors.shape[1]
+    shared = item_vectors.T @ item_vectors + reg * np.eye(dim, dtype=np.float32)
+    user_vectors = np.zeros((num_users, dim), dtype=np.float32)
+    order = np.argsort(pair_users, kind="stable")
+    bounds = np.searchsorted(pair_users[order], np.arange(num_users + 1))
+    for user in range(num_users):
+        rows = order[bounds[user]:bounds[user + 1]]
+        history = item_vectors[pair_items[rows]]
+        confidence = alpha * weights[rows]
+        a = shared + (history * confidence[:, None]).T @ history
+        b = ((1 + confidence)[:, None] * history).sum(axis=0)
+        user_vectors[user] = np.linalg.solve(a, b)
+    return user_vectors
+
+
+def run_methods(store, log, taste_rows, args):
+    pairs = aggregate_events(log)
+    codes, user_ids = pd.factorize(pairs["user_id"])
+    items = store.item_rows(pairs["contents_code"])
+    weights = pairs["weight"].to_numpy(dtype=np.float32)
+    num_users = len(user_ids)
+
+    methods = {
+        "least_squares": lambda: fold_in_least_squares(
+            store.item_vectors, codes, items, num_users, weights, reg=args.reg, alpha=args.alpha
+        ),
+        "least_squares_loop": lambda: least_squares_loop(
+            store.item_vectors, codes, items, num_users, weights, args.reg, args.alpha
+        ),
+        "sgd": lambda: fold_in_sgd(
+            np.zeros((num_users, store.dim), dtype=np.float32), store.item_vectors,
+            codes, items, weights=weights, steps=args.sgd_steps, learning_rate=0.5,
+        )[0],
+    }
+    results = {}
+    reference = None
+    for name, method in methods.items():
+        started_at = time.perf_counter()
+        vectors = method()
+        seconds = time.perf_counter() - started_at
+        if name == "least_squares":
+            reference = vectors
+        results[name] = {
+            "seconds": round(seconds, 4),
+            "seconds_per_10k_users": round(seconds / num_users * 10_000, 4),
+            "taste_ratio": round(taste_ratio(
+                vectors, store.item_vectors, taste_rows, args.top_k
+            ), 4),
+        }
+        if name == "least_squares_loop":
+            results[name]["max_abs_diff"] = float(np.abs(vectors - reference).max())
+    return results
+
+
+def run_task(store, log, num_trained_users, args):
+    """ WatchLogNCFNewUserFoldIn 작업 전체 """
+    with tempfile.TemporaryDirectory() as output_dir:
+        task_args = make_postprocess_args(output_dir)
+        task_args.dataset_dir = os.path.join(output_dir, "input")
+        task_args.dataset_name = "watch_log"
+        task_args.model_dir = os.path.join(output_dir, "model")
+        task_args.refresh_embedding_path = None
+        task_args.fold_in_reg = args.reg
+        task_args.fold_in_alpha = args.alpha
+        task_args.fold_in_top_k = args.top_k
+        task_args.fold_in_min_interactions = 1
+        for target_dir in [task_args.dataset_dir, task_args.model_dir]:
+            os.makedirs(target_dir, exist_ok=True)
+        os.makedirs(os.path.join(output_dir, "inference"), exist_ok=True)
+
+        store.save(os.path.join(task_args.model_dir, "embeddings.npz"))
+        log.to_csv(os.path.join(task_args.dataset_dir, "watch_log.csv"), index=False)
+        make_inference_result(num_trained_users).to_parquet(
+            os.path.join(output_dir, "inference", "inference_result.snappy.parquet"),
+            compression="snappy",
+        )
+
+        task = WatchLogNCFNewUserFoldIn(task_args)
+        started_at = time.perf_counter()
+        added = task.run()
+        seconds = time.perf_counter() - started_at
+        rows = len(pd.read_parquet(task.inference_result_path, columns=["user_id"]))
+    return {"seconds": round(seconds, 3), "added_users": added, "inference_rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--new_users", type=int, nargs="+", default=[10000])
+    parser.add_argument("--reg", type=float, default=0.1)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--sgd_steps", type=int, default=5)
+    parser.add_argument("--top_k", type=int, default=16)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    store = make_store(args.num_users, args.dim)
+    results = []
+    for num_new_users in args.new_users:
+        log, taste_rows = make_new_user_log(store, num_new_users)
+        result = {
+            "new_users": num_new_users,
+            "interactions": len(log),
+            "methods": run_methods(store, log, taste_rows, args),
+            "task": run_task(store, log, 1000, args),
+        }
+        for name, method in result["methods"].items():
+            logging.info(
+                f"{num_new_users} users {name:<19} {method['seconds_per_10k_users']}s / 10k users, "
+                f"taste ratio {method['taste_ratio']:.2%}"
+            )
+        results.append(result)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
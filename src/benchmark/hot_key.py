@@ -0,0 +1,97 @@
+"""
+C#popular hot key 읽기 분포 시뮬레이션.
+
+후처리 쓰기 경로로 스텁 테이블을 채운 뒤 콜드 스타트/폴백 비율만큼 인기 콘텐츠를,
+나머지는 유저 아이템을 읽어 샤드 수별 파티션 키당 읽기 분포를 비교합니다.
+
+    cd src
+    python -m benchmark.hot_key --shards 1 4 10 --reads 200000 --total_rps 20000
+"""
+import json
+import random
+import logging
+import argparse
+import tempfile
+
+from common.ddb import DynamoDB
+from postprocess.postprocess import POPULAR_PK, WatchLogNCFPostProcess
+from benchmark.data_path import make_postprocess_args
+from benchmark.stubs import StubDynamoDBResource
+from benchmark.synthetic import make_inference_result
+
+
+# 파티션당 최대 3,000 RCU (4KB 이하 강한 일관성 읽기 3,000회/초)
+PARTITION_READ_LIMIT = 3000
+
+
+def simulate(num_users, shard_count, reads, cold_start_ratio, total_rps, seed=0):
+    random.seed(seed)
+    with tempfile.TemporaryDirectory() as output_dir:
+        args = make_postprocess_args(output_dir)
+        args.serve_popular_shard_count = shard_count
+        postprocess = WatchLogNCFPostProcess(args)
+
+        resource = StubDynamoDBResource()
+        ddb = DynamoDB(aws_region=None, resource=resource)
+        recommend_data = postprocess.make_recommend_data(
+            make_inference_result(num_users, seed=seed)
+        )
+        postprocess.write_recommend_data(ddb, recommend_data)
+
+    table = resource.Table(args.serve_ddb_table_name)
+    sk = recommend_data[0]["SK"]
+    for _ in range(reads):
+        if random.random() < cold_start_ratio:
+            item = ddb.get_sharded_item(table.name, POPULAR_PK, sk, shard_count)
+            assert item, "인기 콘텐츠 아이템이 없습니다"
+        else:
+            table.get_item(Key={"PK": f"U#{random.randrange(1, num_users)}", "SK": sk})
+
+    popular_reads = {
+        pk: count for pk, count in table.reads.items() if pk.startswith(POPULAR_PK)
+    }
+    max_pk, max_reads = max(table.reads.items(), key=lambda kv: kv[1])
+    max_key_rps = total_rps * max_reads / reads
+    return {
+        "shard_count": shard_count,
+        "transactions": resource.transactions,
+        "popular_keys": len(popular_reads),
+        "popular_reads": sum(popular_reads.values()),
+        "popular_reads_per_key": dict(sorted(popular_reads.items())),
+        "hottest_key": max_pk,
+        "hottest_key_share": round(max_reads / reads, 4),
+        "hottest_key_rps": round(max_key_rps, 1),
+        "exceeds_partition_limit": max_key_rps > PARTITION_READ_LIMIT,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=10000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 10])
+    parser.add_argument("--reads", type=int, default=200000)
+    parser.add_argument("--cold_start_ratio", type=float, default=0.3)
+    parser.add_argument("--total_rps", type=float, default=20000)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = [
+        simulate(
+            args.num_users, shard_count, args.reads, args.cold_start_ratio, args.total_rps
+        )
+        for shard_count in args.shards
+    ]
+    for result in results:
+        logging.info(
+            f"shards {result['shard_count']:>3} : hottest {result['hottest_key']} "
+            f"{result['hottest_key_share']:.2%} ({result['hottest_key_rps']} rps)"
+        )
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,178 @@
+"""
+마이크로 배치 추천 갱신 벤치마크.
+
+합성 임베딩으로 일 배치(전체 유저 top-K + 전체 적재)와 마이크로 배치 갱신
+(이벤트가 있는 유저만 fold-in + top-K + 적재)의 소요 시간, 쓰기 요청 수를 비교합니다.
+이벤트는 유저마다 새 취향 방향의 콘텐츠를 시청한 것으로 만들고,
+갱신 전/후 top-K 중 새 취향 콘텐츠 비율로 이벤트가 반영되는지 확인합니다.
+
+    cd src
+    python -m benchmark.incremental_refresh --num_users 100000 --touched_users 1000
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from common.ddb import DynamoDB
+from common.embeddings import EmbeddingStore, topk_items
+from postprocess.postprocess import WatchLogNCFPostProcess
+from refresh.refresh import WatchLogNCFIncrementalRefresh
+from benchmark.data_path import make_postprocess_args
+from benchmark.stubs import StubDynamoDBResource
+from benchmark.synthetic import WatchLogShape
+
+
+def make_store(num_users, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    item_codes = WatchLogShape().contents_codes
+    return EmbeddingStore(
+        user_ids=np.arange(num_users),
+        user_vectors=rng.normal(scale=1 / np.sqrt(dim), size=(num_users, dim)),
+        item_codes=item_codes,
+        item_vectors=rng.normal(scale=1 / np.sqrt(dim), size=(len(item_codes), dim)),
+    )
+
+
+def make_events(store, touched_users, events_per_user, taste_size, seed=0):
+    """ :return: (이벤트 DataFrame, 유저별 새 취향 콘텐츠 행 번호 집합) """
+    rng = np.random.default_rng(seed)
+    users = rng.choice(len(store.user_ids), size=touched_users, replace=False)
+    tastes = rng.normal(size=(touched_users, store.dim))
+    taste_rows, _ = topk_items(tastes, store.item_vectors, taste_size)
+
+    watched = np.stack([
+        rng.choice(rows, size=events_per_user, replace=False) for rows in taste_rows
+    ])
+    events = pd.DataFrame({
+        "user_id": np.repeat(store.user_ids[users], events_per_user),
+        "contents_code": store.item_codes[watched.ravel()],
+        "watch_seconds": rng.integers(60, 3600, size=watched.size),
+    })
+    return events, users, taste_rows
+
+
+def taste_ratio(store, user_rows, taste_rows, k):
+    topk, _ = topk_items(store.user_vectors[user_rows], store.item_vectors, k)
+    return float(np.mean([
+        np.isin(row, taste).mean() for row, taste in zip(topk, taste_rows)
+    ]))
+
+
+def run_nightly(store, args, output_dir):
+    """ 일 배치와 같은 경로: 전체 유저 top-K -> 후처리 스키마 변환 -> 전체 적재 """
+    resource = StubDynamoDBResource()
+    postprocess_args = make_postprocess_args(output_dir)
+    started_at = time.perf_counter()
+    indices, scores = topk_items(store.user_vectors, store.item_vectors, args.top_k)
+    codes = store.item_codes[indices]
+    df = pd.DataFrame({
+        "user_id": store.user_ids,
+        "items": [
+            [{"code": int(code), "score": float(score)} for code, score in zip(c, s)]
+            for c, s in zip(codes, scores)
+        ],
+    })
+    postprocess = WatchLogNCFPostProcess(postprocess_args)
+    recommend_data = postprocess.make_recommend_data(df)
+    DynamoDB(aws_region=None, resource=resource).batch_write_df_to_ddb(
+        table_name=postprocess_args.serve_ddb_table_name,
+        df=pd.DataFrame.from_records(recommend_data),
+    )
+    table = resource.Table(postprocess_args.serve_ddb_table_name)
+    return {
+        "seconds": round(time.perf_counter() - started_at, 3),
+        "written_items": len(table.items),
+        "write_requests": table.requests,
+        "written_bytes": table.written_bytes,
+    }
+
+
+def run_refresh(store, events, args, output_dir):
+    refresh_args = make_postprocess_args(output_dir)
+    refresh_args.refresh_spool_dir = None
+    refresh_args.refresh_embedding_path = os.path.join(output_dir, "embeddings.npz")
+    refresh_args.refresh_max_files = 100
+    refresh_args.refresh_poll_seconds = 0
+    refresh_args.refresh_lease_seconds = 600
+    refresh_args.refresh_top_k = args.top_k
+    refresh_args.refresh_sgd_steps = args.sgd_steps
+    refresh_args.refresh_learning_rate = args.learning_rate
+    refresh_args.refresh_reg = 0.01
+    refresh_args.refresh_negatives = 4
+    refresh_args.fold_in_reg = 0.1
+    refresh_args.fold_in_alpha = 1.0
+    store.save(refresh_args.refresh_embedding_path)
+
+    refresh = WatchLogNCFIncrementalRefresh(refresh_args)
+    for rows in np.array_split(np.arange(len(events)), args.files):
+        refresh.spool.put(events.iloc[rows])
+
+    resource = StubDynamoDBResource()
+    started_at = time.perf_counter()
+    processed = refresh.run(ddb=DynamoDB(aws_region=None, resource=resource))
+    seconds = time.perf_counter() - started_at
+    table = resource.Table(refresh_args.serve_ddb_table_name)
+    return refresh.store, {
+        "seconds": round(seconds, 3),
+        "events": processed,
+        "written_items": len(table.items),
+        "write_requests": table.requests,
+        "written_bytes": table.written_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--touched_users", type=int, default=1000)
+    parser.add_argument("--events_per_user", type=int, default=5)
+    parser.add_argument("--taste_size", type=int, default=50)
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--top_k", type=int, default=16)
+    parser.add_argument("--sgd_steps", type=int, default=5)
+    parser.add_argument("--learning_rate", type=float, default=0.5)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    store = make_store(args.num_users, args.dim)
+    events, users, taste_rows = make_events(
+        store, args.touched_users, args.events_per_user, args.taste_size
+    )
+    before = taste_ratio(store, users, taste_rows, args.top_k)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        nightly = run_nightly(store, args, output_dir)
+        refreshed_store, refresh = run_refresh(store, events, args, output_dir)
+    after = taste_ratio(refreshed_store, users, taste_rows, args.top_k)
+
+    results = {
+        "num_users": args.num_users,
+        "touched_users": args.touched_users,
+        "nightly": nightly,
+        "refresh": refresh,
+        "seconds_ratio": round(refresh["seconds"] / nightly["seconds"], 4),
+        "write_requests_ratio": round(refresh["write_requests"] / nightly["write_requests"], 4),
+        "taste_ratio_before": round(before, 4),
+        "taste_ratio_after": round(after, 4),
+    }
+    logging.info(
+        f"nightly {nightly['seconds']}s / {nightly['write_requests']} requests, "
+        f"refresh {refresh['seconds']}s / {refresh['write_requests']} requests, "
+        f"new-taste share of top-{args.top_k} {before:.2%} -> {after:.2%}"
+    )
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,113 @@
+"""
+추론 아티팩트(eager / TorchScript / TorchScript int8) 비교 벤치마크.
+
+형식별 모델 로드 시간, 전체 콘텐츠 점수 계산 처리량(users/sec),
+fp32 eager 모델 대비 top-K 겹침 비율을 측정합니다.
+
+    cd src
+    python -m benchmark.inference_export --num_users 20000 --num_items 5000
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+import torch
+
+from common.model_export import (
+    INFERENCE_MODEL_FILE, export_inference_model, load_inference_model,
+    score_topk, topk_overlap
+)
+from benchmark.toy_model import ToyNCF, make_interactions
+
+
+def train_briefly(model, num_users, num_items, steps, batch_size=1024):
+    users, items, labels = make_interactions(num_users, num_items, steps * batch_size)
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-2)
+    loss_fn = torch.nn.BCEWithLogitsLoss()
+    for i in range(steps):
+        batch = slice(i * batch_size, (i + 1) * batch_size)
+        optimizer.zero_grad()
+        loss_fn(model(users[batch], items[batch]), labels[batch]).backward()
+        optimizer.step()
+    return model.eval()
+
+
+def measure(load, users, num_items, top_k, reference):
+    started_at = time.perf_counter()
+    model = load()
+    load_seconds = time.perf_counter() - started_at
+
+    score_topk(model, users[:8], num_items, top_k)
+    started_at = time.perf_counter()
+    topk = score_topk(model, users, num_items, top_k)
+    score_seconds = time.perf_counter() - started_at
+    return {
+        "load_ms": round(load_seconds * 1000, 2),
+        "users_per_second": round(len(users) / score_seconds, 1),
+        f"top{top_k}_overlap": round(topk_overlap(reference, topk), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=20000)
+    parser.add_argument("--num_items", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--train_steps", type=int, default=50)
+    parser.add_argument("--num_bench_users", type=int, default=512)
+    parser.add_argument("--top_k", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    torch.set_num_threads(args.threads)
+    model = train_briefly(
+        ToyNCF(args.num_users, args.num_items, dim=args.dim),
+        args.num_users, args.num_items, args.train_steps
+    )
+    users = np.random.default_rng(1).choice(args.num_users, args.num_bench_users, replace=False)
+    reference = score_topk(model, users, args.num_items, args.top_k)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        eager_path = os.path.join(tmp_dir, "model.pth")
+        torch.save(model.state_dict(), eager_path)
+
+        def load_eager():
+            eager = ToyNCF(args.num_users, args.num_items, dim=args.dim)
+            eager.load_state_dict(torch.load(eager_path, map_location="cpu"))
+            return eager.eval()
+
+        results["eager"] = measure(load_eager, users, args.num_items, args.top_k, reference)
+        results["eager"]["size_mb"] = round(os.path.getsize(eager_path) / 2 ** 20, 2)
+
+        for export_format in ["torchscript", "torchscript_int8"]:
+            model_dir = os.path.join(tmp_dir, export_format)
+            os.makedirs(model_dir)
+            meta = export_inference_model(
+                model, model_dir, args.num_users, args.num_items,
+                export_format=export_format, top_k=args.top_k, min_topk_overlap=0.0
+            )
+            results[export_format] = measure(
+                lambda: load_inference_model(model_dir),
+                users, args.num_items, args.top_k, reference
+            )
+            results[export_format]["size_mb"] = round(
+                os.path.getsize(os.path.join(model_dir, INFERENCE_MODEL_FILE)) / 2 ** 20, 2
+            )
+            results[export_format]["exported_as"] = meta["format"]
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
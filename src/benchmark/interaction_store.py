@@ -0,0 +1,160 @@
+"""
+상호작용 저장소 로딩 벤치마크.
+
+합성 시청 로그를 전처리 결과 parquet 과 CSR 상호작용 저장소로 저장한 뒤,
+단계마다 parquet 을 다시 읽어 상호작용을 집계하는 방식과 저장소를 메모리 맵으로 여는 방식의
+로딩 시간과 RSS 를 별도 프로세스에서 측정합니다.
+
+    cd src
+    python -m benchmark.interaction_store --scale 1m
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from common.interaction_store import (
+    InteractionStore, build_interaction_store, interaction_store_dir, make_csr
+)
+from benchmark.synthetic import make_watch_log, parse_scale
+
+
+def read_status_mb(key):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{key}:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def current_rss_mb():
+    return read_status_mb("VmRSS")
+
+
+def peak_rss_mb():
+    # ru_maxrss 는 exec 이전 부모 프로세스의 최대값을 이어받으므로 VmHWM 을 사용합니다
+    return read_status_mb("VmHWM")
+
+
+def run_worker(kind, dataset_dir, num_lookups):
+    """ 별도 프로세스에서 한 가지 로딩 방식을 측정합니다. """
+    baseline_rss = current_rss_mb()
+    rng = np.random.default_rng(0)
+    started_at = time.perf_counter()
+    if kind == "parquet":
+        df = pd.read_parquet(os.path.join(dataset_dir, "watch_log.snappy.parquet"))
+        read_seconds = time.perf_counter() - started_at
+        arrays = make_csr(df)
+        del df
+        user_ids, indptr, indices = arrays["user_ids"], arrays["indptr"], arrays["indices"]
+        user_rows = lambda values: np.searchsorted(user_ids, values)
+    else:
+        store = InteractionStore(
+            interaction_store_dir(dataset_dir), mmap_mode="r" if kind == "mmap" else None
+        )
+        read_seconds = time.perf_counter() - started_at
+        user_ids, indptr, indices = store.user_ids, store.indptr, store.indices
+        user_rows = store.user_rows
+    load_seconds = time.perf_counter() - started_at
+    load_rss = current_rss_mb()
+
+    # 추론/평가처럼 일부 유저의 이력만 읽는 접근
+    lookup_started_at = time.perf_counter()
+    rows = user_rows(rng.choice(user_ids, size=num_lookups))
+    touched = sum(int(indices[indptr[row]:indptr[row + 1]].sum()) for row in rows)
+    lookup_seconds = time.perf_counter() - lookup_started_at
+    lookup_rss = current_rss_mb()
+
+    # 학습처럼 전체 이력을 한 번 훑는 접근
+    scan_started_at = time.perf_counter()
+    checksum = int(np.asarray(indices).sum())
+    scan_seconds = time.perf_counter() - scan_started_at
+
+    return {
+        "kind": kind,
+        "read_seconds": round(read_seconds, 4),
+        "load_seconds": round(load_seconds, 4),
+        "lookup_seconds": round(lookup_seconds, 4),
+        "scan_seconds": round(scan_seconds, 4),
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "load_rss_mb": round(load_rss - baseline_rss, 1),
+        "lookup_rss_mb": round(lookup_rss - baseline_rss, 1),
+        "scan_rss_mb": round(current_rss_mb() - baseline_rss, 1),
+        "peak_rss_mb": round(peak_rss_mb() - baseline_rss, 1),
+        "checksum": [touched, checksum],
+    }
+
+
+def measure(kind, dataset_dir, num_lookups):
+    output = subprocess.check_output([
+        sys.executable, "-m", "benchmark.interaction_store",
+        "--worker", kind, "--dataset_dir", dataset_dir, "--num_lookups", str(num_lookups),
+    ])
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=str, default="1m")
+    parser.add_argument("--num_lookups", type=int, default=1000)
+    parser.add_argument("--worker", type=str, default=None, choices=["parquet", "mmap", "load"])
+    parser.add_argument("--dataset_dir", type=str, default=None)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.dataset_dir, args.num_lookups)))
+        return
+
+    num_users = parse_scale(args.scale)
+    with tempfile.TemporaryDirectory() as dataset_dir:
+        df = make_watch_log(num_users)
+        df.to_parquet(os.path.join(dataset_dir, "watch_log.snappy.parquet"), compression="snappy")
+        started_at = time.perf_counter()
+        meta = build_interaction_store(
+            df, interaction_store_dir(dataset_dir), source="watch_log.snappy.parquet"
+        )
+        build_seconds = time.perf_counter() - started_at
+        del df
+
+        results = {
+            "scale": args.scale,
+            "rows": meta["nnz"],
+            "build_seconds": round(build_seconds, 3),
+            "parquet_mb": round(
+                os.path.getsize(os.path.join(dataset_dir, "watch_log.snappy.parquet")) / 2 ** 20, 2
+            ),
+            "store_mb": round(sum(
+                os.path.getsize(os.path.join(interaction_store_dir(dataset_dir), name))
+                for name in os.listdir(interaction_store_dir(dataset_dir))
+            ) / 2 ** 20, 2),
+            "runs": [
+                measure(kind, dataset_dir, args.num_lookups)
+                for kind in ["parquet", "load", "mmap"]
+            ],
+        }
+
+    checksums = {tuple(run["checksum"]) for run in results["runs"]}
+    assert len(checksums) == 1, f"방식별 결과가 다릅니다 : {checksums}"
+    for run in results["runs"]:
+        logging.info(
+            f"{run['kind']:<8} load {run['load_seconds']}s, lookup {run['lookup_seconds']}s, "
+            f"scan {run['scan_seconds']}s, rss after load {run['load_rss_mb']}MB, "
+            f"peak {run['peak_rss_mb']}MB"
+        )
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,162 @@
+"""
+스팟 중단 재개 시뮬레이션.
+
+같은 학습을 (1) 중단 없이, (2) 중단 후 처음부터, (3) 중단 후 체크포인트에서 재개하는
+세 경우로 수행하고 총 소요 시간과 최종 파라미터 일치 여부를 비교합니다.
+
+    cd src
+    python -m benchmark.spot_resume --epochs 4 --interrupt_at 0.6
+"""
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from common.checkpoint import AsyncCheckpointer, ResumableRandomSampler
+from benchmark.toy_model import ToyNCF, make_interactions
+
+
+class SpotInterruption(Exception):
+    pass
+
+
+def train(args, dataset, checkpoint_dir=None, interrupt_step=None):
+    """
+    :param checkpoint_dir: 없으면 체크포인트 없이 학습합니다
+    :param interrupt_step: 전체 step 이 이 값에 도달하면 SpotInterruption 을 발생시킵니다
+    :return: (모델, 수행한 step 수, 체크포인트 저장에 학습 스레드가 쓴 시간)
+    """
+    torch.manual_seed(args.seed)
+    model = ToyNCF(args.num_users, args.num_items, dim=args.dim)
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
+    loss_fn = torch.nn.BCEWithLogitsLoss()
+    sampler = ResumableRandomSampler(len(dataset), seed=args.seed)
+
+    checkpointer = AsyncCheckpointer(checkpoint_dir) if checkpoint_dir else None
+    start_epoch, start_offset, global_step = 0, 0, 0
+    state = checkpointer.load_latest(model, optimizer) if checkpointer else None
+    if state:
+        start_epoch = state["sampler"]["epoch"]
+        start_offset = state["sampler"]["offset"]
+        global_step = state["step"]
+
+    steps = 0
+    save_seconds = 0.0
+    for epoch in range(start_epoch, args.epochs):
+        sampler.set_epoch(epoch, offset=start_offset if epoch == start_epoch else 0)
+        loader = DataLoader(dataset, batch_size=args.batch_size, sampler=sampler)
+        consumed = 0
+        for users, items, labels in loader:
+            optimizer.zero_grad()
+            loss = loss_fn(model(users, items), labels)
+            loss.backward()
+            optimizer.step()
+            consumed += len(labels)
+            global_step += 1
+            steps += 1
+
+            if checkpointer and global_step % args.checkpoint_interval_steps == 0:
+                started_at = time.perf_counter()
+                sampler_state = sampler.state_dict(consumed)
+                if sampler_state["offset"] >= len(dataset):
+                    sampler_state = {"epoch": epoch + 1, "offset": 0}
+                checkpointer.save(
+                    model, optimizer, epoch=epoch, step=global_step, sampler=sampler_state
+                )
+                save_seconds += time.perf_counter() - started_at
+
+            if interrupt_step and global_step >= interrupt_step:
+                # 같은 프로세스에서 재시작하므로 진행 중인 저장이 다음 실행과 겹치지 않게 합니다
+                if checkpointer:
+                    checkpointer.close()
+                raise SpotInterruption(f"interrupted at step {global_step}")
+
+    if checkpointer:
+        checkpointer.close()
+    return model, steps, save_seconds
+
+
+def timed(func, *args, **kwargs):
+    started_at = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except SpotInterruption as e:
+        logging.info(e)
+        result = None
+    return result, time.perf_counter() - started_at
+
+
+def same_parameters(left, right):
+    return all(
+        torch.equal(left.state_dict()[key], right.state_dict()[key])
+        for key in left.state_dict()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=5000)
+    parser.add_argument("--num_items", type=int, default=2000)
+    parser.add_argument("--num_samples", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--batch_size", type=int, default=256)
+    parser.add_argument("--epochs", type=int, default=4)
+    parser.add_argument("--checkpoint_interval_steps", type=int, default=100)
+    parser.add_argument("--interrupt_at", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    dataset = TensorDataset(*make_interactions(
+        args.num_users, args.num_items, args.num_samples, seed=args.seed
+    ))
+    steps_per_epoch = -(-len(dataset) // args.batch_size)
+    interrupt_step = int(steps_per_epoch * args.epochs * args.interrupt_at)
+
+    (baseline, total_steps, _), baseline_seconds = timed(train, args, dataset)
+
+    _, interrupted_seconds = timed(train, args, dataset, interrupt_step=interrupt_step)
+    (_, restart_steps, _), restart_seconds = timed(train, args, dataset)
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        _, resume_interrupted_seconds = timed(
+            train, args, dataset, checkpoint_dir=checkpoint_dir, interrupt_step=interrupt_step
+        )
+        (resumed, resumed_steps, save_seconds), resumed_seconds = timed(
+            train, args, dataset, checkpoint_dir=checkpoint_dir
+        )
+
+    result = {
+        "total_steps": total_steps,
+        "interrupt_step": interrupt_step,
+        "baseline_seconds": round(baseline_seconds, 3),
+        "restart_from_scratch": {
+            "steps_after_interruption": restart_steps,
+            "total_seconds": round(interrupted_seconds + restart_seconds, 3),
+        },
+        "resume_from_checkpoint": {
+            "steps_after_interruption": resumed_steps,
+            "total_seconds": round(resume_interrupted_seconds + resumed_seconds, 3),
+            "checkpoint_blocking_seconds": round(save_seconds, 3),
+            "same_parameters_as_baseline": same_parameters(baseline, resumed),
+        },
+    }
+    result["saved_seconds"] = round(
+        result["restart_from_scratch"]["total_seconds"]
+        - result["resume_from_checkpoint"]["total_seconds"], 3
+    )
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,154 @@
+import json
+from types import SimpleNamespace
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+from common.write_scheduler import TokenBucket, estimate_wcu, partition_bucket
+
+
+class StubBatchWriter:
+    """ boto3 Table.batch_writer 대역. 25개 단위로 flush 하며 요청 수를 기록합니다. """
+    def __init__(self, table, flush_amount=25):
+        self.table = table
+        self.flush_amount = flush_amount
+        self.buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.flush()
+
+    def put_item(self, Item):
+        self.buffer.append(Item)
+        if len(self.buffer) >= self.flush_amount:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        self.table.requests += 1
+        for item in self.buffer:
+            self.table.items[(item["PK"], item.get("SK"))] = item
+            self.table.written_bytes += len(json.dumps(item, default=str))
+        self.buffer = []
+
+
+class StubTable:
+    def __init__(self, name):
+        self.name = name
+        self.items = {}
+        self.requests = 0
+        self.written_bytes = 0
+        self.reads = {}
+
+    def batch_writer(self):
+        return StubBatchWriter(self)
+
+    def scan(self, ProjectionExpression=None, ExpressionAttributeNames=None, **_):
+        return {"Items": list(self.items.values())}
+
+    def update_item(self, Key, ExpressionAttributeValues, **_):
+        # TTL 갱신(SET #ttl = :ttl)만 흉내냅니다
+        self.requests += 1
+        self.items[(Key["PK"], Key.get("SK"))]["TTL"] = ExpressionAttributeValues[":ttl"]
+
+    def get_item(self, Key):
+        key = (Key["PK"], Key.get("SK"))
+        self.reads[key[0]] = self.reads.get(key[0], 0) + 1
+        item = self.items.get(key)
+        return {"Item": item} if item else {}
+
+
+class StubDynamoDBResource:
+    """ 네트워크 호출 없이 메모리에 기록하는 boto3 DynamoDB resource 대역 """
+    def __init__(self):
+        self.tables = {}
+        self.transactions = 0
+        self.meta = SimpleNamespace(
+            client=SimpleNamespace(transact_write_items=self.transact_write_items)
+        )
+
+    def Table(self, name):
+        return self.tables.setdefault(name, StubTable(name))
+
+    def transact_write_items(self, TransactItems):
+        deserializer = TypeDeserializer()
+        self.transactions += 1
+        for transact_item in TransactItems:
+            put = transact_item["Put"]
+            item = {
+                key: deserializer.deserialize(value) for key, value in put["Item"].items()
+            }
+            self.Table(put["TableName"]).items[(item["PK"], item.get("SK"))] = item
+
+
+class SimulatedClock:
+    """ sleep 하면 시간만 앞으로 이동하는 시계. 스로틀링 시뮬레이션을 실제 대기 없이 수행합니다. """
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+
+class ThrottlingDynamoDBResource(StubDynamoDBResource):
+    """
+    파티션별 쓰기 용량(partition_wcu)을 흉내내는 DynamoDB 대역.
+
+    - 파티션 키 해시로 num_partitions 개 파티션 중 하나에 배치합니다.
+    - 파티션 용량을 넘는 아이템은 UnprocessedItems 로 돌려줍니다.
+    - 한 요청에 같은 키가 있으면 ValidationException 을 발생시킵니다.
+    - 요청마다 request_latency 만큼 시계가 흐릅니다.
+    """
+    def __init__(self, clock, num_partitions=4, partition_wcu=1000, request_latency=0.01):
+        super().__init__()
+        self.clock = clock
+        self.num_partitions = num_partitions
+        self.request_latency = request_latency
+        self.partitions = [
+            TokenBucket(partition_wcu, clock=clock.time, sleep=clock.sleep)
+            for _ in range(num_partitions)
+        ]
+        self.throttled_items = 0
+        self.batch_requests = 0
+        self.validation_errors = 0
+
+    def batch_write_item(self, RequestItems):
+        self.clock.sleep(self.request_latency)
+        self.batch_requests += 1
+        unprocessed = {}
+        for table_name, requests in RequestItems.items():
+            keys = [
+                (r["PutRequest"]["Item"]["PK"], r["PutRequest"]["Item"].get("SK"))
+                for r in requests
+            ]
+            if len(set(keys)) != len(keys):
+                self.validation_errors += 1
+                raise ClientError(
+                    {"Error": {
+                        "Code": "ValidationException",
+                        "Message": "Provided list of item keys contains duplicates",
+                    }},
+                    "BatchWriteItem",
+                )
+
+            table = self.Table(table_name)
+            for request in requests:
+                item = request["PutRequest"]["Item"]
+                partition = self.partitions[
+                    partition_bucket(item["PK"], self.num_partitions)
+                ]
+                partition.refill()
+                wcu = estimate_wcu(item)
+                if partition.tokens < wcu:
+                    self.throttled_items += 1
+                    unprocessed.setdefault(table_name, []).append(request)
+                    continue
+                partition.tokens -= wcu
+                table.items[(item["PK"], item.get("SK"))] = item
+        return {"UnprocessedItems": unprocessed}
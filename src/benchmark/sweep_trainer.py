@@ -0,0 +1,114 @@
+"""
+하이퍼파라미터 탐색 벤치마크용 학습 프로세스.
+
+잠재 요인으로 만든 합성 상호작용에 ToyNCF 를 학습하며 에폭마다 valid_loss / valid_ndcg 를
+common.sweep.TrialReporter 로 보고합니다. sweep_controller 의 로컬 실행 명령으로 사용합니다.
+
+    python sweep_controller.py run --namespace dev --service_name like-movie \
+        --base_date 2024-03-06 --command "python -m benchmark.sweep_trainer"
+"""
+import time
+import logging
+import argparse
+
+import numpy as np
+import torch
+from torch import nn
+
+from common.sweep import TrialReporter
+from benchmark.toy_model import ToyNCF
+
+
+def make_dataset(num_users, num_items, positives_per_user=20, latent_dim=8, seed=0):
+    """ 유저마다 잠재 요인 점수 상위 콘텐츠를 긍정으로 두고 하나를 검증용으로 남깁니다. """
+    rng = np.random.default_rng(seed)
+    scores = rng.normal(size=(num_users, latent_dim)) @ rng.normal(size=(latent_dim, num_items))
+    scores += rng.normal(scale=1.0, size=scores.shape)
+    positives = np.argsort(-scores, axis=1)[:, :positives_per_user]
+    positives = rng.permuted(positives, axis=1)
+    train_items = positives[:, 1:]
+    train_mask = np.zeros((num_users, num_items), dtype=bool)
+    np.put_along_axis(train_mask, train_items, True, axis=1)
+    return {
+        "train_users": np.repeat(np.arange(num_users), positives_per_user - 1),
+        "train_items": train_items.reshape(-1),
+        "valid_items": positives[:, 0],
+        "train_mask": train_mask,
+    }
+
+
+def evaluate(model, dataset, num_items, k, generator):
+    num_users = len(dataset["valid_items"])
+    users = torch.arange(num_users)
+    with torch.no_grad():
+        scores = torch.stack([
+            model(torch.full((num_items,), user, dtype=torch.long), torch.arange(num_items))
+            for user in users.tolist()
+        ])
+        positives = torch.as_tensor(dataset["valid_items"])
+        negatives = torch.randint(0, num_items, (num_users,), generator=generator)
+        loss = nn.functional.binary_cross_entropy_with_logits(
+            torch.cat([scores[users, positives], scores[users, negatives]]),
+            torch.cat([torch.ones(num_users), torch.zeros(num_users)]),
+        ).item()
+
+        scores[torch.as_tensor(dataset["train_mask"])] = -float("inf")
+        rank = (scores > scores[users, positives][:, None]).sum(dim=1)
+        ndcg = torch.where(rank < k, 1 / torch.log2(rank.float() + 2), torch.zeros(num_users))
+    return loss, ndcg.mean().item()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--epoch", type=int, default=10)
+    parser.add_argument("--learning_rate", type=float, default=0.01)
+    parser.add_argument("--dim", type=int, default=16)
+    parser.add_argument("--weight_decay", type=float, default=0.0)
+    parser.add_argument("--batch_size", type=int, default=512)
+    parser.add_argument("--num_users", type=int, default=500)
+    parser.add_argument("--num_items", type=int, default=300)
+    parser.add_argument("--eval_top_k", type=int, default=10)
+    parser.add_argument("--sweep_metrics_path", type=str, default=None)
+    # 설정 파일의 나머지 train 파라미터(--model_name 등)는 무시합니다
+    args, _ = parser.parse_known_args()
+
+    torch.set_num_threads(1)
+    torch.manual_seed(0)
+    generator = torch.Generator()
+    generator.manual_seed(0)
+    dataset = make_dataset(args.num_users, args.num_items)
+    users = torch.as_tensor(dataset["train_users"])
+    items = torch.as_tensor(dataset["train_items"])
+
+    model = ToyNCF(args.num_users, args.num_items, dim=args.dim)
+    optimizer = torch.optim.Adam(
+        model.parameters(), lr=args.learning_rate, weight_decay=args.weight_decay
+    )
+    reporter = TrialReporter(args.sweep_metrics_path)
+    for epoch in range(1, args.epoch + 1):
+        started_at = time.perf_counter()
+        # 긍정 1 : 무작위 부정 1
+        negatives = torch.randint(0, args.num_items, (len(items),), generator=generator)
+        batch_users = torch.cat([users, users])
+        batch_items = torch.cat([items, negatives])
+        labels = torch.cat([torch.ones(len(items)), torch.zeros(len(items))])
+        order = torch.randperm(len(labels), generator=generator)
+        for start in range(0, len(order), args.batch_size):
+            rows = order[start:start + args.batch_size]
+            optimizer.zero_grad()
+            loss = nn.functional.binary_cross_entropy_with_logits(
+                model(batch_users[rows], batch_items[rows]), labels[rows]
+            )
+            loss.backward()
+            optimizer.step()
+
+        valid_loss, valid_ndcg = evaluate(
+            model, dataset, args.num_items, args.eval_top_k, generator
+        )
+        reporter.report(epoch, valid_loss=valid_loss, valid_ndcg=valid_ndcg)
+        logging.debug(f"epoch {epoch} : {time.perf_counter() - started_at:.2f}s")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
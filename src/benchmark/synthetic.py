@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+SCALES = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+default_watch_log_path = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "..", "local", "input", "data", "watch_log.csv"
+)
+
+
+def parse_scale(scale):
+    if str(scale).lower() in SCALES:
+        return SCALES[str(scale).lower()]
+    return int(scale)
+
+
+class WatchLogShape:
+    """
+    watch_log.csv 의 분포(유저별 시청 수, 콘텐츠 인기도, 시청 시간)를 추출합니다.
+    합성 데이터는 이 분포에서 샘플링합니다.
+    """
+    def __init__(self, path=default_watch_log_path):
+        df = pd.read_csv(path)
+        self.items_per_user = df.groupby("user_id").size().to_numpy()
+        popularity = df["contents_code"].value_counts()
+        self.contents_codes = popularity.index.to_numpy()
+        self.contents_prob = (popularity / popularity.sum()).to_numpy()
+        self.watch_seconds = df["watch_seconds"].to_numpy()
+
+
+def make_watch_log(num_users, shape=None, seed=0):
+    """ user_id, contents_code, watch_seconds 형태의 합성 시청 로그 """
+    shape = shape or WatchLogShape()
+    rng = np.random.default_rng(seed)
+    counts = rng.choice(shape.items_per_user, size=num_users)
+    total = int(counts.sum())
+    return pd.DataFrame({
+        "user_id": np.repeat(np.arange(num_users), counts),
+        "contents_code": rng.choice(
+            shape.contents_codes, size=total, p=shape.contents_prob
+        ),
+        "watch_seconds": rng.choice(shape.watch_seconds, size=total),
+    })
+
+
+def make_inference_result(num_users, top_k=16, shape=None, seed=0):
+    """
+    inference_result.snappy.parquet 형태의 합성 추론 결과.
+    첫 행은 인기 콘텐츠(C#popular) 행으로 사용됩니다.
+    """
+    shape = shape or WatchLogShape()
+    rng = np.random.default_rng(seed)
+    codes = rng.choice(
+        shape.contents_codes, size=(num_users, top_k), p=shape.contents_prob
+    )
+    scores = -np.sort(-rng.random((num_users, top_k)), axis=1)
+    items = [
+        [{"code": int(code), "score": float(score)} for code, score in zip(c, s)]
+        for c, s in zip(codes, scores)
+    ]
+    return pd.DataFrame({"user_id": np.arange(num_users), "items": items})
@@ -0,0 +1,33 @@
+import torch
+from torch import nn
+
+
+class ToyNCF(nn.Module):
+    """ 벤치마크용 NCF 형태 모델 (GMF + MLP) """
+    def __init__(self, num_users, num_items, dim=32, sparse=False):
+        super().__init__()
+        self.user_embedding = nn.Embedding(num_users, dim, sparse=sparse)
+        self.item_embedding = nn.Embedding(num_items, dim, sparse=sparse)
+        self.mlp = nn.Sequential(
+            nn.Linear(dim * 2, dim * 2),
+            nn.ReLU(),
+            nn.Linear(dim * 2, dim),
+            nn.ReLU(),
+        )
+        self.output = nn.Linear(dim * 2, 1)
+
+    def forward(self, users, items):
+        user = self.user_embedding(users)
+        item = self.item_embedding(items)
+        gmf = user * item
+        mlp = self.mlp(torch.cat([user, item], dim=-1))
+        return self.output(torch.cat([gmf, mlp], dim=-1)).squeeze(-1)
+
+
+def make_interactions(num_users, num_items, num_samples, seed=0):
+    generator = torch.Generator()
+    generator.manual_seed(seed)
+    users = torch.randint(0, num_users, (num_samples,), generator=generator)
+    items = torch.randint(0, num_items, (num_samples,), generator=generator)
+    labels = (torch.rand(num_samples, generator=generator) > 0.5).float()
+    return users, items, labels
@@ -0,0 +1,141 @@
+"""
+추천 아이템 만료 분포 시뮬레이션.
+
+일 단위 실행 일정(실패일 포함)과 유저 이탈률에 따라 TTL 정책별
+시간대별 만료 건수와 인기 콘텐츠로 폴백되는 유저 수를 계산합니다.
+
+    cd src
+    python -m benchmark.ttl_expiry --days 14 --failed_days 6 7 8 \\
+        --jitter_seconds 86400 --stale_extend_seconds 86400
+"""
+import json
+import logging
+import argparse
+
+import numpy as np
+
+from common.ttl import HOUR, TTLPolicy, jitter_offset
+
+
+DAY = 24 * HOUR
+
+
+def simulate(policy, num_users, days, run_hour, failed_days, churn, seed=0):
+    """
+    TTLPolicy 의 ttl_for / extended_ttl 과 같은 규칙을 유저 배열에 적용합니다.
+    만료된 아이템은 DynamoDB TTL 처럼 만료 시각에 삭제된 것으로 봅니다.
+    """
+    rng = np.random.default_rng(seed)
+    keys = [f"U#{user_id}" for user_id in range(num_users)]
+    offsets = np.array([jitter_offset(key, policy.jitter_seconds) for key in keys])
+
+    exists = np.zeros(num_users, dtype=bool)
+    ttl = np.zeros(num_users, dtype=np.int64)
+    created = np.zeros(num_users, dtype=np.int64)
+    expired_at = []
+    runs = []
+    for day in range(days + 1):
+        now = day * DAY + run_hour * HOUR
+        expired = exists & (ttl <= now)
+        expired_at.append(ttl[expired])
+        exists &= ~expired
+
+        if day == days:
+            break
+        if day in failed_days:
+            runs.append({"day": day, "failed": True, "fallback_users": int((~exists).sum())})
+            continue
+
+        present = rng.random(num_users) >= churn
+        stale = exists & ~present
+        ttl[present] = now + policy.ttl_seconds + offsets[present]
+        created[present] = now
+        exists |= present
+
+        if policy.stale_extend_seconds > 0:
+            target = now + policy.stale_extend_seconds + offsets
+            alive = now - created <= policy.ttl_seconds + policy.stale_extend_seconds
+            extend = stale & alive & (ttl < target)
+            ttl[extend] = target[extend]
+
+        runs.append({"day": day, "failed": False, "fallback_users": int((~exists).sum())})
+
+    # 시뮬레이션 종료 후에도 남은 아이템은 TTL 시각에 만료됩니다
+    expired_at.append(ttl[exists])
+    expired_at = np.concatenate(expired_at)
+    hours, counts = np.unique(expired_at // HOUR, return_counts=True)
+    return {
+        "max_expired_per_hour": int(counts.max()) if len(counts) else 0,
+        "max_expiry_ratio_per_hour": round(float(counts.max() / num_users), 4)
+        if len(counts) else 0.0,
+        "peak_hour": int(hours[np.argmax(counts)]) if len(counts) else None,
+        "max_fallback_users": max(run["fallback_users"] for run in runs),
+        "runs": runs,
+        "histogram": {int(hour): int(count) for hour, count in zip(hours, counts)},
+    }
+
+
+def render_histogram(histogram, width=50):
+    if not histogram:
+        return ""
+    peak = max(histogram.values())
+    return "\n".join(
+        f"day {hour // 24:>3} {hour % 24:02d}h {count:>8} "
+        f"{'#' * max(1, round(count / peak * width))}"
+        for hour, count in sorted(histogram.items())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_users", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--run_hour", type=int, default=0)
+    parser.add_argument("--failed_days", type=int, nargs="*", default=[6, 7, 8])
+    parser.add_argument("--churn", type=float, default=0.05)
+    parser.add_argument("--ttl_seconds", type=int, default=3600 * 24 * 3)
+    parser.add_argument("--jitter_seconds", type=int, default=86400)
+    parser.add_argument("--stale_extend_seconds", type=int, default=86400)
+    parser.add_argument("--max_expiry_ratio_per_hour", type=float, default=0.1)
+    parser.add_argument("--show_histogram", action="store_true")
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    policies = {
+        "fixed": TTLPolicy(ttl_seconds=args.ttl_seconds),
+        "jittered": TTLPolicy(
+            ttl_seconds=args.ttl_seconds,
+            jitter_seconds=args.jitter_seconds,
+            stale_extend_seconds=args.stale_extend_seconds,
+            max_expiry_ratio_per_hour=args.max_expiry_ratio_per_hour,
+        ),
+    }
+    results = {}
+    for name, policy in policies.items():
+        result = simulate(
+            policy, args.num_users, args.days, args.run_hour, set(args.failed_days), args.churn
+        )
+        result["guard_passed"] = \
+            result["max_expiry_ratio_per_hour"] <= args.max_expiry_ratio_per_hour
+        results[name] = result
+        logging.info(
+            f"{name:<9} max expiry/hour {result['max_expiry_ratio_per_hour']:.2%}, "
+            f"max fallback users {result['max_fallback_users']}, "
+            f"guard {'ok' if result['guard_passed'] else 'violated'}"
+        )
+        if args.show_histogram:
+            print(f"[{name}]\n{render_histogram(result['histogram'])}")
+
+    summary = {
+        name: {key: value for key, value in result.items() if key != "histogram"}
+        for name, result in results.items()
+    }
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,154 @@
+import os
+import copy
+import glob
+import queue
+import logging
+import threading
+
+import torch
+from torch.utils.data import Sampler
+
+
+class ResumableRandomSampler(Sampler):
+    """
+    (seed, epoch) 로 순서가 결정되는 랜덤 샘플러.
+    체크포인트에 저장한 위치(offset)부터 이어서 샘플링할 수 있습니다.
+    """
+    def __init__(self, num_samples, seed=0):
+        self.num_samples = num_samples
+        self.seed = seed
+        self.epoch = 0
+        self.offset = 0
+
+    def set_epoch(self, epoch, offset=0):
+        self.epoch = epoch
+        self.offset = offset
+
+    def __iter__(self):
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        indices = torch.randperm(self.num_samples, generator=generator)
+        return iter(indices[self.offset:].tolist())
+
+    def __len__(self):
+        return self.num_samples - self.offset
+
+    def state_dict(self, consumed_samples):
+        return {"epoch": self.epoch, "offset": self.offset + consumed_samples}
+
+
+class AsyncCheckpointer:
+    """
+    학습 상태(모델, 옵티마이저, 데이터 로더 위치)를 백그라운드 스레드에서 저장합니다.
+
+    - 학습 스레드는 상태를 CPU 로 복사(snapshot)하는 시간만 사용합니다.
+    - 저장이 밀리면 대기 중인 오래된 스냅샷을 버리고 최신 스냅샷만 저장합니다.
+    - 임시 파일에 쓴 뒤 rename 하므로 중단 시점에도 손상된 체크포인트가 남지 않습니다.
+    - SageMaker 는 checkpoint_local_path(/opt/ml/checkpoints)를
+      checkpoint_s3_uri 와 동기화하고, 스팟 재시작 시 다시 내려받습니다.
+
+    사용 예)
+        checkpointer = AsyncCheckpointer(args.checkpoint_dir)
+        state = checkpointer.load_latest(model, optimizer)
+        ...
+        checkpointer.save(model, optimizer, epoch=epoch, step=step, sampler=...)
+        checkpointer.close()
+    """
+    file_pattern = "checkpoint-{epoch:04d}-{step:08d}.pt"
+
+    def __init__(self, checkpoint_dir="/opt/ml/checkpoints", keep_last=2):
+        self.checkpoint_dir = checkpoint_dir
+        self.keep_last = keep_last
+        self.queue = queue.Queue(maxsize=1)
+        self.error = None
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self.worker = threading.Thread(target=self._write_loop, daemon=True)
+        self.worker.start()
+
+    def list_checkpoints(self):
+        return sorted(glob.glob(os.path.join(self.checkpoint_dir, "checkpoint-*.pt")))
+
+    @staticmethod
+    def snapshot(model, optimizer, epoch, step, **extra):
+        return {
+            "model": {
+                key: value.detach().to("cpu", copy=True)
+                for key, value in model.state_dict().items()
+            },
+            "optimizer": copy.deepcopy(optimizer.state_dict()) if optimizer else None,
+            "epoch": epoch,
+            "step": step,
+            **extra,
+        }
+
+    def save(self, model, optimizer, epoch, step, **extra):
+        if self.error:
+            raise self.error
+
+        state = self.snapshot(model, optimizer, epoch, step, **extra)
+        try:
+            self.queue.put_nowait(state)
+        except queue.Full:
+            try:
+                dropped = self.queue.get_nowait()
+                # 꺼낸 항목을 완료 처리하지 않으면 close() 의 queue.join() 이 끝나지 않습니다
+                self.queue.task_done()
+                logging.debug(f"drop pending checkpoint : {dropped['epoch']}/{dropped['step']}")
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(state)
+
+    def _write_loop(self):
+        while True:
+            state = self.queue.get()
+            if state is None:
+                self.queue.task_done()
+                return
+            try:
+                self._write(state)
+            except Exception as e:
+                logging.exception("checkpoint write failed")
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _write(self, state):
+        path = os.path.join(
+            self.checkpoint_dir,
+            self.file_pattern.format(epoch=state["epoch"], step=state["step"])
+        )
+        tmp_path = f"{path}.tmp"
+        torch.save(state, tmp_path)
+        os.replace(tmp_path, path)
+        logging.info(f"checkpoint saved : {path}")
+
+        for old_path in self.list_checkpoints()[:-self.keep_last]:
+            os.remove(old_path)
+
+    def load_latest(self, model, optimizer=None):
+        """
+        가장 최근 체크포인트를 불러와 모델/옵티마이저에 적용합니다.
+
+        :return: 체크포인트 상태 (epoch, step 및 save 에 전달한 값), 없으면 None
+        """
+        checkpoints = self.list_checkpoints()
+        if not checkpoints:
+            return None
+
+        state = torch.load(checkpoints[-1], map_location="cpu")
+        model.load_state_dict(state["model"])
+        if optimizer and state.get("optimizer"):
+            optimizer.load_state_dict(state["optimizer"])
+        logging.info(
+            f"resume from checkpoint : {checkpoints[-1]} "
+            f"(epoch {state['epoch']}, step {state['step']})"
+        )
+        return state
+
+    def close(self):
+        """ 대기 중인 체크포인트 저장이 끝날 때까지 기다립니다. """
+        self.queue.join()
+        self.queue.put(None)
+        self.worker.join()
+        if self.error:
+            raise self.error
@@ -0,0 +1,480 @@
+"""
+날짜 파티션(year=/month=/day=) 데이터셋의 작은 파일 병합.
+
+    cd src
+    python -m common.compaction --root s3://mlops-recommend-system-<유저명>/ns=dev/input/data \
+        --dataset_name watch_log --dataset_version 1 --start_date 2024-03-01 --end_date 2024-03-07
+
+원본은 기본으로 남깁니다. --delete_sources 를 주면 병합한 원본을 지우되 다른 단계가 이름으로
+읽는 계약 파일은 남깁니다.
+"""
+import io
+import os
+import json
+import logging
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from utils.utils import make_s3_dataset_path, make_s3_model_output_path
+from common.s3_staging import MB, parse_s3_uri
+from common.contracts import STAGE_CONTRACTS
+
+
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_VERSION = 1
+COMPACTED_PREFIX = "compacted-"
+SOURCE_SUFFIXES = (".parquet", ".csv")
+
+
+class LocalStorage:
+    """ 로컬 디렉터리. 키는 root 기준 "/" 구분 상대 경로입니다. """
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def list(self, prefix):
+        """ :return: {키: 크기} """
+        base = self.path(prefix)
+        objects = {}
+        for dir_path, _, files in os.walk(base):
+            for name in files:
+                key = os.path.relpath(os.path.join(dir_path, name), self.root).replace("\\", "/")
+                objects[key] = os.path.getsize(os.path.join(dir_path, name))
+        return objects
+
+    def get(self, key):
+        with open(self.path(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def delete(self, keys):
+        for key in keys:
+            os.remove(self.path(key))
+
+
+class S3Storage:
+    """ S3 prefix. 키는 prefix 기준 상대 경로이며 put 은 객체 단위로 원자적입니다. """
+    def __init__(self, s3_uri, s3_client=None, aws_region="ap-northeast-2"):
+        import boto3
+
+        self.bucket, self.prefix = parse_s3_uri(s3_uri.rstrip("/"))
+        self.s3 = s3_client or boto3.client("s3", region_name=aws_region)
+
+    def key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def list(self, prefix):
+        paginator = self.s3.get_paginator("list_objects_v2")
+        base = f"{self.prefix}/" if self.prefix else ""
+        return {
+            obj["Key"][len(base):]: obj["Size"]
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=self.key(prefix))
+            for obj in page.get("Contents", [])
+            if not obj["Key"].endswith("/")
+        }
+
+    def get(self, key):
+        return self.s3.get_object(Bucket=self.bucket, Key=self.key(key))["Body"].read()
+
+    def exists(self, key):
+        try:
+            self.s3.head_object(Bucket=self.bucket, Key=self.key(key))
+            return True
+        except self.s3.exceptions.ClientError:
+            return False
+
+    def put(self, key, data):
+        self.s3.put_object(Bucket=self.bucket, Key=self.key(key), Body=data)
+
+    def delete(self, keys):
+        keys = list(keys)
+        # DeleteObjects 는 요청당 1000 개까지 지원합니다
+        for start in range(0, len(keys), 1000):
+            self.s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": self.key(key)} for key in keys[start:start + 1000]]},
+            )
+
+
+def open_storage(root, s3_client=None):
+    if root.startswith("s3://"):
+        return S3Storage(root, s3_client=s3_client)
+    return LocalStorage(root)
+
+
+def date_range(start_date, end_date):
+    start = datetime.datetime.strptime(str(start_date), "%Y-%m-%d")
+    end = datetime.datetime.strptime(str(end_date), "%Y-%m-%d")
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def partition_key(base_date, dataset_name=None, dataset_version=None, model_name=None, subdir=None):
+    """
+    root 기준 파티션 키.
+    dataset_name 이면 make_s3_dataset_path, model_name 이면 make_s3_model_output_path(+subdir) 레이아웃
+    """
+    if model_name:
+        key = make_s3_model_output_path("", model_name, base_date)
+        if subdir:
+            key = f"{key}/{subdir}"
+    else:
+        key = make_s3_dataset_path("", dataset_name, dataset_version, base_date)
+    return key.replace("\\", "/").strip("/")
+
+
+def dataset_key(dataset_name=None, dataset_version=None, model_name=None, subdir=None):
+    """ 파티션들의 상위 키. 데이터셋 manifest 가 놓이는 위치입니다. """
+    if model_name:
+        return f"{model_name}/{subdir}" if subdir else model_name
+    return f"{dataset_name}/v{dataset_version}"
+
+
+def is_source(key):
+    name = key.rsplit("/", 1)[-1]
+    return not name.startswith(("_", ".")) and name.endswith(SOURCE_SUFFIXES)
+
+
+def read_table(storage, key, columns=None):
+    data = storage.get(key)
+    if key.endswith(".csv"):
+        table = pa_csv.read_csv(io.BytesIO(data))
+        return table.select(columns) if columns else table
+    return pq.read_table(io.BytesIO(data), columns=columns)
+
+
+def load_manifest(storage, key):
+    if not storage.exists(f"{key}/{MANIFEST_FILE}"):
+        return None
+    return json.loads(storage.get(f"{key}/{MANIFEST_FILE}"))
+
+
+def put_manifest(storage, key, manifest):
+    storage.put(f"{key}/{MANIFEST_FILE}", json.dumps(manifest, indent=2).encode("utf-8"))
+
+
+def _column_range(table, column):
+    if column not in table.column_names or table.num_rows == 0:
+        return None, None
+    bounds = pc.min_max(table.column(column))
+    return bounds["min"].as_py(), bounds["max"].as_py()
+
+
+def write_parts(table, target_file_mb=128, row_group_rows=100_000, sort_by="user_id"):
+    """
+    정렬된 table 을 target_file_mb 내외의 parquet 파일들로 씁니다.
+    row group 단위로 쓰면서 크기가 목표를 넘으면 다음 파일로 넘어가므로 파일 크기는
+    목표 + row group 하나 이내입니다. 열 통계(min/max)는 row group 마다 기록됩니다.
+
+    :return: [(parquet bytes, 행 수)]
+    """
+    parts = []
+    sink, writer, rows = None, None, 0
+
+    def close():
+        writer.close()
+        parts.append((sink.getvalue().to_pybytes(), rows))
+
+    for start in range(0, max(table.num_rows, 1), row_group_rows):
+        if writer is None:
+            sink = pa.BufferOutputStream()
+            writer = pq.ParquetWriter(
+                sink,
+                table.schema,
+                compression="snappy",
+                write_statistics=True,
+                # 정렬 키는 사전 인코딩 효과가 없으므로 나머지 열만 사전 인코딩합니다
+                use_dictionary=[name for name in table.column_names if name != sort_by],
+            )
+            rows = 0
+        chunk = table.slice(start, row_group_rows)
+        writer.write_table(chunk, row_group_size=row_group_rows)
+        rows += chunk.num_rows
+        if sink.tell() >= target_file_mb * MB:
+            close()
+            writer = None
+    if writer is not None:
+        close()
+    return parts
+
+
+def is_compacted(key):
+    return key.rsplit("/", 1)[-1].startswith(COMPACTED_PREFIX)
+
+
+def is_protected(key, dataset_name=None):
+    """
+    다른 단계가 이름으로 읽는 파일(원본 {dataset_name}.csv, 단계 계약 파일)은 병합 후에도 지우지 않습니다.
+    계약 파일은 이름 규칙으로 찾으므로 prepared_ 데이터셋을 병합할 때의 학습 데이터도 포함됩니다.
+    """
+    name = key.rsplit("/", 1)[-1]
+    return bool(dataset_name) and name == f"{dataset_name}.csv" \
+        or any(contract.matches(name) for contract in STAGE_CONTRACTS)
+
+
+def compact_partition(
+    storage,
+    key,
+    target_file_mb=128,
+    row_group_rows=100_000,
+    sort_by="user_id",
+    delete_sources=False,
+    dataset_name=None,
+    read_concurrency=8
+):
+    """
+    파티션의 작은 parquet/CSV 파일을 sort_by 로 정렬된 parquet 파일들로 병합합니다.
+
+    1. 새 파일을 세대(generation) 이름으로 쓰고
+    2. 병합에 들어간 원본을 consumed_sources 에 기록한 파티션 manifest 로 교체합니다.
+    3. 대체된 파일(이전 병합본, delete_sources 면 원본)은 지우지 않고 돌려주며, 호출한 쪽이
+       데이터셋 manifest 를 갱신한 뒤 remove_obsolete 로 지웁니다.
+    3 이전에 중단되어도 다시 실행하면 consumed_sources 의 원본은 다시 합치지 않고 지울 목록에만
+    넣습니다. 2 이전에 중단되어 manifest 에 없는 병합본도 지울 목록에 넣습니다.
+    이미 병합되어 새 파일이 없는 파티션은 다시 쓰지 않습니다.
+
+    파티션에는 다른 단계의 출력(예: watch_log.csv 옆의 학습 데이터 parquet)이 함께 있을 수 있으므로
+    기준 파일(이전 병합본, 없으면 {dataset_name}.csv, 그것도 없으면 첫 원본)과 열이 같은 파일만
+    합칩니다. 열이 다른 파일은 skipped_sources 에 기록하고 병합하거나 지우지 않습니다.
+
+    :return: (파티션 manifest, 지워도 되는 키 목록)
+    """
+    manifest = load_manifest(storage, key)
+    objects = {
+        name: size for name, size in storage.list(f"{key}/").items() if is_source(name)
+    }
+    compacted = {part["key"] for part in manifest["files"]} if manifest else set()
+    consumed = set(manifest["consumed_sources"]) & set(objects) if manifest else set()
+    skipped = set(manifest.get("skipped_sources", [])) & set(objects) if manifest else set()
+    orphans = sorted(name for name in objects if is_compacted(name) and name not in compacted)
+    sources = sorted(set(objects) - compacted - consumed - skipped - set(orphans))
+
+    def deletable(names):
+        if not delete_sources:
+            return []
+        return sorted(name for name in names if not is_protected(name, dataset_name))
+
+    if not sources:
+        logging.info(f"skip {key} : no new files")
+        return manifest, orphans + deletable(consumed)
+
+    # 이전 병합본도 다시 합쳐 파티션 전체가 정렬된 상태를 유지합니다
+    previous = sorted(compacted & set(objects))
+    with ThreadPoolExecutor(max_workers=read_concurrency) as executor:
+        tables = dict(zip(
+            previous + sources,
+            executor.map(lambda name: read_table(storage, name), previous + sources),
+        ))
+    raw_source = f"{key}/{dataset_name}.csv"
+    reference = tables[
+        previous[0] if previous else raw_source if raw_source in tables else sources[0]
+    ]
+    mismatched = [
+        name for name in sources
+        if sorted(tables[name].column_names) != sorted(reference.column_names)
+    ]
+    if mismatched:
+        logging.warning(f"skip {len(mismatched)} files with other columns in {key} : {mismatched}")
+        skipped |= set(mismatched)
+        sources = [name for name in sources if name not in skipped]
+    if not sources:
+        manifest["skipped_sources"] = sorted(skipped)
+        put_manifest(storage, key, manifest)
+        return manifest, orphans + deletable(consumed)
+
+    inputs = previous + sources
+    table = pa.concat_tables([
+        tables[name].select(reference.column_names).cast(reference.schema) for name in inputs
+    ])
+    if sort_by in table.column_names:
+        table = table.sort_by([(sort_by, "ascending")])
+
+    generation = datetime.datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+    files = []
+    for i, (data, rows) in enumerate(write_parts(
+        table, target_file_mb=target_file_mb, row_group_rows=row_group_rows, sort_by=sort_by
+    )):
+        part_key = f"{key}/{COMPACTED_PREFIX}{generation}-{i:05d}.snappy.parquet"
+        storage.put(part_key, data)
+        part = table.slice(sum(f["rows"] for f in files), rows)
+        low, high = _column_range(part, sort_by)
+        files.append({"key": part_key, "rows": rows, "bytes": len(data), "min": low, "max": high})
+
+    consumed |= set(sources)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "sort_by": sort_by,
+        "rows": table.num_rows,
+        "bytes": sum(f["bytes"] for f in files),
+        "source_files": len(inputs),
+        "source_bytes": sum(objects[name] for name in inputs),
+        "compacted_at": datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+        "files": files,
+        # 병합본에 이미 들어 있는 원본. 다음 병합에서 새 파일로 보지 않습니다
+        "consumed_sources": sorted(consumed),
+        # 열이 달라 병합하지 않은 파일. 다음 병합에서도 새 파일로 보지 않습니다
+        "skipped_sources": sorted(skipped),
+    }
+    put_manifest(storage, key, manifest)
+    logging.info(
+        f"compacted {key} : {len(inputs)} files {manifest['source_bytes'] / MB:.1f}MB "
+        f"-> {len(files)} files {manifest['bytes'] / MB:.1f}MB"
+    )
+    return manifest, orphans + sorted(compacted & set(objects)) + deletable(consumed)
+
+
+def remove_obsolete(storage, key, manifest, obsolete):
+    """ 대체된 파일을 지우고 지운 원본을 파티션 manifest 의 consumed_sources 에서 뺍니다. """
+    if not obsolete:
+        return
+    storage.delete(obsolete)
+    if manifest and set(obsolete) & set(manifest["consumed_sources"]):
+        manifest["consumed_sources"] = sorted(set(manifest["consumed_sources"]) - set(obsolete))
+        put_manifest(storage, key, manifest)
+    logging.info(f"deleted {key} : {len(obsolete)} files")
+
+
+def compact_range(
+    storage,
+    start_date,
+    end_date,
+    dataset_name=None,
+    dataset_version=None,
+    model_name=None,
+    subdir=None,
+    **options
+):
+    """
+    날짜 범위의 파티션을 병합하고 데이터셋 manifest({날짜: 파티션 manifest})를 갱신합니다.
+    파티션마다 데이터셋 manifest 를 갱신한 직후 대체된 파일을 지우므로 중간에 중단되어도
+    지워진 파일을 가리키는 manifest 는 남지 않습니다.
+    데이터셋 manifest 는 한 번에 하나의 병합 작업만 갱신한다고 가정합니다.
+    """
+    layout = dict(
+        dataset_name=dataset_name, dataset_version=dataset_version,
+        model_name=model_name, subdir=subdir,
+    )
+    root_key = dataset_key(**layout)
+    dataset_manifest = load_manifest(storage, root_key) \
+        or {"version": MANIFEST_VERSION, "partitions": {}}
+    for base_date in date_range(start_date, end_date):
+        key = partition_key(base_date, **layout)
+        manifest, obsolete = compact_partition(
+            storage, key, dataset_name=dataset_name, **options
+        )
+        if manifest:
+            partition = {"key": key, **{name: manifest[name] for name in ["rows", "bytes", "files"]}}
+            if dataset_manifest["partitions"].get(base_date.strftime("%Y-%m-%d")) != partition:
+                dataset_manifest["partitions"][base_date.strftime("%Y-%m-%d")] = partition
+                put_manifest(storage, root_key, dataset_manifest)
+        remove_obsolete(storage, key, manifest, obsolete)
+    return dataset_manifest
+
+
+def plan_reads(storage, start_date, end_date, user_range=None, **layout):
+    """
+    읽을 파일 키 목록.
+    데이터셋 manifest 가 있으면 목록 조회 없이 manifest 의 파일만 사용하고, manifest 에 없는
+    날짜는 파티션 manifest 를, 그것도 없으면 파티션을 나열합니다.
+    user_range=(min, max) 이면 통계로 겹치지 않는 파일을 건너뜁니다.
+    """
+    dataset_manifest = load_manifest(storage, dataset_key(**layout)) or {"partitions": {}}
+    keys = []
+    for base_date in date_range(start_date, end_date):
+        partition = dataset_manifest["partitions"].get(base_date.strftime("%Y-%m-%d")) \
+            or load_manifest(storage, partition_key(base_date, **layout))
+        if partition is None:
+            keys.extend(sorted(
+                name for name in storage.list(f"{partition_key(base_date, **layout)}/")
+                if is_source(name)
+            ))
+            continue
+        for part in partition["files"]:
+            if user_range and part["min"] is not None and (
+                part["max"] < user_range[0] or part["min"] > user_range[1]
+            ):
+                continue
+            keys.append(part["key"])
+    return keys
+
+
+def read_range(
+    storage,
+    start_date,
+    end_date,
+    columns=None,
+    user_range=None,
+    read_concurrency=8,
+    **layout
+):
+    """ 날짜 범위 데이터를 하나의 Arrow Table 로 읽습니다. """
+    keys = plan_reads(storage, start_date, end_date, user_range=user_range, **layout)
+    with ThreadPoolExecutor(max_workers=read_concurrency) as executor:
+        tables = list(executor.map(lambda key: read_table(storage, key, columns), keys))
+    if not tables:
+        return None
+    table = pa.concat_tables(tables)
+    if user_range:
+        user_ids = table.column("user_id")
+        table = table.filter(pc.and_(
+            pc.greater_equal(user_ids, user_range[0]), pc.less_equal(user_ids, user_range[1])
+        ))
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", type=str, required=True, help="로컬 디렉터리 또는 s3://bucket/prefix")
+    parser.add_argument("--dataset_name", type=str, default=None)
+    parser.add_argument("--dataset_version", type=int, default=1)
+    parser.add_argument("--model_name", type=str, default=None)
+    parser.add_argument("--subdir", type=str, default=None, help="모델 출력 아래 경로 (예: inference)")
+    parser.add_argument("--start_date", type=str, required=True)
+    parser.add_argument("--end_date", type=str, required=True)
+    parser.add_argument("--target_file_mb", type=int, default=128)
+    parser.add_argument("--row_group_rows", type=int, default=100_000)
+    parser.add_argument("--sort_by", type=str, default="user_id")
+    parser.add_argument(
+        "--delete_sources", action="store_true",
+        help="병합한 원본을 지웁니다. 단계 계약 파일(watch_log.csv, inference_result 등)은 남깁니다"
+    )
+    args = parser.parse_args()
+    if not args.dataset_name and not args.model_name:
+        parser.error("--dataset_name 또는 --model_name 이 필요합니다")
+
+    manifest = compact_range(
+        open_storage(args.root),
+        args.start_date,
+        args.end_date,
+        dataset_name=args.dataset_name,
+        dataset_version=args.dataset_version,
+        model_name=args.model_name,
+        subdir=args.subdir,
+        target_file_mb=args.target_file_mb,
+        row_group_rows=args.row_group_rows,
+        sort_by=args.sort_by,
+        delete_sources=args.delete_sources,
+    )
+    logging.info(f"partitions : {len(manifest['partitions'])}")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
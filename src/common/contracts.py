@@ -0,0 +1,204 @@
+import os
+import re
+import logging
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class ContractError(ValueError):
+    """ 단계 출력이 선언된 스키마와 맞지 않습니다. """
+
+
+class StageContract:
+    """
+    단계 출력의 파일 이름과 Arrow 스키마.
+
+    - 선언된 필드는 반드시 있어야 하며 타입이 같아야 합니다. 정수는 폭이 달라도 허용합니다.
+    - 선언되지 않은 필드는 허용합니다.
+    - nullable=False 필드는 parquet row group 통계의 null_count 로 검사합니다.
+    """
+    def __init__(self, name, file_name, schema):
+        self.name = name
+        self.file_name_template = file_name
+        self.schema = schema
+
+    def file_name(self, **kwargs):
+        return self.file_name_template.format(**kwargs)
+
+    def matches(self, file_name):
+        """ file_name 이 이름 규칙을 따르는지. {dataset_name} 같은 자리는 어떤 값이든 허용합니다. """
+        pattern = re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(self.file_name_template))
+        return re.fullmatch(pattern, file_name) is not None
+
+    def __repr__(self):
+        return f"StageContract({self.name})"
+
+
+PREPARED_TRAIN_DATA = StageContract(
+    name="prepared_train_data",
+    file_name="{dataset_name}_train_{model_name}.snappy.parquet",
+    schema=pa.schema([
+        pa.field("user_id", pa.int64(), nullable=False),
+        pa.field("contents_code", pa.int64(), nullable=False),
+    ]),
+)
+
+INFERENCE_RESULT = StageContract(
+    name="inference_result",
+    file_name="inference_result.snappy.parquet",
+    schema=pa.schema([
+        pa.field("user_id", pa.int64(), nullable=False),
+        pa.field("items", pa.list_(pa.struct([
+            pa.field("code", pa.int64()),
+            pa.field("score", pa.float64()),
+        ]))),
+    ]),
+)
+
+
+STAGE_CONTRACTS = (PREPARED_TRAIN_DATA, INFERENCE_RESULT)
+
+
+def is_compatible(actual, expected):
+    if actual.equals(expected):
+        return True
+    if pa.types.is_integer(expected):
+        return pa.types.is_integer(actual)
+    if pa.types.is_floating(expected):
+        return pa.types.is_floating(actual)
+    if pa.types.is_list(expected) or pa.types.is_large_list(expected):
+        return (pa.types.is_list(actual) or pa.types.is_large_list(actual)) \
+            and is_compatible(actual.value_type, expected.value_type)
+    if pa.types.is_struct(expected):
+        if not pa.types.is_struct(actual):
+            return False
+        fields = {actual.field(i).name: actual.field(i).type for i in range(actual.num_fields)}
+        return all(
+            expected.field(i).name in fields
+            and is_compatible(fields[expected.field(i).name], expected.field(i).type)
+            for i in range(expected.num_fields)
+        )
+    return False
+
+
+def check_schema(schema, contract):
+    """ :return: 위반 목록 """
+    violations = []
+    for field in contract.schema:
+        index = schema.get_field_index(field.name)
+        if index < 0:
+            violations.append(f"{field.name}: 필드가 없습니다")
+        elif not is_compatible(schema.field(index).type, field.type):
+            violations.append(
+                f"{field.name}: {schema.field(index).type} (계약 {field.type})"
+            )
+    return violations
+
+
+def raise_violations(contract, source, violations):
+    if violations:
+        raise ContractError(f"{contract.name} 계약 위반 ({source}) : " + "; ".join(violations))
+
+
+def validate_parquet(path, contract):
+    """
+    parquet footer(스키마, row group 통계)만 읽어 검사합니다. 데이터 페이지는 읽지 않습니다.
+    :return: FileMetaData
+    """
+    metadata = pq.read_metadata(path)
+    violations = check_schema(metadata.schema.to_arrow_schema(), contract)
+
+    required = {field.name for field in contract.schema if not field.nullable}
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            stats = column.statistics
+            if column.path_in_schema in required and stats is not None \
+                    and stats.has_null_count and stats.null_count > 0:
+                violations.append(
+                    f"{column.path_in_schema}: row group {i} 에 null {stats.null_count}개"
+                )
+                required.discard(column.path_in_schema)
+    raise_violations(contract, path, violations)
+    return metadata
+
+
+def validate_table(table, contract):
+    violations = check_schema(table.schema, contract)
+    for field in contract.schema:
+        if not field.nullable and field.name in table.column_names \
+                and table.column(field.name).null_count > 0:
+            violations.append(f"{field.name}: null {table.column(field.name).null_count}개")
+    raise_violations(contract, "table", violations)
+    return table
+
+
+def to_table(data, contract):
+    """ DataFrame 또는 Table 을 검사하고 선언된 필드를 계약 타입으로 맞춥니다. """
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+    validate_table(table, contract)
+    for field in contract.schema:
+        index = table.schema.get_field_index(field.name)
+        if not table.schema.field(index).type.equals(field.type):
+            table = table.set_column(index, field.name, table.column(index).cast(field.type))
+    return table
+
+
+def read_parquet(path, contract, columns=None):
+    validate_parquet(path, contract)
+    return pq.read_table(path, columns=columns)
+
+
+def write_parquet(data, path, contract):
+    """ 계약을 검사한 뒤 임시 파일에 쓰고 교체합니다. """
+    table = to_table(data, contract)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression="snappy")
+    os.replace(tmp_path, path)
+    return table
+
+
+class Handoff:
+    """
+    한 프로세스 안에서 이어서 수행하는 단계 사이의 데이터 전달.
+
+    put 한 Arrow Table 을 다음 단계가 get 으로 그대로 받으므로 parquet 직렬화/역직렬화가 없습니다.
+    handoff 에 없는 출력은 파일에서 읽습니다. persist=True 면 별도 작업(SageMaker 등)이
+    이어받을 수 있도록 파일로도 씁니다.
+    현재 파이프라인은 단계마다 별도 SageMaker 작업(프로세스)이라 handoff 없이 파일로 주고받으며,
+    한 프로세스에서 단계를 잇는 곳은 benchmark.contracts 뿐입니다.
+    """
+    def __init__(self, persist=False):
+        self.persist = persist
+        self.tables = {}
+
+    def put(self, contract, data, path=None):
+        if self.persist and path:
+            table = write_parquet(data, path, contract)
+        else:
+            table = to_table(data, contract)
+        self.tables[contract.name] = table
+        logging.info(f"handoff put {contract.name} : {table.num_rows} rows")
+        return table
+
+    def get(self, contract, path=None, columns=None):
+        table = self.tables.get(contract.name)
+        if table is None:
+            return read_parquet(path, contract, columns=columns)
+        return table.select(columns) if columns else table
+
+
+def put_output(handoff, contract, data, path):
+    """ handoff 가 없으면 파일로 씁니다. """
+    if handoff is None:
+        return write_parquet(data, path, contract)
+    return handoff.put(contract, data, path)
+
+
+def get_input(handoff, contract, path, columns=None):
+    """ handoff 가 없으면 파일 footer 를 검사한 뒤 읽습니다. """
+    if handoff is None:
+        return read_parquet(path, contract, columns=columns)
+    return handoff.get(contract, path, columns=columns)
@@ -1,12 +1,21 @@
 import boto3
 import json
+import random
 from decimal import Decimal
 from datetime import datetime
 
+from boto3.dynamodb.types import TypeSerializer
+
+from common.write_scheduler import WriteScheduler
+
+
+# TransactWriteItems 한 요청에 담을 수 있는 최대 아이템 수
+TRANSACT_MAX_ITEMS = 100
+
 
 class DynamoDB:
-    def __init__(self, aws_region):
-        self.resource = boto3.resource("dynamodb", region_name=aws_region)
+    def __init__(self, aws_region, resource=None):
+        self.resource = resource or boto3.resource("dynamodb", region_name=aws_region)
 
     def batch_write_df_to_ddb(self, table_name, df):
         table = self.resource.Table(table_name)
@@ -14,6 +23,100 @@ class DynamoDB:
             for index, row in df.iterrows():
                 batch.put_item(json.loads(row.to_json(), parse_float=Decimal))
 
+    def scheduled_write(self, table_name, items, wcu_budget, num_buckets=8):
+        """
+        중복 제거, 파티션 분산 배치, WCU 예산 제한을 적용해 기록합니다.
+        :return: 쓰기 통계 (요청 수, 스로틀링된 아이템 수 등)
+        """
+        return WriteScheduler(
+            self.resource, wcu_budget=wcu_budget, num_buckets=num_buckets
+        ).write(table_name, items)
+
+    def scan_expiry_attributes(self, table_name):
+        """ :return: [{"PK", "SK", "TTL", "CreatedAt"}] """
+        table = self.resource.Table(table_name)
+        kwargs = {
+            "ProjectionExpression": "PK, SK, #ttl, CreatedAt",
+            "ExpressionAttributeNames": {"#ttl": "TTL"},
+        }
+        result = []
+        while True:
+            response = table.scan(**kwargs)
+            result.extend(response["Items"])
+            if "LastEvaluatedKey" not in response:
+                return result
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def update_ttl(self, table_name, key_ttls):
+        """ :param key_ttls: [((PK, SK), TTL)] """
+        table = self.resource.Table(table_name)
+        for (pk, sk), ttl in key_ttls:
+            table.update_item(
+                Key={"PK": pk, "SK": sk},
+                UpdateExpression="SET #ttl = :ttl",
+                ExpressionAttributeNames={"#ttl": "TTL"},
+                ExpressionAttributeValues={":ttl": int(ttl)},
+            )
+
+    def transact_put_items(self, table_name, items):
+        """ items 를 하나의 트랜잭션으로 기록합니다. 모두 기록되거나 모두 실패합니다. """
+        if len(items) > TRANSACT_MAX_ITEMS:
+            raise ValueError(
+                f"트랜잭션 아이템 수가 {TRANSACT_MAX_ITEMS}개를 넘습니다 : {len(items)}"
+            )
+        serializer = TypeSerializer()
+        self.resource.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": table_name,
+                        "Item": {
+                            key: serializer.serialize(value)
+                            for key, value in json.loads(
+                                # numpy 스칼라는 파이썬 값으로 변환합니다
+                                json.dumps(item, default=lambda value: value.item()),
+                                parse_float=Decimal
+                            ).items()
+                        },
+                    }
+                }
+                for item in items
+            ]
+        )
+
+    def get_sharded_item(self, table_name, pk, sk, shard_count):
+        """
+        샤드 키 중 하나를 임의로 골라 읽습니다.
+        샤드가 아직 기록되지 않았다면 샤드 없는 키로 읽습니다.
+        """
+        table = self.resource.Table(table_name)
+        if shard_count > 1:
+            item = table.get_item(
+                Key={"PK": DynamoDB.pick_shard_key(pk, shard_count), "SK": sk}
+            ).get("Item")
+            if item:
+                return item
+        return table.get_item(Key={"PK": pk, "SK": sk}).get("Item")
+
+    @staticmethod
+    def make_shard_keys(pk, shard_count):
+        return [f"{pk}#{i}" for i in range(shard_count)]
+
+    @staticmethod
+    def pick_shard_key(pk, shard_count):
+        return f"{pk}#{random.randrange(shard_count)}"
+
+    @staticmethod
+    def replicate_to_shards(item, shard_count):
+        """
+        hot key 아이템을 "{PK}#0" ~ "{PK}#{N-1}" 로 복제합니다.
+        샤드를 읽지 않는 기존 클라이언트를 위해 원래 키의 아이템도 포함합니다.
+        """
+        return [item] + [
+            {**item, "PK": shard_pk}
+            for shard_pk in DynamoDB.make_shard_keys(item["PK"], shard_count)
+        ]
+
     @staticmethod
     def convert_ddb_recommend_schema(
         pk, 
@@ -0,0 +1,121 @@
+import os
+import json
+import socket
+import logging
+
+import numpy as np
+import pyarrow.parquet as pq
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.nn.parallel import DistributedDataParallel
+
+
+def get_cluster_info():
+    """
+    :return: (호스트 목록, 현재 호스트 인덱스, 마스터 주소)
+    SageMaker 학습 작업은 SM_HOSTS / SM_CURRENT_HOST 로 호스트 구성을 전달합니다.
+    """
+    hosts = json.loads(os.environ.get("SM_HOSTS", "[]"))
+    current_host = os.environ.get("SM_CURRENT_HOST")
+    if not hosts or current_host not in hosts:
+        return ["localhost"], 0, "127.0.0.1"
+    hosts = sorted(hosts)
+    return hosts, hosts.index(current_host), hosts[0]
+
+
+def find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+def _worker(local_rank, fn, nproc, node_rank, world_size, master_addr, master_port, args):
+    rank = node_rank * nproc + local_rank
+    os.environ["MASTER_ADDR"] = master_addr
+    os.environ["MASTER_PORT"] = str(master_port)
+    # 프로세스들이 코어를 나눠 쓰도록 intra-op 스레드 수를 제한합니다
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // nproc))
+    dist.init_process_group("gloo", rank=rank, world_size=world_size)
+    try:
+        fn(rank, world_size, args)
+    finally:
+        dist.destroy_process_group()
+
+
+def launch(fn, nproc, args, master_port=None):
+    """
+    fn(rank, world_size, args) 를 현재 호스트에서 nproc 개 프로세스로 수행합니다.
+    여러 인스턴스(instance_count > 1)라면 각 호스트가 같은 방식으로 nproc 개씩 수행하며
+    전체 world_size 는 호스트 수 * nproc 입니다.
+    """
+    hosts, node_rank, master_addr = get_cluster_info()
+    world_size = len(hosts) * nproc
+    if master_port is None:
+        master_port = 29500 if len(hosts) > 1 else find_free_port()
+
+    if world_size == 1:
+        fn(0, 1, args)
+        return
+
+    logging.info(
+        f"launch {nproc} processes on host {node_rank}/{len(hosts)} "
+        f"(world_size {world_size}, master {master_addr}:{master_port})"
+    )
+    mp.spawn(
+        _worker,
+        args=(fn, nproc, node_rank, world_size, master_addr, master_port, args),
+        nprocs=nproc,
+        join=True,
+    )
+
+
+def read_parquet_shard(path, rank, world_size, columns=None):
+    """
+    parquet 파일을 rank 별로 나눠 읽습니다.
+    row group 이 프로세스 수보다 많으면 row group 단위로 나누어 자기 몫만 읽고,
+    그렇지 않으면 전체를 읽은 뒤 행 단위로 나눕니다.
+    """
+    parquet_file = pq.ParquetFile(path)
+    num_row_groups = parquet_file.num_row_groups
+    if num_row_groups >= world_size:
+        row_groups = list(range(rank, num_row_groups, world_size))
+        return parquet_file.read_row_groups(row_groups, columns=columns).to_pandas()
+
+    df = parquet_file.read(columns=columns).to_pandas()
+    return df.iloc[np.arange(rank, len(df), world_size)].reset_index(drop=True)
+
+
+def make_ddp_model(model, bucket_cap_mb=25):
+    """
+    DDP 는 그래디언트를 bucket_cap_mb 크기 버킷으로 묶어 역전파와 겹쳐 all-reduce 합니다.
+    sparse 임베딩 그래디언트는 gloo 의 sparse all-reduce 로 전송됩니다.
+    """
+    if not dist.is_initialized():
+        return model
+    return DistributedDataParallel(model, bucket_cap_mb=bucket_cap_mb)
+
+
+def make_optimizers(model, lr):
+    """ sparse 그래디언트 파라미터(임베딩)는 SparseAdam, 나머지는 Adam 으로 학습합니다. """
+    sparse_params, dense_params = [], []
+    for module in model.modules():
+        if isinstance(module, torch.nn.Embedding) and module.sparse:
+            sparse_params.extend(module.parameters(recurse=False))
+        else:
+            dense_params.extend(module.parameters(recurse=False))
+
+    optimizers = []
+    if sparse_params:
+        optimizers.append(torch.optim.SparseAdam(sparse_params, lr=lr))
+    if dense_params:
+        optimizers.append(torch.optim.Adam(dense_params, lr=lr))
+    return optimizers
+
+
+def all_reduce_scalar(value, op=dist.ReduceOp.SUM):
+    if not dist.is_initialized():
+        return value
+    tensor = torch.tensor(value, dtype=torch.float64)
+    dist.all_reduce(tensor, op=op)
+    return tensor.item()
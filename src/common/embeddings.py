@@ -0,0 +1,204 @@
+import os
+import logging
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """
+    유저/콘텐츠 임베딩 저장소.
+
+    NCF 의 GMF 임베딩(user_embedding, item_embedding)을 내보내 두고
+    콘텐츠 임베딩은 고정한 채 유저 벡터만 갱신하는 데 사용합니다.
+    점수는 유저 벡터와 콘텐츠 벡터의 내적입니다.
+    """
+    def __init__(self, user_ids, user_vectors, item_codes, item_vectors):
+        self.user_ids = np.asarray(user_ids)
+        self.user_vectors = np.asarray(user_vectors, dtype=np.float32)
+        self.item_codes = np.asarray(item_codes)
+        self.item_vectors = np.asarray(item_vectors, dtype=np.float32)
+        self.user_index = {user_id: row for row, user_id in enumerate(self.user_ids.tolist())}
+        self.item_index = {code: row for row, code in enumerate(self.item_codes.tolist())}
+
+    @property
+    def dim(self):
+        return self.item_vectors.shape[1]
+
+    @classmethod
+    def from_model(cls, model, user_ids, item_codes):
+        """ 학습된 모델의 임베딩 가중치로 저장소를 만듭니다. (행 순서 = user_ids / item_codes 순서) """
+        return cls(
+            user_ids=user_ids,
+            user_vectors=model.user_embedding.weight.detach().cpu().numpy(),
+            item_codes=item_codes,
+            item_vectors=model.item_embedding.weight.detach().cpu().numpy(),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data["user_ids"], data["user_vectors"], data["item_codes"], data["item_vectors"]
+            )
+
+    def save(self, path):
+        """ 임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 쓰다 만 파일을 보지 않습니다. """
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            user_ids=self.user_ids,
+            user_vectors=self.user_vectors,
+            item_codes=self.item_codes,
+            item_vectors=self.item_vectors,
+        )
+        os.replace(tmp_path, path)
+
+    def user_rows(self, user_ids):
+        """ 유저 행 번호. 처음 보는 유저는 영벡터 행을 추가합니다. """
+        new_users = [
+            user_id for user_id in dict.fromkeys(np.asarray(user_ids).tolist())
+            if user_id not in self.user_index
+        ]
+        if new_users:
+            start = len(self.user_ids)
+            self.user_index.update({user_id: start + i for i, user_id in enumerate(new_users)})
+            self.user_ids = np.concatenate([self.user_ids, np.asarray(new_users)])
+            self.user_vectors = np.concatenate([
+                self.user_vectors, np.zeros((len(new_users), self.dim), dtype=np.float32)
+            ])
+            logging.info(f"new users : {len(new_users)}")
+        return np.array([self.user_index[user_id] for user_id in np.asarray(user_ids).tolist()])
+
+    def item_rows(self, item_codes):
+        """ 콘텐츠 행 번호. 임베딩이 없는 콘텐츠는 -1 """
+        return np.array([self.item_index.get(code, -1) for code in np.asarray(item_codes).tolist()])
+
+
+def fold_in_sgd(
+    user_vectors,
+    item_vectors,
+    pair_users,
+    pair_items,
+    weights=None,
+    steps=5,
+    learning_rate=0.05,
+    reg=0.01,
+    negatives=4,
+    seed=0
+):
+    """
+    콘텐츠 벡터를 고정하고 유저 벡터만 몇 번의 경사 하강으로 갱신합니다.
+
+    시청한 (유저, 콘텐츠) 쌍은 1, 유저별로 무작위 추출한 콘텐츠는 0 을 목표로
+    가중 제곱 오차 + L2 정규화를 최소화합니다. 모든 쌍을 한 번에 배열 연산으로 계산합니다.
+
+    :param user_vectors: (유저 수, dim) 갱신할 유저 벡터 (복사본을 반환합니다)
+    :param pair_users: 쌍의 user_vectors 행 번호
+    :param pair_items: 쌍의 item_vectors 행 번호
+    :param weights: 쌍별 가중치 (기본 1)
+    :return: (갱신된 user_vectors, 첫 스텝 손실, 마지막 스텝 손실)
+    """
+    rng = np.random.default_rng(seed)
+    user_vectors = np.array(user_vectors, dtype=np.float32)
+    weights = np.ones(len(pair_users), dtype=np.float32) if weights is None \
+        else np.asarray(weights, dtype=np.float32)
+
+    negative_users = np.repeat(pair_users, negatives)
+    users = np.concatenate([pair_users, negative_users])
+    items = np.concatenate([
+        pair_items, rng.integers(0, len(item_vectors), size=len(negative_users))
+    ])
+    labels = np.concatenate([
+        np.ones(len(pair_users), dtype=np.float32),
+        np.zeros(len(negative_users), dtype=np.float32),
+    ])
+    pair_weights = np.concatenate([weights, np.repeat(weights, negatives)])
+
+    touched, inverse = np.unique(users, return_inverse=True)
+    pair_counts = np.bincount(inverse, minlength=len(touched)).astype(np.float32)
+    item_matrix = item_vectors[items]
+
+    losses = []
+    for _ in range(steps):
+        vectors = user_vectors[touched]
+        errors = (vectors[inverse] * item_matrix).sum(axis=1) - labels
+        losses.append(float((pair_weights * errors ** 2).mean()))
+
+        grads = np.zeros_like(vectors)
+        np.add.at(grads, inverse, (pair_weights * errors)[:, None] * item_matrix)
+        grads = grads / pair_counts[:, None] + reg * vectors
+        user_vectors[touched] = vectors - learning_rate * grads
+
+    return user_vectors, losses[0], losses[-1]
+
+
+def fold_in_least_squares(
+    item_vectors,
+    pair_users,
+    pair_items,
+    num_users,
+    weights=None,
+    reg=0.1,
+    alpha=1.0,
+    batch_size=4096
+):
+    """
+    콘텐츠 벡터를 고정하고 유저 벡터를 implicit ALS 의 유저 단계 닫힌 해로 구합니다.
+
+        (VᵀV + V_uᵀ C_u V_u + reg·I) x_u = V_uᵀ (1 + C_u) 1,   C_u = alpha · weights
+
+    VᵀV 는 모든 유저가 공유하므로 한 번만 계산하고, 유저별 항은 시청 수가 비슷한 유저끼리
+    batch_size 명씩 묶어 (유저 수, 최대 시청 수, dim) 으로 채운 뒤 배치 행렬곱과 배치 solve 로 계산합니다.
+
+    :param pair_users: 쌍의 유저 번호 (0 ~ num_users - 1)
+    :param pair_items: 쌍의 item_vectors 행 번호
+    :return: (num_users, dim) 유저 벡터. 시청 이력이 없는 유저는 영벡터
+    """
+    item_vectors = np.asarray(item_vectors, dtype=np.float32)
+    dim = item_vectors.shape[1]
+    weights = np.ones(len(pair_users), dtype=np.float32) if weights is None \
+        else np.asarray(weights, dtype=np.float32)
+
+    order = np.argsort(pair_users, kind="stable")
+    items = np.asarray(pair_items)[order]
+    confidence = alpha * weights[order]
+    counts = np.bincount(np.asarray(pair_users), minlength=num_users)
+    starts = np.cumsum(counts) - counts
+
+    shared = item_vectors.T @ item_vectors + reg * np.eye(dim, dtype=np.float32)
+    user_vectors = np.zeros((num_users, dim), dtype=np.float32)
+    # 시청 수 순으로 묶어 패딩을 줄입니다
+    users_by_count = np.argsort(counts, kind="stable")
+    users_by_count = users_by_count[counts[users_by_count] > 0]
+    for start in range(0, len(users_by_count), batch_size):
+        users = users_by_count[start:start + batch_size]
+        positions = np.arange(counts[users].max())
+        mask = positions < counts[users][:, None]
+        index = np.where(mask, starts[users][:, None] + positions, 0)
+
+        history = item_vectors[items[index]] * mask[..., None]
+        weighted = history * (confidence[index] * mask)[..., None]
+        a = shared + weighted.transpose(0, 2, 1) @ history
+        b = (history + weighted).sum(axis=1)
+        user_vectors[users] = np.linalg.solve(a, b[..., None])[..., 0]
+    return user_vectors
+
+
+def topk_items(user_vectors, item_vectors, k, batch_size=4096):
+    """
+    내적 점수 상위 k 개 콘텐츠.
+
+    :return: (행 번호 (유저 수, k), 점수 (유저 수, k)) 점수 내림차순
+    """
+    k = min(k, len(item_vectors))
+    indices, scores = [], []
+    for start in range(0, len(user_vectors), batch_size):
+        batch_scores = user_vectors[start:start + batch_size] @ item_vectors.T
+        top = np.argpartition(-batch_scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(batch_scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        indices.append(np.take_along_axis(top, order, axis=1))
+        scores.append(np.take_along_axis(top_scores, order, axis=1))
+    if not indices:
+        return np.empty((0, k), dtype=np.int64), np.empty((0, k), dtype=np.float32)
+    return np.concatenate(indices), np.concatenate(scores)
@@ -0,0 +1,187 @@
+import os
+import json
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+INTERACTION_STORE_DIR = "interactions"
+INTERACTION_STORE_VERSION = 1
+META_FILE = "meta.json"
+ARRAY_FILES = ["user_ids", "item_codes", "indptr", "indices", "weights"]
+
+
+def interaction_store_dir(dataset_dir):
+    """
+    전처리 결과 디렉토리 아래 상호작용 저장소 경로.
+    아직 어떤 태스크도 이 저장소를 만들거나 읽지 않으며 benchmark/interaction_store.py 에서만 사용합니다.
+    (새 유저를 찾는 fold_in 도 현재 watch_log 를 직접 읽습니다)
+    """
+    return os.path.join(dataset_dir, INTERACTION_STORE_DIR)
+
+
+def _save_array(dst_dir, name, array):
+    tmp_path = os.path.join(dst_dir, f".{name}.npy")
+    np.save(tmp_path, array)
+    os.replace(tmp_path, os.path.join(dst_dir, f"{name}.npy"))
+
+
+def make_csr(df, user_col="user_id", item_col="contents_code", weight_col="watch_seconds"):
+    """
+    시청 로그로 유저 x 콘텐츠 CSR 배열을 만듭니다.
+
+    - user_ids / item_codes: 정렬된 ID 사전. 행/열 번호는 사전의 위치입니다.
+    - indptr / indices / weights: 유저 행별 콘텐츠 열 번호와 가중치(같은 쌍은 합산)
+    """
+    user_ids, users = np.unique(df[user_col].to_numpy(), return_inverse=True)
+    item_codes, items = np.unique(df[item_col].to_numpy(), return_inverse=True)
+    weights = df[weight_col].to_numpy(dtype=np.float32) if weight_col \
+        else np.ones(len(df), dtype=np.float32)
+
+    # (유저, 콘텐츠) 쌍 단위로 합산하고 유저 -> 콘텐츠 순으로 정렬합니다
+    keys, inverse = np.unique(
+        users.astype(np.int64) * len(item_codes) + items, return_inverse=True
+    )
+    weights = np.bincount(inverse, weights=weights, minlength=len(keys)).astype(np.float32)
+    rows = keys // len(item_codes)
+    indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(user_ids)), out=indptr[1:])
+    return {
+        "user_ids": user_ids,
+        "item_codes": item_codes,
+        "indptr": indptr,
+        "indices": (keys % len(item_codes)).astype(np.int32),
+        "weights": weights,
+    }
+
+
+def build_interaction_store(df, dst_dir, source=None, **columns):
+    """
+    make_csr 배열을 dst_dir 에 .npy 로 저장합니다.
+    meta.json 은 배열을 모두 쓴 뒤 마지막에 쓰므로 meta.json 이 있으면 완성된 저장소입니다.
+
+    :param columns: make_csr 의 user_col / item_col / weight_col
+    :return: meta
+    """
+    os.makedirs(dst_dir, exist_ok=True)
+    meta_path = os.path.join(dst_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    arrays = make_csr(df, **columns)
+    for name, array in arrays.items():
+        _save_array(dst_dir, name, array)
+
+    meta = {
+        "version": INTERACTION_STORE_VERSION,
+        "num_users": int(len(arrays["user_ids"])),
+        "num_items": int(len(arrays["item_codes"])),
+        "nnz": int(len(arrays["indices"])),
+        "source": source,
+        "created_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    tmp_path = os.path.join(dst_dir, f".{META_FILE}")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, meta_path)
+    logging.info(f"interaction store : {dst_dir} {meta}")
+    return meta
+
+
+class InteractionStore:
+    """
+    build_interaction_store 로 만든 저장소를 읽습니다.
+
+    기본값 mmap_mode="r" 은 배열을 메모리 맵으로 열기만 하므로 로딩은 파일 크기와 무관하고
+    실제로 접근한 페이지만 메모리에 올라갑니다. (같은 파일을 여는 프로세스끼리 페이지 캐시를 공유합니다)
+    """
+    def __init__(self, store_dir, mmap_mode="r"):
+        meta_path = os.path.join(store_dir, META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"완성된 상호작용 저장소가 아닙니다 : {store_dir}")
+        with open(meta_path, "r") as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != INTERACTION_STORE_VERSION:
+            raise ValueError(
+                f"지원하지 않는 저장소 버전입니다 : {self.meta['version']} "
+                f"(지원 {INTERACTION_STORE_VERSION})"
+            )
+
+        self.store_dir = store_dir
+        for name in ARRAY_FILES:
+            setattr(
+                self, name, np.load(os.path.join(store_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+            )
+
+    @property
+    def num_users(self):
+        return self.meta["num_users"]
+
+    @property
+    def num_items(self):
+        return self.meta["num_items"]
+
+    @property
+    def nnz(self):
+        return self.meta["nnz"]
+
+    @staticmethod
+    def _lookup(vocab, values):
+        values = np.asarray(values)
+        positions = np.searchsorted(vocab, values)
+        found = positions < len(vocab)
+        found[found] = vocab[positions[found]] == values[found]
+        return np.where(found, positions, -1)
+
+    def user_rows(self, user_ids):
+        """ 유저 행 번호. 없는 유저는 -1 """
+        return self._lookup(self.user_ids, user_ids)
+
+    def item_rows(self, item_codes):
+        """ 콘텐츠 열 번호. 없는 콘텐츠는 -1 """
+        return self._lookup(self.item_codes, item_codes)
+
+    def items_of(self, row):
+        """ :return: (콘텐츠 열 번호, 가중치) 배열 뷰 (복사하지 않습니다) """
+        start, stop = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:stop], self.weights[start:stop]
+
+    def iter_batches(self, batch_size=10000):
+        """ :return: 유저 batch_size 명씩 (행 번호 시작, indptr 조각, indices 조각, weights 조각) """
+        for start in range(0, self.num_users, batch_size):
+            stop = min(start + batch_size, self.num_users)
+            lo, hi = self.indptr[start], self.indptr[stop]
+            yield (
+                start,
+                np.asarray(self.indptr[start:stop + 1]) - lo,
+                self.indices[lo:hi],
+                self.weights[lo:hi],
+            )
+
+    def to_coo(self, rows=None):
+        """
+        :param rows: 가져올 유저 행 번호 (기본 전체)
+        :return: (유저 행 번호, 콘텐츠 열 번호, 가중치)
+        """
+        if rows is None:
+            counts = np.diff(self.indptr)
+            return np.repeat(np.arange(self.num_users), counts), \
+                np.asarray(self.indices), np.asarray(self.weights)
+
+        rows = np.asarray(rows)
+        starts, stops = self.indptr[rows], self.indptr[rows + 1]
+        counts = stops - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + offsets
+        return np.repeat(rows, counts), self.indices[positions], self.weights[positions]
+
+    def to_frame(self, rows=None):
+        """ 시청 로그 형태 (user_id, contents_code, watch_seconds) DataFrame """
+        users, items, weights = self.to_coo(rows)
+        return pd.DataFrame({
+            "user_id": self.user_ids[users],
+            "contents_code": self.item_codes[items],
+            "watch_seconds": weights,
+        })
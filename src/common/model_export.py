@@ -0,0 +1,121 @@
+import os
+import json
+import logging
+
+import numpy as np
+import torch
+from torch import nn
+
+
+INFERENCE_MODEL_FILE = "model.torchscript.pt"
+INFERENCE_META_FILE = "model.torchscript.json"
+EXPORT_FORMATS = ["eager", "torchscript", "torchscript_int8"]
+
+
+def to_torchscript(model, example_inputs, quantize=False):
+    """
+    추론용 TorchScript 모델을 만듭니다.
+
+    - quantize: Linear 계층을 동적 int8 양자화합니다 (가중치 int8, 활성값은 실행 시 양자화)
+    - freeze: 파라미터를 상수로 고정해 상수 폴딩 등 그래프 최적화를 적용합니다
+    """
+    model = model.eval()
+    if quantize:
+        model = torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example_inputs)
+    return torch.jit.freeze(traced)
+
+
+def score_topk(model, user_ids, num_items, k, batch_size=256):
+    """ 유저별 전체 콘텐츠 점수 상위 k 개의 인덱스 (유저 수, k) """
+    items = torch.arange(num_items)
+    result = []
+    with torch.no_grad():
+        for start in range(0, len(user_ids), batch_size):
+            users = torch.as_tensor(user_ids[start:start + batch_size])
+            scores = model(
+                users.repeat_interleave(num_items),
+                items.repeat(len(users)),
+            ).view(len(users), num_items)
+            result.append(torch.topk(scores, k, dim=1).indices.numpy())
+    return np.concatenate(result)
+
+
+def topk_overlap(reference, candidate):
+    """ 두 top-K 인덱스 행렬의 유저별 교집합 비율 평균 """
+    k = reference.shape[1]
+    matched = (reference[:, :, None] == candidate[:, None, :]).any(axis=2)
+    return float(matched.sum(axis=1).mean() / k)
+
+
+def export_inference_model(
+    model,
+    model_dir,
+    num_users,
+    num_items,
+    export_format="torchscript_int8",
+    top_k=16,
+    num_check_users=256,
+    min_topk_overlap=0.9,
+    seed=0
+):
+    """
+    학습된 fp32 모델과 함께 추론용 TorchScript 아티팩트를 저장합니다.
+
+    int8 양자화 모델의 top-K 겹침 비율이 min_topk_overlap 미만이면
+    양자화 없이 fp32 TorchScript 로 저장합니다.
+    이 트리에는 학습/추론 태스크가 없어 아직 benchmark/inference_export.py 만 호출합니다.
+    태스크에 연결할 때 export_format, min_topk_overlap 인자를 함께 추가합니다.
+
+    :return: 저장한 메타데이터. eager 면 None
+    """
+    if export_format == "eager":
+        return None
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다 : {export_format}")
+
+    rng = np.random.default_rng(seed)
+    check_users = rng.choice(num_users, size=min(num_check_users, num_users), replace=False)
+    example_inputs = (torch.zeros(num_items, dtype=torch.long), torch.arange(num_items))
+    reference = score_topk(model.eval(), check_users, num_items, top_k)
+
+    quantize = export_format == "torchscript_int8"
+    exported = to_torchscript(model, example_inputs, quantize=quantize)
+    overlap = topk_overlap(reference, score_topk(exported, check_users, num_items, top_k))
+    if quantize and overlap < min_topk_overlap:
+        logging.warning(
+            f"int8 top-{top_k} overlap {overlap:.4f} < {min_topk_overlap}, export fp32"
+        )
+        quantize = False
+        exported = to_torchscript(model, example_inputs)
+        overlap = topk_overlap(reference, score_topk(exported, check_users, num_items, top_k))
+
+    meta = {
+        "format": "torchscript_int8" if quantize else "torchscript",
+        "torch_version": torch.__version__,
+        "num_users": num_users,
+        "num_items": num_items,
+        "top_k": top_k,
+        "topk_overlap": overlap,
+    }
+    torch.jit.save(exported, os.path.join(model_dir, INFERENCE_MODEL_FILE))
+    with open(os.path.join(model_dir, INFERENCE_META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    logging.info(f"export inference model : {meta}")
+    return meta
+
+
+def load_inference_model(model_dir):
+    """
+    model_dir 에 추론용 TorchScript 아티팩트가 있으면 불러옵니다.
+    없으면 None 을 반환하며, 호출하는 쪽은 기존 eager 모델을 사용합니다.
+    """
+    path = os.path.join(model_dir, INFERENCE_MODEL_FILE)
+    if not os.path.exists(path):
+        return None
+
+    model = torch.jit.load(path, map_location="cpu")
+    model.eval()
+    logging.info(f"load inference model : {path}")
+    return model
@@ -0,0 +1,119 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+
+
+MB = 1024 * 1024
+
+
+def parse_s3_uri(s3_uri):
+    """ s3://bucket/prefix -> (bucket, prefix) """
+    if not s3_uri.startswith("s3://"):
+        raise ValueError(f"S3 경로가 아닙니다 : {s3_uri}")
+    bucket, _, prefix = s3_uri[len("s3://"):].partition("/")
+    return bucket, prefix
+
+
+def shard_keys(keys, shard_index=0, shard_count=1):
+    """
+    ShardedByS3Key 와 같이 키를 정렬한 뒤 인스턴스별로 나눕니다.
+    """
+    return sorted(keys)[shard_index::shard_count]
+
+
+class S3Stager:
+    """
+    S3 prefix 와 로컬 디렉터리 사이의 동시 multipart 전송.
+
+    - 파일 단위 병렬: file_concurrency 개 파일을 동시에 전송합니다.
+    - 파일 내부 병렬: multipart_chunksize 단위로 max_concurrency 개 파트를 동시에 전송합니다.
+    boto3 기본값(8MB 파트, 파일당 10 스레드, 파일 순차 전송)은 작은 parquet 파일이 많은
+    데이터셋에서 요청 지연에 묶이므로 파일 단위 병렬을 함께 사용합니다.
+    """
+    def __init__(
+        self,
+        s3_client=None,
+        multipart_chunksize_mb=16,
+        max_concurrency=8,
+        file_concurrency=8,
+        aws_region="ap-northeast-2"
+    ):
+        self.s3 = s3_client or boto3.client("s3", region_name=aws_region)
+        self.file_concurrency = file_concurrency
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_chunksize_mb * MB,
+            multipart_chunksize=multipart_chunksize_mb * MB,
+            max_concurrency=max_concurrency,
+            use_threads=max_concurrency > 1,
+        )
+
+    def list_objects(self, s3_uri):
+        bucket, prefix = parse_s3_uri(s3_uri)
+        paginator = self.s3.get_paginator("list_objects_v2")
+        return {
+            obj["Key"]: obj["Size"]
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+            if not obj["Key"].endswith("/")
+        }
+
+    def _transfer_all(self, transfer, jobs):
+        started_at = time.perf_counter()
+        first_ready_seconds = None
+        total_bytes = 0
+        with ThreadPoolExecutor(max_workers=self.file_concurrency) as executor:
+            for size in executor.map(lambda job: transfer(*job), jobs):
+                if first_ready_seconds is None:
+                    first_ready_seconds = time.perf_counter() - started_at
+                total_bytes += size
+
+        seconds = time.perf_counter() - started_at
+        stats = {
+            "files": len(jobs),
+            "bytes": total_bytes,
+            "seconds": round(seconds, 4),
+            "first_file_seconds": round(first_ready_seconds or 0.0, 4),
+            "mb_per_second": round(total_bytes / MB / seconds, 2) if seconds else None,
+        }
+        logging.info(f"s3 staging : {stats}")
+        return stats
+
+    def download_prefix(self, s3_uri, local_dir, shard_index=0, shard_count=1):
+        """
+        s3_uri 아래 객체 중 현재 인스턴스 몫(shard_index)을 local_dir 로 내려받습니다.
+        :return: 전송 통계
+        """
+        bucket, prefix = parse_s3_uri(s3_uri)
+        objects = self.list_objects(s3_uri)
+        keys = shard_keys(objects, shard_index=shard_index, shard_count=shard_count)
+
+        def download(key, size):
+            path = os.path.join(local_dir, os.path.relpath(key, prefix) if prefix else key)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.s3.download_file(bucket, key, path, Config=self.transfer_config)
+            return size
+
+        return self._transfer_all(download, [(key, objects[key]) for key in keys])
+
+    def upload_dir(self, local_dir, s3_uri):
+        """ local_dir 의 파일을 s3_uri 아래로 같은 상대 경로로 올립니다. """
+        bucket, prefix = parse_s3_uri(s3_uri)
+        jobs = []
+        for root, _, files in os.walk(local_dir):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                key = "/".join(
+                    part for part in [prefix.rstrip("/"), os.path.relpath(path, local_dir)]
+                    if part
+                ).replace("\\", "/")
+                jobs.append((path, key))
+
+        def upload(path, key):
+            self.s3.upload_file(path, bucket, key, Config=self.transfer_config)
+            return os.path.getsize(path)
+
+        return self._transfer_all(upload, jobs)
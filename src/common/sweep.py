@@ -0,0 +1,37 @@
+import os
+import json
+import logging
+
+
+# 하이퍼파라미터 탐색(sweep_controller.py)이 조기 종료 판단에 사용하는 중간 지표
+SWEEP_METRICS = ["valid_loss", "valid_ndcg"]
+NUMBER_PATTERN = r"([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)"
+
+
+def metric_definitions(names=SWEEP_METRICS):
+    """ 학습 로그의 "name=value" 를 CloudWatch 지표로 수집하기 위한 Estimator metric_definitions """
+    return [{"Name": name, "Regex": f"{name}={NUMBER_PATTERN}"} for name in names]
+
+
+class TrialReporter:
+    """
+    에폭별 검증 지표를 보고합니다.
+
+    - 로그에 "epoch=3 valid_loss=0.41 valid_ndcg=0.23" 형태로 남깁니다. (SageMaker 는 metric_definitions 로 수집)
+    - metrics_path 가 있으면 JSON lines 로도 기록합니다. (로컬 실행은 sweep_controller 가 이 파일을 읽습니다)
+    """
+    def __init__(self, metrics_path=None):
+        self.metrics_path = metrics_path
+        if metrics_path:
+            os.makedirs(os.path.dirname(os.path.abspath(metrics_path)), exist_ok=True)
+
+    def report(self, epoch, **metrics):
+        logging.info(" ".join(
+            [f"epoch={epoch}"] + [f"{name}={value:.6f}" for name, value in metrics.items()]
+        ))
+        if not self.metrics_path:
+            return
+        with open(self.metrics_path, "a") as f:
+            f.write(json.dumps({"epoch": epoch, **metrics}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
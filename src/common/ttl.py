@@ -0,0 +1,87 @@
+import hashlib
+import logging
+
+import numpy as np
+
+
+HOUR = 3600
+
+
+class TTLExpiryBurstError(Exception):
+    pass
+
+
+def jitter_offset(key, jitter_seconds):
+    """
+    키별로 고정된 [0, jitter_seconds) 오프셋.
+    같은 유저는 매 실행 같은 시간대에 만료되므로 실행마다 만료 분포가 흔들리지 않습니다.
+    """
+    if jitter_seconds <= 0:
+        return 0
+    digest = hashlib.md5(str(key).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % int(jitter_seconds)
+
+
+def max_expiry_ratio(ttls, window_seconds=HOUR):
+    """ 임의의 window_seconds 구간에 만료되는 아이템 비율의 최댓값과 구간 시작 시각 """
+    ttls = np.sort(np.asarray(ttls, dtype=np.int64))
+    if len(ttls) == 0:
+        return 0.0, None
+    counts = np.searchsorted(ttls, ttls + window_seconds, side="left") - np.arange(len(ttls))
+    peak = int(np.argmax(counts))
+    return float(counts[peak] / len(ttls)), int(ttls[peak])
+
+
+class TTLPolicy:
+    """
+    추천 아이템 TTL 정책.
+
+    - ttl_seconds + 키별 결정적 지터(jitter_seconds) 로 만료 시각을 분산합니다.
+    - 이번 실행에서 다시 쓰지 않은 아이템은 stale_extend_seconds 만큼 남도록 연장합니다.
+      (생성 후 ttl_seconds + stale_extend_seconds 까지만)
+    - 한 시간 구간에 max_expiry_ratio_per_hour 보다 많은 아이템이 만료되면 기록을 거부합니다.
+    """
+    def __init__(
+        self,
+        ttl_seconds=3600 * 24 * 3,
+        jitter_seconds=0,
+        stale_extend_seconds=0,
+        max_expiry_ratio_per_hour=1.0
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.jitter_seconds = jitter_seconds
+        self.stale_extend_seconds = stale_extend_seconds
+        self.max_expiry_ratio_per_hour = max_expiry_ratio_per_hour
+
+    def ttl_for(self, key, now_ts):
+        return int(now_ts) + self.ttl_seconds + jitter_offset(key, self.jitter_seconds)
+
+    def extended_ttl(self, key, ttl, created_ts, now_ts):
+        """
+        다시 쓰지 않은 아이템의 연장된 TTL. 연장이 필요 없으면 None.
+        생성 후 ttl_seconds + stale_extend_seconds 가 지난 아이템은 더 연장하지 않으므로
+        결과에서 계속 빠지는 유저의 아이템은 결국 만료됩니다.
+        """
+        if self.stale_extend_seconds <= 0:
+            return None
+        if created_ts is not None and \
+                now_ts - created_ts > self.ttl_seconds + self.stale_extend_seconds:
+            return None
+        target = int(now_ts) + self.stale_extend_seconds \
+            + jitter_offset(key, self.jitter_seconds)
+        return target if ttl is None or int(ttl) < target else None
+
+    def assign(self, items, now_ts):
+        for item in items:
+            item["TTL"] = self.ttl_for(item["PK"], now_ts)
+        return items
+
+    def check_expiry_burst(self, ttls):
+        ratio, window_start = max_expiry_ratio(ttls)
+        logging.info(f"max expiry ratio per hour : {ratio:.4f} (from {window_start})")
+        if ratio > self.max_expiry_ratio_per_hour:
+            raise TTLExpiryBurstError(
+                f"한 시간 안에 {ratio:.2%} 의 아이템이 만료됩니다 "
+                f"(허용 {self.max_expiry_ratio_per_hour:.2%}, 시작 {window_start})"
+            )
+        return ratio
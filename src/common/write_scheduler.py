@@ -0,0 +1,157 @@
+import json
+import time
+import math
+import hashlib
+import logging
+from decimal import Decimal
+from collections import deque
+
+
+BATCH_WRITE_MAX_ITEMS = 25
+WCU_ITEM_BYTES = 1024
+
+
+def item_key(item):
+    return item["PK"], item.get("SK")
+
+
+def dedupe_items(items):
+    """ (PK, SK) 가 같은 아이템은 마지막 아이템만 남깁니다. """
+    return list({item_key(item): item for item in items}.values())
+
+
+def partition_bucket(pk, num_buckets):
+    """
+    DynamoDB 는 파티션 키 해시로 파티션을 정합니다. 실제 해시 함수는 공개되어 있지 않으므로
+    균등한 해시로 파티션 배치를 추정합니다.
+    """
+    digest = hashlib.md5(str(pk).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_buckets
+
+
+def estimate_wcu(item):
+    """ 아이템 크기 1KB 당 1 WCU """
+    size = len(json.dumps(item, default=str).encode("utf-8"))
+    return max(1, math.ceil(size / WCU_ITEM_BYTES))
+
+
+def interleave_batches(items, num_buckets, batch_size=BATCH_WRITE_MAX_ITEMS):
+    """
+    아이템을 추정 파티션 버킷별로 나눈 뒤 버킷을 돌아가며 하나씩 꺼내 배치를 만듭니다.
+    연속한 배치가 같은 파티션에 몰리지 않고 모든 파티션에 고르게 분산됩니다.
+    """
+    buckets = {}
+    for item in items:
+        buckets.setdefault(partition_bucket(item["PK"], num_buckets), deque()).append(item)
+
+    queues = deque(buckets.values())
+    batch = []
+    while queues:
+        queue = queues.popleft()
+        batch.append(queue.popleft())
+        if queue:
+            queues.append(queue)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class TokenBucket:
+    """ 초당 rate 만큼 채워지고 최대 capacity 까지 쌓이는 토큰 버킷 """
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens):
+        """ tokens 만큼 사용할 수 있을 때까지 기다립니다. :return: 기다린 시간 """
+        waited = 0.0
+        tokens = min(tokens, self.capacity)
+        self.refill()
+        # 부동소수점 오차로 아주 작은 대기가 반복되지 않도록 여유를 둡니다
+        while self.tokens + 1e-6 < tokens:
+            wait_seconds = (tokens - self.tokens) / self.rate
+            self.sleep(wait_seconds)
+            waited += wait_seconds
+            self.refill()
+        self.tokens -= tokens
+        return waited
+
+
+class WriteScheduler:
+    """
+    DynamoDB 대량 쓰기 스케줄러.
+
+    1. (PK, SK) 중복 제거 (한 배치에 같은 키가 있으면 BatchWriteItem 이 실패합니다)
+    2. 추정 파티션 버킷 라운드 로빈으로 배치 구성
+    3. 토큰 버킷으로 wcu_budget(초당 WCU) 이하로 전송
+    4. 처리되지 않은 아이템(UnprocessedItems)은 지수 백오프 후 재전송
+    """
+    def __init__(
+        self,
+        resource,
+        wcu_budget,
+        num_buckets=8,
+        max_backoff_seconds=5.0,
+        clock=time.monotonic,
+        sleep=time.sleep
+    ):
+        self.resource = resource
+        self.num_buckets = num_buckets
+        self.max_backoff_seconds = max_backoff_seconds
+        self.sleep = sleep
+        self.clock = clock
+        self.bucket = TokenBucket(wcu_budget, clock=clock, sleep=sleep)
+        self.stats = {}
+
+    def send(self, table_name, batch):
+        response = self.resource.batch_write_item(
+            RequestItems={table_name: [{"PutRequest": {"Item": item}} for item in batch]}
+        )
+        return [
+            request["PutRequest"]["Item"]
+            for request in response.get("UnprocessedItems", {}).get(table_name, [])
+        ]
+
+    def write(self, table_name, items):
+        started_at = self.clock()
+        items = [
+            json.loads(json.dumps(item, default=lambda value: value.item()), parse_float=Decimal)
+            for item in items
+        ]
+        unique_items = dedupe_items(items)
+        self.stats = {
+            "items": len(items),
+            "duplicates": len(items) - len(unique_items),
+            "requests": 0,
+            "throttled_items": 0,
+            "rate_limited_seconds": 0.0,
+        }
+
+        for batch in interleave_batches(unique_items, self.num_buckets):
+            attempt = 0
+            while batch:
+                self.stats["rate_limited_seconds"] += self.bucket.acquire(
+                    sum(estimate_wcu(item) for item in batch)
+                )
+                self.stats["requests"] += 1
+                batch = self.send(table_name, batch)
+                if batch:
+                    self.stats["throttled_items"] += len(batch)
+                    self.sleep(min(self.max_backoff_seconds, 0.05 * 2 ** attempt))
+                    attempt += 1
+
+        self.stats["seconds"] = round(self.clock() - started_at, 4)
+        self.stats["rate_limited_seconds"] = round(self.stats["rate_limited_seconds"], 4)
+        logging.info(f"scheduled write : {self.stats}")
+        return self.stats
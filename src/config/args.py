@@ -4,7 +4,58 @@ def parse_common_arguments(parser):
     parser.add_argument("--aws_region", type=str, default="ap-northeast-2")
     parser.add_argument("--instance_type", type=str, default="local")
     parser.add_argument("--use_spot", type=bool, default=False)
+    parser.add_argument("--instance_count", type=int, default=1)
+    parser.add_argument("--nproc", type=int, default=1)
+    parser.add_argument("--bucket_cap_mb", type=int, default=25)
+    parser.add_argument(
+        "--s3_input_mode", type=str, default="File", choices=["File", "Pipe", "FastFile"]
+    )
+    parser.add_argument(
+        "--s3_data_distribution",
+        type=str,
+        default="FullyReplicated",
+        choices=["FullyReplicated", "ShardedByS3Key"]
+    )
+    parser.add_argument(
+        "--s3_upload_mode", type=str, default="EndOfJob", choices=["EndOfJob", "Continuous"]
+    )
     parser.add_argument("--py_version", type=str, default="py38")
     parser.add_argument("--framework_version", type=str, default="1.12")
     parser.add_argument("--job_name", type=str, default="NoAssigned")
     parser.add_argument("--dependency_job_name", type=str, default="NoAssigned")
+    parser.add_argument("--checkpoint_dir", type=str, default="/opt/ml/checkpoints")
+    parser.add_argument("--sweep_trial_id", type=str, default=None)
+    parser.add_argument("--sweep_metrics_path", type=str, default=None)
+    parser.add_argument("--serve_popular_shard_count", type=int, default=1)
+    parser.add_argument("--serve_ddb_wcu_budget", type=int, default=0)
+    parser.add_argument("--serve_ddb_partition_buckets", type=int, default=8)
+    parser.add_argument("--serve_ttl_jitter_seconds", type=int, default=0)
+    parser.add_argument("--serve_ttl_stale_extend_seconds", type=int, default=0)
+    parser.add_argument("--serve_ttl_max_expiry_ratio_per_hour", type=float, default=1.0)
+    parser.add_argument("--eval_top_k", type=int, default=10)
+    parser.add_argument("--eval_chunk_size", type=int, default=10000)
+    parser.add_argument("--eval_holdout_path", type=str, default=None)
+    parser.add_argument("--eval_timestamp_column", type=str, default=None)
+    parser.add_argument("--eval_train_cutoff", type=str, default=None)
+    parser.add_argument("--refresh_spool_dir", type=str, default=None)
+    parser.add_argument("--refresh_embedding_path", type=str, default=None)
+    parser.add_argument("--refresh_max_files", type=int, default=100)
+    parser.add_argument("--refresh_poll_seconds", type=float, default=0)
+    parser.add_argument("--refresh_lease_seconds", type=float, default=600)
+    parser.add_argument("--refresh_top_k", type=int, default=16)
+    parser.add_argument("--refresh_sgd_steps", type=int, default=5)
+    parser.add_argument("--refresh_learning_rate", type=float, default=0.5)
+    parser.add_argument("--refresh_reg", type=float, default=0.01)
+    parser.add_argument("--refresh_negatives", type=int, default=4)
+    parser.add_argument("--fold_in_reg", type=float, default=0.1)
+    parser.add_argument("--fold_in_alpha", type=float, default=1.0)
+    parser.add_argument("--fold_in_top_k", type=int, default=16)
+    parser.add_argument("--fold_in_min_interactions", type=int, default=1)
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default="none",
+        choices=["none", "cprofile", "tracemalloc", "all"]
+    )
+    parser.add_argument("--profile_dir", type=str, default=None)
+    parser.add_argument("--emf_namespace", type=str, default=None)
@@ -30,3 +30,6 @@ class SageMakerMeta:
             model_name=args.model_name,
             base_date=self.base_datetime
         ).replace('\\', '/')
+        # 스팟 재시작은 같은 학습 작업 안에서 이 경로로 재개합니다.
+        # 재수행이나 하이퍼파라미터 탐색의 다른 시도는 작업명이 달라 이전 체크포인트를 이어받지 않습니다
+        self.s3_checkpoint_dst = f"{self.s3_output_dst}/checkpoints/{args.job_name}"
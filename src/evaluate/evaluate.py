@@ -0,0 +1,121 @@
+import os
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.utils import init_dirs
+from utils.profiler import profiler
+from evaluate.metrics import RankingMetrics, RelevanceIndex, topk_matrix
+from common.contracts import INFERENCE_RESULT, validate_parquet
+
+
+def split_by_cutoff(df, timestamp_column, cutoff):
+    """ 시청 로그를 학습 기준 시각(cutoff) 이전/이후로 (학습, 홀드아웃) 나눕니다. """
+    timestamps = pd.to_datetime(df[timestamp_column])
+    holdout = timestamps > pd.Timestamp(cutoff)
+    return df[~holdout], df[holdout]
+
+
+class WatchLogNCFEvaluation:
+    """
+    inference_result.snappy.parquet 의 추천 결과를 홀드아웃 시청 이력으로 평가합니다.
+
+    - 추천 결과는 eval_chunk_size 행씩 읽어 (행 수, K) 행렬로 만든 뒤 배열 연산으로 평가하므로
+      메모리 사용량은 전체 유저 수가 아닌 청크 크기에 비례합니다.
+    - 첫 행은 후처리와 같이 인기 콘텐츠(C#popular) 행으로 보고 모든 유저에 대한
+      기준선(Popular*) 지표로 평가합니다.
+    - 홀드아웃은 eval_holdout_path 이거나, 시청 로그의 eval_timestamp_column 이
+      eval_train_cutoff 이후인 행입니다. 학습/추론에 쓴 시청 로그를 임의로 나누면
+      모델이 이미 본 상호작용으로 평가하게 되므로 둘 다 없으면 실패합니다.
+    - handoff 에 추론 결과가 있으면 파일 대신 그 Arrow Table 을 청크로 나눠 평가합니다.
+    """
+    def __init__(self, args, handoff=None):
+        self.args = args
+        self.handoff = handoff
+        self.inference_result_path = os.path.join(
+            self.args.output_dir, "inference", INFERENCE_RESULT.file_name()
+        )
+        self.watch_log_path = os.path.join(
+            self.args.dataset_dir, f"{self.args.dataset_name}.csv"
+        )
+        self.dst = os.path.join(self.args.output_dir, "evaluate")
+        init_dirs(self.dst)
+
+    def load_watch_log(self):
+        columns = ["user_id", "contents_code"]
+        if self.args.eval_holdout_path:
+            df = pd.read_csv(self.watch_log_path, usecols=columns)
+            return df, pd.read_csv(self.args.eval_holdout_path, usecols=columns)
+        if self.args.eval_timestamp_column and self.args.eval_train_cutoff:
+            timestamp_column = self.args.eval_timestamp_column
+            df = pd.read_csv(self.watch_log_path, usecols=columns + [timestamp_column])
+            train_df, holdout_df = split_by_cutoff(
+                df, timestamp_column, self.args.eval_train_cutoff
+            )
+            if holdout_df.empty:
+                raise ValueError(
+                    f"{timestamp_column} > {self.args.eval_train_cutoff} 인 시청 로그가 없습니다"
+                )
+            return train_df[columns], holdout_df[columns]
+        raise ValueError(
+            "evaluate 에는 --eval_holdout_path 또는 "
+            "--eval_timestamp_column 과 --eval_train_cutoff 가 필요합니다"
+        )
+
+    def iter_topk(self):
+        """ :return: (user_id 배열, top-K 행렬) 청크 """
+        columns = ["user_id", "items"]
+        if self.handoff is not None and INFERENCE_RESULT.name in self.handoff.tables:
+            batches = self.handoff.get(INFERENCE_RESULT, columns=columns).to_batches(
+                max_chunksize=self.args.eval_chunk_size
+            )
+        else:
+            # 잘못된 items 컬럼은 데이터를 읽기 전에 footer 에서 걸러냅니다
+            validate_parquet(self.inference_result_path, INFERENCE_RESULT)
+            batches = pq.ParquetFile(self.inference_result_path).iter_batches(
+                batch_size=self.args.eval_chunk_size, columns=columns
+            )
+        for batch in batches:
+            yield (
+                batch.column("user_id").to_numpy(),
+                topk_matrix(batch.column("items"), self.args.eval_top_k),
+            )
+
+    def evaluate(self, index):
+        metrics = RankingMetrics(index, self.args.eval_top_k)
+        popular_metrics = RankingMetrics(index, self.args.eval_top_k)
+        popular_topk = None
+        for user_ids, topk in self.iter_topk():
+            if popular_topk is None:
+                popular_topk = topk[:1]
+                user_ids, topk = user_ids[1:], topk[1:]
+            metrics.update(user_ids, topk)
+            popular_metrics.update(
+                user_ids, np.broadcast_to(popular_topk, topk.shape)
+            )
+            profiler.count(rows=len(user_ids))
+
+        result = metrics.result()
+        result.update({
+            f"Popular{key}": value
+            for key, value in popular_metrics.result().items()
+            if key.startswith(("NDCG", "Recall"))
+        })
+        return result
+
+    def run(self):
+        with profiler.stage("load"):
+            train_df, holdout_df = self.load_watch_log()
+            index = RelevanceIndex(holdout_df, train_df)
+            profiler.count(rows=len(train_df) + len(holdout_df))
+
+        with profiler.stage("evaluate"):
+            result = self.evaluate(index)
+        logging.info(json.dumps(result, indent=2))
+
+        with open(os.path.join(self.dst, "metrics.json"), "w") as f:
+            json.dump(result, f, indent=2)
+        return result
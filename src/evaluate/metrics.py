@@ -0,0 +1,132 @@
+import numpy as np
+import pyarrow.compute as pc
+
+
+PAD = -1
+KEY_SHIFT = 32
+
+
+def make_keys(user_ids, codes):
+    """ (user_id, contents_code) 쌍을 정렬/검색 가능한 int64 키로 변환합니다. """
+    return (np.asarray(user_ids, dtype=np.int64) << KEY_SHIFT) | np.asarray(codes, dtype=np.int64)
+
+
+def lookup(sorted_keys, values, queries, default=0):
+    """ 정렬된 sorted_keys 에서 queries 를 찾아 values 를 반환합니다. 없으면 default. """
+    if len(sorted_keys) == 0:
+        return np.full(np.shape(queries), default, dtype=values.dtype), \
+            np.zeros(np.shape(queries), dtype=bool)
+    pos = np.searchsorted(sorted_keys, queries)
+    pos = np.minimum(pos, len(sorted_keys) - 1)
+    found = sorted_keys[pos] == queries
+    return np.where(found, values[pos], default), found
+
+
+def topk_matrix(items, k, code_field="code"):
+    """
+    inference_result 의 items(list<struct<code, score>>) 컬럼을
+    (행 수, k) 크기의 콘텐츠 코드 행렬로 변환합니다. 빈 칸은 PAD(-1) 입니다.
+    items 는 점수 내림차순으로 정렬되어 있다고 가정합니다.
+    """
+    num_rows = len(items)
+    matrix = np.full((num_rows, k), PAD, dtype=np.int64)
+    flat = pc.list_flatten(items)
+    if len(flat) == 0:
+        return matrix
+
+    parents = pc.list_parent_indices(items).to_numpy()
+    lengths = pc.list_value_length(items).fill_null(0).to_numpy()
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    positions = np.arange(len(parents)) - starts[parents]
+    codes = pc.struct_field(flat, code_field).to_numpy(zero_copy_only=False)
+
+    keep = positions < k
+    matrix[parents[keep], positions[keep]] = codes[keep]
+    return matrix
+
+
+class RelevanceIndex:
+    """ 홀드아웃 시청 이력(정답)과 학습 구간 인기도를 정렬 배열로 보관합니다. """
+    def __init__(self, holdout_df, train_df, user_col="user_id", code_col="contents_code"):
+        self.keys = np.unique(make_keys(holdout_df[user_col], holdout_df[code_col]))
+        self.users, self.num_relevant = np.unique(
+            self.keys >> KEY_SHIFT, return_counts=True
+        )
+
+        self.codes, self.popularity = np.unique(
+            train_df[code_col].to_numpy(dtype=np.int64), return_counts=True
+        )
+        catalog = np.union1d(self.codes, holdout_df[code_col].to_numpy(dtype=np.int64))
+        self.catalog_size = len(catalog)
+        self.mean_catalog_popularity = self.popularity.sum() / max(self.catalog_size, 1)
+
+    def relevant_counts(self, user_ids):
+        counts, _ = lookup(self.users, self.num_relevant, np.asarray(user_ids, dtype=np.int64))
+        return counts
+
+    def hits(self, user_ids, topk):
+        queries = make_keys(np.asarray(user_ids)[:, None], topk)
+        _, found = lookup(self.keys, self.keys, queries)
+        return found & (topk != PAD)
+
+    def item_popularity(self, topk):
+        popularity, _ = lookup(self.codes, self.popularity, topk)
+        return np.where(topk != PAD, popularity, 0)
+
+
+class RankingMetrics:
+    """
+    청크 단위로 누적하는 NDCG@K / Recall@K / coverage / 인기도 편향.
+
+    - NDCG@K: 이진 관련도, IDCG 는 min(K, 정답 수) 개가 상위에 있는 경우
+    - Recall@K: 적중 수 / min(K, 정답 수)
+    - coverage: 추천된 서로 다른 콘텐츠 수 / 카탈로그 크기
+    - popularity_bias: 추천 콘텐츠의 평균 인기도 / 카탈로그 평균 인기도
+    """
+    def __init__(self, index, k):
+        self.index = index
+        self.k = k
+        self.discounts = 1.0 / np.log2(np.arange(2, k + 2))
+        self.ideal = np.concatenate([[0.0], np.cumsum(self.discounts)])
+        self.ndcg_sum = 0.0
+        self.recall_sum = 0.0
+        self.num_users = 0
+        self.num_skipped_users = 0
+        self.popularity_sum = 0.0
+        self.num_recommended = 0
+        self.recommended_codes = np.empty(0, dtype=np.int64)
+
+    def update(self, user_ids, topk):
+        num_relevant = self.index.relevant_counts(user_ids)
+        evaluable = num_relevant > 0
+        self.num_skipped_users += int((~evaluable).sum())
+
+        user_ids, topk, num_relevant = \
+            np.asarray(user_ids)[evaluable], topk[evaluable], num_relevant[evaluable]
+        hits = self.index.hits(user_ids, topk)
+        num_ideal = np.minimum(num_relevant, self.k)
+
+        dcg = hits @ self.discounts
+        self.ndcg_sum += float((dcg / self.ideal[num_ideal]).sum())
+        self.recall_sum += float((hits.sum(axis=1) / num_ideal).sum())
+        self.num_users += len(user_ids)
+
+        self.popularity_sum += float(self.index.item_popularity(topk).sum())
+        self.num_recommended += int((topk != PAD).sum())
+        self.recommended_codes = np.union1d(
+            self.recommended_codes, np.unique(topk[topk != PAD])
+        )
+
+    def result(self):
+        num_users = max(self.num_users, 1)
+        avg_popularity = self.popularity_sum / max(self.num_recommended, 1)
+        return {
+            f"NDCG@{self.k}": self.ndcg_sum / num_users,
+            f"Recall@{self.k}": self.recall_sum / num_users,
+            "Coverage": len(self.recommended_codes) / max(self.index.catalog_size, 1),
+            "PopularityBias": float(
+                avg_popularity / max(self.index.mean_catalog_popularity, 1e-12)
+            ),
+            "EvaluatedUsers": self.num_users,
+            "SkippedUsers": self.num_skipped_users,
+        }
@@ -1,3 +1,7 @@
+from utils.profiler import profile_task
+
+
+@profile_task
 def run_postprocess_task(args, tasks):  # 함수 추가
     processor = tasks.get_process(args.task)
 
@@ -5,9 +9,36 @@ def run_postprocess_task(args, tasks):  # 함수 추가
     postprocess.run()
 
 
+@profile_task
+def run_evaluate_task(args, tasks):
+    processor = tasks.get_process(args.task)
+
+    evaluation = processor(args)
+    evaluation.run()
+
+
+@profile_task
+def run_refresh_task(args, tasks):
+    processor = tasks.get_process(args.task)
+
+    refresh = processor(args)
+    refresh.run()
+
+
+@profile_task
+def run_fold_in_task(args, tasks):
+    processor = tasks.get_process(args.task)
+
+    fold_in = processor(args)
+    fold_in.run()
+
+
 def main(args):
     # ...
     func_map = {
         …
         tasks.POST_PROCESS: run_postprocess_task,  # 추가
+        tasks.EVALUATE: run_evaluate_task,
+        tasks.REFRESH: run_refresh_task,
+        tasks.FOLD_IN: run_fold_in_task,
     }
@@ -1,14 +1,34 @@
+import os
 import sys
 import logging
 import datetime
 
+from sagemaker.inputs import TrainingInput
+from sagemaker.pytorch import PyTorch
 from sagemaker.pytorch.processing import PyTorchProcessor
 from sagemaker.processing import ProcessingInput, ProcessingOutput
 
 from config.args import parse_args
 from config.meta import Tasks
 from utils.utils import make_s3_dataset_path
+from common.sweep import metric_definitions
+from common.contracts import PREPARED_TRAIN_DATA
+from common.s3_staging import S3Stager
 from config.meta import SageMakerMeta
+def make_processing_input(args, source, destination):
+    # Processing 작업은 File/Pipe 모드만 지원하므로 FastFile 은 File 로 수행합니다
+    return ProcessingInput(
+        source=source,
+        destination=destination,
+        s3_input_mode="Pipe" if args.s3_input_mode == "Pipe" else "File",
+        s3_data_distribution_type=args.s3_data_distribution,
+    )
+def make_processing_output(args, source, destination):
+    return ProcessingOutput(
+        source=source,
+        destination=destination,
+        s3_upload_mode=args.s3_upload_mode,
+    )
 def run_prepare_train_data_task(args, sagemaker_meta):
     output_dst = make_s3_dataset_path(
         base_dir=sagemaker_meta.s3_input_dir,
@@ -26,7 +46,7 @@ def run_prepare_train_data_task(args, sagemaker_meta):
         code_location=sagemaker_meta.s3_output_dst,
         role=sagemaker_meta.sagemaker_role,
         instance_type=args.instance_type,
-        instance_count=1,
+        instance_count=args.instance_count,
         max_runtime_in_seconds=1 * 60 * 60,
     )
 
@@ -38,13 +58,15 @@ def run_prepare_train_data_task(args, sagemaker_meta):
             "--job_name", args.job_name
         ],
         inputs=[
-            ProcessingInput(
+            make_processing_input(
+                args,
                 source=f"{sagemaker_meta.s3_input_src}/{args.dataset_name}.csv",
                 destination=args.dataset_dir
             )
         ],
         outputs=[
-            ProcessingOutput(
+            make_processing_output(
+                args,
                 source=sagemaker_meta.train_dataset_dir,
                 destination=output_dst,
             )
@@ -64,7 +86,7 @@ def run_prepare_inference_data_task(args, sagemaker_meta):
         code_location=sagemaker_meta.s3_output_dst,
         role=sagemaker_meta.sagemaker_role,
         instance_type=args.instance_type,
-        instance_count=1,
+        instance_count=args.instance_count,
         max_runtime_in_seconds=1 * 60 * 60,
     )
     
@@ -76,16 +98,17 @@ def run_prepare_inference_data_task(args, sagemaker_meta):
             "--job_name", args.job_name
         ],
         inputs=[
-            ProcessingInput(
-                source=(
-                    f"{sagemaker_meta.s3_input_src}/"
-                    f"{args.dataset_name}_train_{args.model_name}.snappy.parquet"
+            make_processing_input(
+                args,
+                source=f"{sagemaker_meta.s3_input_src}/" + PREPARED_TRAIN_DATA.file_name(
+                    dataset_name=args.dataset_name, model_name=args.model_name
                 ),
                 destination=sagemaker_meta.train_dataset_dir
             )
         ],
         outputs=[
-            ProcessingOutput(
+            make_processing_output(
+                args,
                 source=sagemaker_meta.inference_dataset_dir,
                 destination=sagemaker_meta.s3_input_src,
             )
@@ -93,12 +116,184 @@ def run_prepare_inference_data_task(args, sagemaker_meta):
         job_name=args.job_name,
         wait=True,
     )
+def run_evaluate_task(args, sagemaker_meta):
+    inference_src = f"{sagemaker_meta.s3_output_dst}/inference"
+    output_dst = f"{sagemaker_meta.s3_output_dst}/evaluate"
+
+    logging.info(f"input_src : {sagemaker_meta.s3_input_src}, {inference_src}")
+    logging.info(f"output_dst : {output_dst}")
+    pytorch_processor = PyTorchProcessor(
+        framework_version=args.framework_version,
+        py_version=args.py_version,
+        code_location=sagemaker_meta.s3_output_dst,
+        role=sagemaker_meta.sagemaker_role,
+        instance_type=args.instance_type,
+        instance_count=args.instance_count,
+        max_runtime_in_seconds=1 * 60 * 60,
+    )
+
+    arguments = sys.argv[1:] + [
+        "--dataset_dir", args.dataset_dir,
+        "--output_dir", args.output_dir,
+        "--job_name", args.job_name
+    ]
+    inputs = [
+        make_processing_input(
+            args,
+            source=f"{sagemaker_meta.s3_input_src}/{args.dataset_name}.csv",
+            destination=args.dataset_dir
+        ),
+        make_processing_input(
+            args,
+            source=inference_src,
+            destination=sagemaker_meta.inference_output_dir
+        ),
+    ]
+    if args.eval_holdout_path and args.eval_holdout_path.startswith("s3://"):
+        # S3 의 홀드아웃 파일을 컨테이너로 내려받아 로컬 경로로 넘깁니다
+        holdout_dir = "/opt/ml/processing/holdout"
+        inputs.append(
+            make_processing_input(args, source=args.eval_holdout_path, destination=holdout_dir)
+        )
+        arguments += [
+            "--eval_holdout_path",
+            os.path.join(holdout_dir, os.path.basename(args.eval_holdout_path)),
+        ]
+
+    pytorch_processor.run(
+        code="main.py",
+        source_dir=".",
+        arguments=arguments,
+        inputs=inputs,
+        outputs=[
+            make_processing_output(
+                args,
+                source=f"{args.output_dir}/evaluate",
+                destination=output_dst,
+            )
+        ],
+        job_name=args.job_name,
+        wait=True,
+    )
+def run_fold_in_task(args, sagemaker_meta):
+    inference_src = f"{sagemaker_meta.s3_output_dst}/inference"
+    embedding_src = f"{sagemaker_meta.s3_output_dst}/embeddings"
+    # 학습이 임베딩을 내보내지 않았다면 입력 경로가 없어 작업이 실패하므로 건너뜁니다
+    if not S3Stager().list_objects(embedding_src):
+        logging.info(f"skip fold_in : no embeddings in {embedding_src}")
+        return
+
+    logging.info(f"input_src : {sagemaker_meta.s3_input_src}, {inference_src}, {embedding_src}")
+    logging.info(f"output_dst : {inference_src}")
+    pytorch_processor = PyTorchProcessor(
+        framework_version=args.framework_version,
+        py_version=args.py_version,
+        code_location=sagemaker_meta.s3_output_dst,
+        role=sagemaker_meta.sagemaker_role,
+        instance_type=args.instance_type,
+        instance_count=args.instance_count,
+        max_runtime_in_seconds=1 * 60 * 60,
+    )
+
+    # 새 유저의 top-K 를 덧붙인 추론 결과로 같은 경로를 덮어씁니다
+    pytorch_processor.run(
+        code="main.py",
+        source_dir=".",
+        arguments=sys.argv[1:] + [
+            "--dataset_dir", args.dataset_dir,
+            "--output_dir", args.output_dir,
+            "--refresh_embedding_path", f"{args.model_dir}/embeddings.npz",
+            "--job_name", args.job_name
+        ],
+        inputs=[
+            make_processing_input(
+                args,
+                source=f"{sagemaker_meta.s3_input_src}/{args.dataset_name}.csv",
+                destination=args.dataset_dir
+            ),
+            make_processing_input(
+                args,
+                source=inference_src,
+                destination=sagemaker_meta.inference_output_dir
+            ),
+            make_processing_input(
+                args,
+                source=embedding_src,
+                destination=args.model_dir
+            ),
+        ],
+        outputs=[
+            make_processing_output(
+                args,
+                source=sagemaker_meta.inference_output_dir,
+                destination=inference_src,
+            )
+        ],
+        job_name=args.job_name,
+        wait=True,
+    )
+def argv_to_hyperparameters(argv):
+    """ ["--key", "value", ...] 형태의 인자를 Estimator hyperparameters 로 변환합니다. """
+    return {
+        argv[i].lstrip("-"): argv[i + 1]
+        for i in range(0, len(argv) - 1, 2)
+        if argv[i].startswith("--")
+    }
+def run_train_task(args, sagemaker_meta):
+    input_src = make_s3_dataset_path(
+        base_dir=sagemaker_meta.s3_input_dir,
+        dataset_name=args.dataset_name,
+        dataset_version=args.dataset_version,
+        base_date=sagemaker_meta.base_datetime
+    ).replace('\\', '/')
+
+    logging.info(f"input_src : {input_src}")
+    logging.info(f"checkpoint : {args.checkpoint_dir} <-> {sagemaker_meta.s3_checkpoint_dst}")
+    logging.info(f"output_dst : {sagemaker_meta.s3_output_dst}")
+
+    # 스팟 회수 시 SageMaker 가 checkpoint_local_path 를 S3 와 동기화하고
+    # 재시작된 컨테이너에 다시 내려받으므로 학습은 마지막 체크포인트부터 재개됩니다
+    estimator = PyTorch(
+        entry_point="main.py",
+        source_dir=".",
+        framework_version=args.framework_version,
+        py_version=args.py_version,
+        code_location=sagemaker_meta.s3_output_dst,
+        output_path=sagemaker_meta.s3_output_dst,
+        role=sagemaker_meta.sagemaker_role,
+        instance_type=args.instance_type,
+        # 각 인스턴스는 common.distributed.launch 로 nproc 개의 gloo 프로세스를 띄웁니다
+        instance_count=args.instance_count,
+        hyperparameters=argv_to_hyperparameters(sys.argv[1:] + [
+            "--job_name", args.job_name,
+            "--checkpoint_dir", args.checkpoint_dir,
+        ]),
+        use_spot_instances=args.use_spot and not sagemaker_meta.is_local_mode,
+        max_run=2 * 60 * 60,
+        max_wait=4 * 60 * 60 if args.use_spot else None,
+        checkpoint_s3_uri=sagemaker_meta.s3_checkpoint_dst,
+        checkpoint_local_path=args.checkpoint_dir,
+        # 에폭별 검증 지표를 CloudWatch 로 수집합니다 (sweep_controller 조기 종료 판단에 사용)
+        metric_definitions=metric_definitions(),
+    )
+
+    estimator.fit(
+        inputs={
+            "train": TrainingInput(
+                s3_data=input_src,
+                input_mode=args.s3_input_mode,
+                distribution=args.s3_data_distribution,
+            )
+        },
+        job_name=args.job_name,
+        wait=True,
+    )
 def get_default_local_dir(args):
     if args.task == "train":
         return "/opt/ml"
     else:
         return "/opt/ml/processing"
-  if __name__ == '__main__':
+if __name__ == '__main__':
     args = parse_args()
     str_datetime = datetime.datetime.utcnow().strftime('%Y%m%d-%H%M%S')
     if args.job_name == "NoAssigned":
@@ -113,6 +308,9 @@ def get_default_local_dir(args):
     task_map = {
         Tasks.PREPARE_TRAIN_DATA: run_prepare_train_data_task,
         Tasks.PREPARE_INFERENCE_DATA: run_prepare_inference_data_task,
+        Tasks.TRAIN: run_train_task,
+        Tasks.EVALUATE: run_evaluate_task,
+        Tasks.FOLD_IN: run_fold_in_task,
     }
 
     task = task_map.get(args.task)
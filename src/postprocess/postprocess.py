@@ -7,29 +7,48 @@ import pandas as pd
 from pytz import timezone
 
 from utils.utils import init_dirs
+from utils.profiler import profiler
 from common.ddb import DynamoDB
+from common.ttl import TTLPolicy
+from common.contracts import INFERENCE_RESULT, get_input
+
+
+POPULAR_PK = "C#popular"
 
 
 class WatchLogNCFPostProcess:
-    def __init__(self, args):
+    """
+    :param handoff: 같은 프로세스에서 앞 단계가 넘긴 추론 결과(common.contracts.Handoff).
+        없으면 parquet footer 로 계약을 검사한 뒤 파일을 읽습니다.
+    """
+    def __init__(self, args, handoff=None):
         self.args = args
+        self.handoff = handoff
         self.base_date = datetime.strptime(args.base_date, "%Y-%m-%d")
 
         self.dataset_src = os.path.join(self.args.output_dir, "inference")
         self.dst = os.path.join(self.args.output_dir, "postprocess")
         init_dirs(self.dataset_src, self.dst)
 
-    def load_dataset(self):
-        return pd.read_parquet(
-            os.path.join(self.dataset_src, "inference_result.snappy.parquet")
+        self.ttl_policy = TTLPolicy(
+            ttl_seconds=self.args.serve_data_ttl,
+            jitter_seconds=self.args.serve_ttl_jitter_seconds,
+            stale_extend_seconds=self.args.serve_ttl_stale_extend_seconds,
+            max_expiry_ratio_per_hour=self.args.serve_ttl_max_expiry_ratio_per_hour,
         )
 
-    def run(self):
-        df = self.load_dataset()
-        ddb = DynamoDB(self.args.aws_region)
+    def load_dataset(self):
+        return get_input(
+            self.handoff,
+            INFERENCE_RESULT,
+            os.path.join(self.dataset_src, INFERENCE_RESULT.file_name()),
+        ).to_pandas()
+
+    def make_recommend_data(self, df, popular_row=True):
+        """ popular_row: 첫 행을 인기 콘텐츠(C#popular) 행으로 사용합니다 """
         recommend_data = [
-            ddb.convert_ddb_recommend_schema(
-                pk="C#popular" if idx == 0 else f"U#{str(row['user_id'])}",
+            DynamoDB.convert_ddb_recommend_schema(
+                pk=POPULAR_PK if popular_row and idx == 0 else f"U#{str(row['user_id'])}",
                 sk=(
                     f"V#{self.args.serve_data_version}#"
                     f"RT#{self.args.serve_recommend_type}#"
@@ -42,13 +61,83 @@ class WatchLogNCFPostProcess:
             )
             for idx, row in df.iterrows()
         ]
-        logging.info(pprint.pformat(recommend_data[:10]))
+        now_ts = datetime.now(tz=timezone(self.args.timezone)).timestamp()
+        return self.ttl_policy.assign(recommend_data, now_ts)
+
+    def write_recommend_data(self, ddb, recommend_data):
+        self.ttl_policy.check_expiry_burst([data["TTL"] for data in recommend_data])
+
+        shard_count = self.args.serve_popular_shard_count
+        if shard_count > 1:
+            # 인기 콘텐츠 아이템은 샤드 전체를 한 트랜잭션으로 갱신합니다
+            popular = [data for data in recommend_data if data["PK"] == POPULAR_PK]
+            recommend_data = [data for data in recommend_data if data["PK"] != POPULAR_PK]
+            for item in popular:
+                ddb.transact_put_items(
+                    table_name=self.args.serve_ddb_table_name,
+                    items=DynamoDB.replicate_to_shards(item, shard_count),
+                )
+
+        if self.args.serve_ddb_wcu_budget > 0:
+            ddb.scheduled_write(
+                table_name=self.args.serve_ddb_table_name,
+                items=recommend_data,
+                wcu_budget=self.args.serve_ddb_wcu_budget,
+                num_buckets=self.args.serve_ddb_partition_buckets,
+            )
+            return
 
         recommend_df = pd.DataFrame.from_records(recommend_data)
         ddb.batch_write_df_to_ddb(
             table_name=self.args.serve_ddb_table_name, df=recommend_df
         )
 
+    def extend_stale_items(self, ddb, recommend_data):
+        """
+        이번 실행에서 다시 쓰지 않은 아이템(결과에서 빠진 유저 등)의 TTL 을 연장해
+        실행 실패나 이탈 시점에 아이템이 한꺼번에 만료되지 않게 합니다.
+        """
+        rewritten = {data["PK"] for data in recommend_data}
+        rewritten.update(DynamoDB.make_shard_keys(
+            POPULAR_PK, self.args.serve_popular_shard_count
+        ))
+        tz = timezone(self.args.timezone)
+        now_ts = datetime.now(tz=tz).timestamp()
+        key_ttls = []
+        for item in ddb.scan_expiry_attributes(self.args.serve_ddb_table_name):
+            if item["PK"] in rewritten:
+                continue
+            created_ts = tz.localize(
+                datetime.strptime(item["CreatedAt"], "%Y-%m-%d %H:%M:%S")
+            ).timestamp() if item.get("CreatedAt") else None
+            extended = self.ttl_policy.extended_ttl(
+                item["PK"], item.get("TTL"), created_ts, now_ts
+            )
+            if extended:
+                key_ttls.append(((item["PK"], item["SK"]), extended))
+
+        ddb.update_ttl(self.args.serve_ddb_table_name, key_ttls)
+        return len(key_ttls)
+
+    def run(self):
+        with profiler.stage("load"):
+            df = self.load_dataset()
+            profiler.count(rows=len(df), bytes=int(df.memory_usage(deep=True).sum()))
+
+        ddb = DynamoDB(self.args.aws_region)
+        with profiler.stage("transform"):
+            recommend_data = self.make_recommend_data(df)
+            profiler.count(rows=len(recommend_data))
+        logging.info(pprint.pformat(recommend_data[:10]))
+
+        with profiler.stage("write_ddb"):
+            self.write_recommend_data(ddb, recommend_data)
+            profiler.count(rows=len(recommend_data))
+
+        if self.ttl_policy.stale_extend_seconds > 0:
+            with profiler.stage("extend_ttl"):
+                profiler.count(rows=self.extend_stale_items(ddb, recommend_data))
+
 
 class WatchLogNCFPreprocessor(WatchLogNCFPostProcess):
     def __init__(self, args):
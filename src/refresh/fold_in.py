@@ -0,0 +1,107 @@
+import os
+import logging
+
+import pandas as pd
+import pyarrow as pa
+
+from utils.profiler import profiler
+from common.embeddings import EmbeddingStore
+from common.contracts import INFERENCE_RESULT, get_input, put_output, to_table
+from refresh.refresh import EMBEDDING_FILE, aggregate_events, fold_in_new_users, make_topk_result
+
+
+class WatchLogNCFNewUserFoldIn:
+    """
+    마지막 학습 이후 watch_log 에 처음 나타난 유저의 추천을 재학습 없이 만듭니다.
+
+    학습된 콘텐츠 임베딩을 고정하고 새 유저의 벡터를 최소 제곱 fold-in 으로 한 번에 구한 뒤
+    top-K 를 inference_result.snappy.parquet 뒤에 추가합니다. 후처리는 이 유저들을
+    C#popular 폴백 대신 개인화 추천으로 적재합니다.
+    """
+    def __init__(self, args, handoff=None):
+        self.args = args
+        self.handoff = handoff
+        self.inference_result_path = os.path.join(
+            self.args.output_dir, "inference", INFERENCE_RESULT.file_name()
+        )
+        self.watch_log_path = os.path.join(
+            self.args.dataset_dir, f"{self.args.dataset_name}.csv"
+        )
+        self.embedding_path = self.args.refresh_embedding_path \
+            or os.path.join(self.args.model_dir, EMBEDDING_FILE)
+
+    def load_watch_log(self):
+        return pd.read_csv(
+            self.watch_log_path, usecols=["user_id", "contents_code", "watch_seconds"]
+        )
+
+    def load_new_user_pairs(self, store, inference_user_ids):
+        """ 학습 임베딩과 추론 결과에 모두 없는 유저의 (유저, 콘텐츠) 쌍 """
+        watch_log = self.load_watch_log()
+        watch_log = watch_log[
+            watch_log["user_id"].map(store.user_index).isna()
+            & ~watch_log["user_id"].isin(inference_user_ids)
+        ]
+        pairs = aggregate_events(watch_log)
+        pairs["item_row"] = store.item_rows(pairs["contents_code"])
+        pairs = pairs[pairs["item_row"] >= 0]
+
+        counts = pairs.groupby("user_id")["item_row"].transform("size")
+        return pairs[counts >= self.args.fold_in_min_interactions]
+
+    def fold_in(self, store, pairs):
+        user_ids = fold_in_new_users(
+            store, pairs, self.args.fold_in_reg, self.args.fold_in_alpha
+        )
+        return make_topk_result(
+            store, user_ids, store.user_vectors[store.user_rows(user_ids)], self.args.fold_in_top_k
+        )
+
+    def write_inference_result(self, inference_table, new_df):
+        """
+        기존 추론 결과(Arrow Table)는 pandas 로 바꾸지 않고 새 유저 행만 변환해 이어 붙입니다.
+        계약에 없는 기존 열은 새 유저 행에서 null 로 채웁니다.
+        계약을 검사한 뒤 임시 파일에 쓰고 교체합니다. (handoff 가 있으면 다음 단계에 그대로 넘깁니다)
+        첫 행(C#popular)의 위치는 그대로 유지됩니다.
+        """
+        new_table = to_table(new_df, INFERENCE_RESULT).select(INFERENCE_RESULT.schema.names)
+        new_table = pa.Table.from_arrays(
+            [
+                new_table.column(field.name).cast(field.type)
+                if field.name in new_table.column_names
+                else pa.nulls(new_table.num_rows, type=field.type)
+                for field in inference_table.schema
+            ],
+            schema=inference_table.schema,
+        )
+        table = pa.concat_tables([inference_table, new_table])
+        return put_output(self.handoff, INFERENCE_RESULT, table, self.inference_result_path)
+
+    def run(self):
+        if not os.path.exists(self.embedding_path):
+            logging.info(f"skip fold_in : {self.embedding_path} 이 없습니다")
+            return 0
+
+        with profiler.stage("load"):
+            store = EmbeddingStore.load(self.embedding_path)
+            inference_table = get_input(
+                self.handoff, INFERENCE_RESULT, self.inference_result_path
+            )
+            pairs = self.load_new_user_pairs(
+                store, inference_table.column("user_id").to_numpy()
+            )
+            profiler.count(rows=len(pairs))
+
+        num_users = pairs["user_id"].nunique()
+        logging.info(f"new users : {num_users} ({len(pairs)} interactions)")
+        if num_users == 0:
+            return 0
+
+        with profiler.stage("fold_in"):
+            new_df = self.fold_in(store, pairs)
+            profiler.count(rows=len(new_df))
+
+        with profiler.stage("write"):
+            self.write_inference_result(inference_table, new_df)
+            profiler.count(rows=len(new_df))
+        return len(new_df)
@@ -0,0 +1,188 @@
+import os
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+from utils.utils import init_dirs
+from utils.profiler import profiler
+from common.ddb import DynamoDB
+from common.embeddings import (
+    EmbeddingStore, fold_in_least_squares, fold_in_sgd, topk_items
+)
+from postprocess.postprocess import WatchLogNCFPostProcess
+from refresh.spool import EventSpool
+
+
+EMBEDDING_FILE = "embeddings.npz"
+
+
+def aggregate_events(events):
+    """
+    (유저, 콘텐츠) 별로 시청 이벤트를 모읍니다.
+    시청 시간이 길수록 가중치를 높입니다. (1 + log1p(시청 분))
+    """
+    grouped = events.groupby(["user_id", "contents_code"], as_index=False)["watch_seconds"].sum()
+    grouped["weight"] = 1 + np.log1p(grouped["watch_seconds"].clip(lower=0) / 60)
+    return grouped
+
+
+def make_topk_result(store, user_ids, user_vectors, k):
+    """ inference_result.snappy.parquet 과 같은 (user_id, items) 형태의 top-K 결과 """
+    indices, scores = topk_items(user_vectors, store.item_vectors, k)
+    codes = store.item_codes[indices]
+    return pd.DataFrame({
+        "user_id": user_ids,
+        "items": [
+            [{"code": int(code), "score": float(score)} for code, score in zip(c, s)]
+            for c, s in zip(codes, scores)
+        ],
+    })
+
+
+def fold_in_new_users(store, pairs, reg, alpha):
+    """
+    pairs(aggregate_events 결과 + item_row) 중 저장소에 없는 유저의 벡터를
+    최소 제곱 fold-in 으로 구해 저장소에 추가합니다.
+
+    :return: 추가한 유저의 user_id 배열
+    """
+    new_pairs = pairs[pairs["user_id"].map(store.user_index).isna()]
+    if new_pairs.empty:
+        return new_pairs["user_id"].to_numpy()
+
+    codes, user_ids = pd.factorize(new_pairs["user_id"])
+    vectors = fold_in_least_squares(
+        store.item_vectors,
+        codes,
+        new_pairs["item_row"].to_numpy(),
+        num_users=len(user_ids),
+        weights=new_pairs["weight"].to_numpy(),
+        reg=reg,
+        alpha=alpha,
+    )
+    user_ids = np.asarray(user_ids)
+    rows = store.user_rows(user_ids)
+    store.user_vectors[rows] = vectors
+    return user_ids
+
+
+class WatchLogNCFIncrementalRefresh:
+    """
+    새 시청 이벤트를 마이크로 배치로 받아 해당 유저의 추천만 갱신합니다.
+
+    1. 스풀(큐 대역)에서 watch_log 형태 이벤트를 가져옵니다.
+    2. 콘텐츠 임베딩은 고정하고 이벤트가 있는 유저 벡터만 몇 번의 경사 하강으로 갱신합니다.
+       처음 보는 유저는 최소 제곱 fold-in 으로 벡터를 구합니다.
+    3. 갱신한 유저만 top-K 를 다시 계산해 후처리와 같은 스키마로 DynamoDB 에 덮어씁니다.
+    4. 갱신한 임베딩을 저장한 뒤 이벤트 파일을 ack 합니다.
+       (중간에 실패하면 ack 하지 않은 파일은 refresh_lease_seconds 가 지난 뒤 recover 로 다시 처리됩니다)
+
+    일 배치와 달리 인기 콘텐츠 행과 TTL 만료 분산 검사는 수행하지 않습니다.
+    """
+    def __init__(self, args):
+        self.args = args
+        self.dst = os.path.join(self.args.output_dir, "refresh")
+        init_dirs(self.dst)
+        self.spool = EventSpool(
+            self.args.refresh_spool_dir or os.path.join(self.dst, "spool"),
+            lease_seconds=self.args.refresh_lease_seconds,
+        )
+        self.postprocess = WatchLogNCFPostProcess(args)
+        self.embedding_dst = os.path.join(self.dst, EMBEDDING_FILE)
+        self.store = None
+
+    def load_embeddings(self):
+        """ 이전 실행에서 갱신한 임베딩이 있으면 이어서 사용합니다. """
+        path = self.embedding_dst if os.path.exists(self.embedding_dst) \
+            else self.args.refresh_embedding_path \
+            or os.path.join(self.args.model_dir, EMBEDDING_FILE)
+        logging.info(f"load embeddings : {path}")
+        return EmbeddingStore.load(path)
+
+    def fold_in(self, events):
+        """ :return: 갱신한 유저의 (user_id 배열, 행 번호 배열) """
+        pairs = aggregate_events(events)
+        pairs["item_row"] = self.store.item_rows(pairs["contents_code"])
+        unknown = pairs["item_row"] < 0
+        if unknown.any():
+            logging.info(f"skip events of unknown contents : {int(unknown.sum())}")
+            pairs = pairs[~unknown]
+        if pairs.empty:
+            return np.array([]), np.array([], dtype=np.int64)
+
+        new_user_ids = fold_in_new_users(
+            self.store, pairs, self.args.fold_in_reg, self.args.fold_in_alpha
+        )
+        known = pairs[~pairs["user_id"].isin(new_user_ids)]
+        if not known.empty:
+            pair_users = self.store.user_rows(known["user_id"])
+            self.store.user_vectors, first_loss, last_loss = fold_in_sgd(
+                self.store.user_vectors,
+                self.store.item_vectors,
+                pair_users,
+                known["item_row"].to_numpy(),
+                weights=known["weight"].to_numpy(),
+                steps=self.args.refresh_sgd_steps,
+                learning_rate=self.args.refresh_learning_rate,
+                reg=self.args.refresh_reg,
+                negatives=self.args.refresh_negatives,
+            )
+            logging.info(f"fold-in loss : {first_loss:.4f} -> {last_loss:.4f}")
+        user_ids = pairs["user_id"].drop_duplicates().to_numpy()
+        return user_ids, self.store.user_rows(user_ids)
+
+    def process_batch(self, ddb):
+        """ :return: 처리한 이벤트 수 """
+        paths, events = self.spool.poll(self.args.refresh_max_files)
+        if not paths:
+            return 0
+
+        with profiler.stage("fold_in"):
+            user_ids, rows = self.fold_in(events)
+            profiler.count(rows=len(events))
+
+        if len(user_ids):
+            with profiler.stage("topk"):
+                df = make_topk_result(
+                    self.store, user_ids, self.store.user_vectors[rows], self.args.refresh_top_k
+                )
+                profiler.count(rows=len(df))
+
+            with profiler.stage("write_ddb"):
+                recommend_data = self.postprocess.make_recommend_data(df, popular_row=False)
+                ddb.batch_write_df_to_ddb(
+                    table_name=self.args.serve_ddb_table_name,
+                    df=pd.DataFrame.from_records(recommend_data),
+                )
+                profiler.count(rows=len(recommend_data))
+
+            self.store.save(self.embedding_dst)
+
+        self.spool.ack(paths)
+        logging.info(f"refreshed {len(user_ids)} users from {len(events)} events")
+        return len(events)
+
+    def run(self, ddb=None):
+        """
+        스풀이 빌 때까지 처리합니다.
+        refresh_poll_seconds 가 0 보다 크면 멈추지 않고 그 간격으로 계속 확인합니다.
+        """
+        ddb = ddb or DynamoDB(self.args.aws_region)
+        with profiler.stage("load"):
+            self.store = self.load_embeddings()
+            self.spool.recover()
+
+        total = 0
+        while True:
+            processed = self.process_batch(ddb)
+            total += processed
+            if processed:
+                continue
+            if self.args.refresh_poll_seconds <= 0:
+                break
+            time.sleep(self.args.refresh_poll_seconds)
+            # 계속 실행 중에도 중단된 다른 소비자의 파일을 이어받습니다
+            self.spool.recover()
+        return total
@@ -0,0 +1,90 @@
+import os
+import glob
+import time
+import uuid
+import logging
+
+import pandas as pd
+
+
+WATCH_LOG_COLUMNS = ["user_id", "contents_code", "watch_seconds"]
+
+
+class EventSpool:
+    """
+    시청 이벤트 큐의 로컬 파일 대역.
+
+    - put: incoming/ 에 임시 파일로 쓴 뒤 이름을 바꿔 넣습니다.
+    - poll: 오래된 파일부터 processing/<소비자>/ 로 옮겨 가져갑니다. (rename 은 원자적이라 소비자가 여럿이어도 한 번만 가져갑니다)
+      가져간 시각을 파일 mtime 에 기록하며, lease_seconds 동안 그 소비자가 파일을 점유합니다.
+    - ack: 처리가 끝난 파일을 done/ 으로 옮깁니다.
+    - recover: 점유 기간이 지난 파일만 다시 incoming/ 에 넣습니다. 처리 중인 다른 소비자의 파일은 건드리지 않습니다.
+      점유 기간 안에 ack 하지 못하면 다른 소비자가 다시 처리할 수 있으므로 전달은 최소 한 번입니다.
+    """
+    def __init__(self, spool_dir, lease_seconds=600):
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self.incoming_dir = os.path.join(spool_dir, "incoming")
+        self.processing_dir = os.path.join(spool_dir, "processing")
+        self.claim_dir = os.path.join(self.processing_dir, self.owner)
+        self.done_dir = os.path.join(spool_dir, "done")
+        for target_dir in [self.incoming_dir, self.claim_dir, self.done_dir]:
+            os.makedirs(target_dir, exist_ok=True)
+
+    def put(self, df):
+        name = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.csv"
+        tmp_path = os.path.join(self.incoming_dir, f".{name}")
+        df[WATCH_LOG_COLUMNS].to_csv(tmp_path, index=False)
+        os.replace(tmp_path, os.path.join(self.incoming_dir, name))
+        return name
+
+    def poll(self, max_files=100):
+        """ :return: (가져간 파일 경로 리스트, 이벤트 DataFrame) """
+        claimed = []
+        for path in sorted(glob.glob(os.path.join(self.incoming_dir, "*.csv")))[:max_files]:
+            target = os.path.join(self.claim_dir, os.path.basename(path))
+            try:
+                # 옮기기 전에 점유 시작 시각을 기록해야 옮긴 직후의 recover 가 만료로 보지 않습니다
+                os.utime(path)
+                os.replace(path, target)
+            except FileNotFoundError:
+                # 다른 소비자가 먼저 가져갔습니다
+                continue
+            claimed.append(target)
+
+        if not claimed:
+            return [], pd.DataFrame(columns=WATCH_LOG_COLUMNS)
+        return claimed, pd.concat([pd.read_csv(path) for path in claimed], ignore_index=True)
+
+    def ack(self, paths):
+        for path in paths:
+            try:
+                os.replace(path, os.path.join(self.done_dir, os.path.basename(path)))
+            except FileNotFoundError:
+                # 점유 기간이 지나 다른 소비자가 recover 했습니다
+                logging.warning(f"lease expired before ack : {path}")
+
+    def renew(self, paths):
+        """ 처리가 점유 기간보다 오래 걸릴 때 점유를 연장합니다. """
+        for path in paths:
+            os.utime(path)
+
+    def recover(self):
+        """ 점유 기간이 지난(중단된 소비자의) 파일을 다시 incoming/ 으로 돌려놓습니다. """
+        expires_before = time.time() - self.lease_seconds
+        recovered = 0
+        for path in glob.glob(os.path.join(self.processing_dir, "*", "*.csv")):
+            try:
+                if os.path.getmtime(path) > expires_before:
+                    continue
+                os.replace(path, os.path.join(self.incoming_dir, os.path.basename(path)))
+            except FileNotFoundError:
+                # 그 사이 ack 되었거나 다른 소비자가 먼저 돌려놓았습니다
+                continue
+            recovered += 1
+        if recovered:
+            logging.info(f"recovered {recovered} files")
+        return recovered
+
+    def pending(self):
+        return len(glob.glob(os.path.join(self.incoming_dir, "*.csv")))
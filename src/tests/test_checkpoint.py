@@ -0,0 +1,24 @@
+import threading
+
+import torch
+
+from common.checkpoint import AsyncCheckpointer
+
+
+def test_close_after_dropped_checkpoints(tmp_path):
+    """ 저장 속도가 쓰기를 앞질러 대기 중인 체크포인트가 버려져도 close() 가 끝나야 합니다. """
+    model = torch.nn.Linear(2000, 2000)
+    optimizer = torch.optim.Adam(model.parameters())
+    model(torch.randn(4, 2000)).sum().backward()
+    optimizer.step()
+
+    checkpointer = AsyncCheckpointer(str(tmp_path), keep_last=2)
+    for step in range(20):
+        checkpointer.save(model, optimizer, epoch=0, step=step)
+
+    closer = threading.Thread(target=checkpointer.close, daemon=True)
+    closer.start()
+    closer.join(timeout=60)
+    assert not closer.is_alive()
+    assert checkpointer.queue.unfinished_tasks == 0
+    assert len(checkpointer.list_checkpoints()) <= 2
@@ -0,0 +1,134 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from common.compaction import LocalStorage, compact_range, date_range, partition_key, read_range
+
+
+DATASET = dict(dataset_name="watch_log", dataset_version=1)
+DATES = date_range("2024-03-01", "2024-03-03")
+
+
+class CrashingStorage(LocalStorage):
+    """ fail_on(키) 가 처음 참이 되는 put/delete 에서 한 번 실패합니다. """
+    def __init__(self, root, fail_on):
+        super().__init__(root)
+        self.fail_on = fail_on
+
+    def check(self, key):
+        if self.fail_on and self.fail_on(key):
+            self.fail_on = None
+            raise RuntimeError(f"crash at {key}")
+
+    def put(self, key, data):
+        self.check(key)
+        super().put(key, data)
+
+    def delete(self, keys):
+        keys = list(keys)
+        self.check(keys[0])
+        super().delete(keys)
+
+
+def put_partitions(storage, files_per_day=5):
+    for day, base_date in enumerate(DATES):
+        key = partition_key(base_date, **DATASET)
+        for i in range(files_per_day):
+            sink = io.BytesIO()
+            user_id = day * files_per_day + i
+            pq.write_table(pa.table({"user_id": [user_id], "contents_code": [user_id]}), sink)
+            storage.put(f"{key}/part-{i:05d}.snappy.parquet", sink.getvalue())
+
+
+def read_rows(storage):
+    return read_range(storage, "2024-03-01", "2024-03-03", **DATASET).num_rows
+
+
+@pytest.mark.parametrize("crash_at", ["delete", "manifest"])
+def test_rerun_after_crash_does_not_duplicate_rows(tmp_path, crash_at):
+    """ 병합 도중 중단된 뒤 다시 실행해도 원본을 두 번 합치지 않아야 합니다. """
+    put_partitions(LocalStorage(str(tmp_path)))
+    second = partition_key(DATES[1], **DATASET)
+    if crash_at == "delete":
+        # 두 번째 파티션의 manifest 교체 후, 원본 삭제 전
+        fail_on = lambda key: key.startswith(f"{second}/part-")  # noqa: E731
+    else:
+        # 두 번째 파티션의 병합본을 쓴 뒤, manifest 교체 전
+        fail_on = lambda key: key == f"{second}/_manifest.json"  # noqa: E731
+    storage = CrashingStorage(str(tmp_path), fail_on)
+
+    with pytest.raises(RuntimeError):
+        compact_range(storage, "2024-03-01", "2024-03-03", delete_sources=True, **DATASET)
+    compact_range(storage, "2024-03-01", "2024-03-03", delete_sources=True, **DATASET)
+    assert read_rows(storage) == 15
+
+    leftovers = [name for name in storage.list(f"{second}/") if "/part-" in name]
+    assert leftovers == []
+    compacted = [name for name in storage.list(f"{second}/") if "/compacted-" in name]
+    assert len(compacted) == 1
+
+
+def test_contract_files_are_kept(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    put_partitions(storage)
+    key = partition_key(DATES[0], **DATASET)
+    storage.put(f"{key}/watch_log.csv", b"user_id,contents_code\n100,100\n")
+
+    compact_range(storage, "2024-03-01", "2024-03-03", delete_sources=True, **DATASET)
+    assert storage.exists(f"{key}/watch_log.csv")
+    assert not storage.exists(f"{key}/part-00000.snappy.parquet")
+    assert read_rows(storage) == 16
+
+    # 남은 계약 파일을 다음 병합에서 다시 합치지 않습니다
+    compact_range(storage, "2024-03-01", "2024-03-03", delete_sources=True, **DATASET)
+    assert read_rows(storage) == 16
+
+
+def test_sources_are_kept_by_default(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    put_partitions(storage)
+    compact_range(storage, "2024-03-01", "2024-03-03", **DATASET)
+    compact_range(storage, "2024-03-01", "2024-03-03", **DATASET)
+    key = partition_key(DATES[0], **DATASET)
+    assert storage.exists(f"{key}/part-00000.snappy.parquet")
+    assert read_rows(storage) == 15
+
+
+def test_mixed_schema_partition(tmp_path):
+    """ 원본 CSV 와 열이 다른 학습 데이터 parquet 이 같은 파티션에 있어도 원본만 병합합니다. """
+    storage = LocalStorage(str(tmp_path))
+    key = partition_key(DATES[0], **DATASET)
+    storage.put(
+        f"{key}/watch_log.csv",
+        b"user_id,contents_code,watch_seconds\n2,20,100\n1,10,300\n",
+    )
+    sink = io.BytesIO()
+    pq.write_table(pa.table({"user_id": [1], "contents_code": [10]}), sink)
+    storage.put(f"{key}/watch_log_train_ncf.snappy.parquet", sink.getvalue())
+
+    for _ in range(2):
+        compact_range(
+            storage, "2024-03-01", "2024-03-01", delete_sources=True,
+            sort_by="user_id", **DATASET
+        )
+        table = read_range(storage, "2024-03-01", "2024-03-01", **DATASET)
+        assert table.column_names == ["user_id", "contents_code", "watch_seconds"]
+        assert table.column("user_id").to_pylist() == [1, 2]
+    assert storage.exists(f"{key}/watch_log.csv")
+    assert storage.exists(f"{key}/watch_log_train_ncf.snappy.parquet")
+
+
+def test_prepared_train_data_is_kept(tmp_path):
+    """ prepared_ 데이터셋을 병합할 때도 학습 데이터 계약 파일은 지우지 않습니다. """
+    storage = LocalStorage(str(tmp_path))
+    dataset = dict(dataset_name="prepared_watch_log", dataset_version=1)
+    key = partition_key(DATES[0], **dataset)
+    sink = io.BytesIO()
+    pq.write_table(pa.table({"user_id": [1, 2], "contents_code": [10, 20]}), sink)
+    storage.put(f"{key}/watch_log_train_ncf.snappy.parquet", sink.getvalue())
+
+    compact_range(storage, "2024-03-01", "2024-03-01", delete_sources=True, **dataset)
+    assert storage.exists(f"{key}/watch_log_train_ncf.snappy.parquet")
+    assert read_range(storage, "2024-03-01", "2024-03-01", **dataset).num_rows == 2
@@ -0,0 +1,40 @@
+import argparse
+
+import pytest
+
+from evaluate.evaluate import WatchLogNCFEvaluation
+
+
+def make_evaluation(tmp_path, **kwargs):
+    (tmp_path / "watch_log.csv").write_text(
+        "user_id,contents_code,watched_at\n"
+        "1,10,2024-03-01 10:00\n"
+        "1,11,2024-03-02 10:00\n"
+        "2,10,2024-03-02 12:00\n"
+    )
+    args = dict(
+        output_dir=str(tmp_path), dataset_dir=str(tmp_path), dataset_name="watch_log",
+        eval_holdout_path=None, eval_timestamp_column=None, eval_train_cutoff=None,
+    )
+    args.update(kwargs)
+    return WatchLogNCFEvaluation(argparse.Namespace(**args))
+
+
+def test_holdout_is_required(tmp_path):
+    """ 학습에 쓴 시청 로그를 임의로 나눠 평가하지 않습니다. """
+    with pytest.raises(ValueError):
+        make_evaluation(tmp_path).load_watch_log()
+
+
+def test_holdout_after_train_cutoff(tmp_path):
+    evaluation = make_evaluation(
+        tmp_path, eval_timestamp_column="watched_at", eval_train_cutoff="2024-03-01 23:59"
+    )
+    train_df, holdout_df = evaluation.load_watch_log()
+    assert list(train_df.columns) == ["user_id", "contents_code"]
+    assert train_df["contents_code"].tolist() == [10]
+    assert holdout_df["user_id"].tolist() == [1, 2]
+
+    evaluation.args.eval_train_cutoff = "2024-03-03"
+    with pytest.raises(ValueError):
+        evaluation.load_watch_log()
@@ -0,0 +1,34 @@
+import argparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from common.contracts import INFERENCE_RESULT
+from refresh.fold_in import WatchLogNCFNewUserFoldIn
+
+
+def test_write_inference_result_keeps_extra_columns(tmp_path):
+    """ 계약에 없는 열이 있는 추론 결과에도 새 유저 행을 이어 붙여야 합니다. """
+    args = argparse.Namespace(
+        output_dir=str(tmp_path), dataset_dir=str(tmp_path), dataset_name="watch_log",
+        model_dir=str(tmp_path), refresh_embedding_path=None,
+    )
+    (tmp_path / "inference").mkdir()
+    items_type = INFERENCE_RESULT.schema.field("items").type
+    inference_table = pa.table({
+        "user_id": pa.array([0, 1], pa.int64()),
+        "model_version": pa.array(["v1", "v1"]),
+        "items": pa.array([[{"code": 1, "score": 0.5}], []], items_type),
+    })
+    new_df = pd.DataFrame({
+        "user_id": [2],
+        "items": [[{"code": 3, "score": 0.25}]],
+    })
+
+    WatchLogNCFNewUserFoldIn(args).write_inference_result(inference_table, new_df)
+    table = pq.read_table(tmp_path / "inference" / INFERENCE_RESULT.file_name())
+    assert table.column_names == ["user_id", "model_version", "items"]
+    assert table.column("user_id").to_pylist() == [0, 1, 2]
+    assert table.column("model_version").to_pylist() == ["v1", "v1", None]
+    assert table.column("items").to_pylist()[2] == [{"code": 3, "score": 0.25}]
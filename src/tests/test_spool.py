@@ -0,0 +1,45 @@
+import os
+import time
+
+import pandas as pd
+
+from refresh.spool import EventSpool
+
+
+def put_events(spool, count):
+    for i in range(count):
+        spool.put(pd.DataFrame({"user_id": [i], "contents_code": [i], "watch_seconds": [60]}))
+
+
+def test_recover_keeps_live_claims(tmp_path):
+    """ 다른 소비자가 처리 중인 파일은 점유 기간이 지나기 전에는 돌려놓지 않습니다. """
+    consumer = EventSpool(str(tmp_path), lease_seconds=60)
+    put_events(consumer, 3)
+    paths, events = consumer.poll()
+    assert len(events) == 3
+
+    restarted = EventSpool(str(tmp_path), lease_seconds=60)
+    assert restarted.recover() == 0
+    assert restarted.poll()[0] == []
+
+    consumer.ack(paths)
+    assert len(os.listdir(tmp_path / "done")) == 3
+
+
+def test_recover_expired_claims(tmp_path):
+    crashed = EventSpool(str(tmp_path), lease_seconds=60)
+    put_events(crashed, 2)
+    paths, _ = crashed.poll()
+    expired_at = time.time() - 120
+    for path in paths:
+        os.utime(path, (expired_at, expired_at))
+
+    consumer = EventSpool(str(tmp_path), lease_seconds=60)
+    assert consumer.recover() == 2
+    recovered, events = consumer.poll()
+    assert len(events) == 2
+    consumer.ack(recovered)
+
+    # 점유를 잃은 소비자의 ack 는 실패하지 않고 건너뜁니다
+    crashed.ack(paths)
+    assert len(os.listdir(tmp_path / "done")) == 2
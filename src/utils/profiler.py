@@ -0,0 +1,195 @@
+import os
+import json
+import time
+import pstats
+import logging
+import cProfile
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Profiler:
+    """
+    작업 단계별 소요 시간과 처리량(행/바이트 수)을 수집합니다.
+
+    - stage() / timed() 로 단계 구간을 기록합니다. (중첩 시 부모/자식 경로로 기록)
+    - count() 로 현재 단계의 행/바이트 수를 누적합니다.
+    - --profile 옵션에 따라 cProfile / tracemalloc 결과를 함께 저장합니다.
+    - 결과는 구조화 JSON 로그, 요약 테이블, EMF(Embedded Metric Format) 라인으로 출력합니다.
+    """
+    def __init__(self):
+        self.job_name = None
+        self.task = None
+        self.mode = "none"
+        self.profile_dir = None
+        self.emf_namespace = None
+        self.records = []
+        self.stack = []
+        self.cprofile = None
+
+    def configure(
+        self,
+        job_name=None,
+        task=None,
+        mode="none",
+        profile_dir=None,
+        emf_namespace=None
+    ):
+        self.job_name = job_name
+        self.task = task
+        self.mode = mode or "none"
+        self.profile_dir = profile_dir
+        self.emf_namespace = emf_namespace
+        self.records = []
+        self.stack = []
+        return self
+
+    @contextmanager
+    def stage(self, name):
+        record = {
+            "stage": "/".join([*(r["stage"] for r in self.stack), name]),
+            "rows": 0,
+            "bytes": 0,
+        }
+        self.stack.append(record)
+        started_at = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - started_at, 6)
+            self.stack.pop()
+            self.records.append(record)
+
+    def timed(self, name=None):
+        """ 함수 전체를 하나의 단계로 기록하는 데코레이터 """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, rows=0, bytes=0):
+        if not self.stack:
+            return
+        self.stack[-1]["rows"] += rows
+        self.stack[-1]["bytes"] += bytes
+
+    def start(self):
+        if self.mode in ("cprofile", "all"):
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        if self.mode in ("tracemalloc", "all"):
+            tracemalloc.start()
+
+    def stop(self):
+        if self.profile_dir and self.mode != "none":
+            os.makedirs(self.profile_dir, exist_ok=True)
+
+        if self.cprofile:
+            self.cprofile.disable()
+            path = os.path.join(self.profile_dir or ".", f"{self.task}.prof")
+            self.cprofile.dump_stats(path)
+            stats = pstats.Stats(self.cprofile).sort_stats("cumulative")
+            logging.info(f"cProfile saved : {path}")
+            stats.print_stats(20)
+            self.cprofile = None
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            top_stats = tracemalloc.take_snapshot().statistics("lineno")[:10]
+            tracemalloc.stop()
+            logging.info(json.dumps({
+                "event": "tracemalloc",
+                "task": self.task,
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": [str(stat) for stat in top_stats],
+            }))
+
+    def summary_table(self):
+        rows = [
+            f"{'stage':<40} {'seconds':>10} {'rows':>12} {'bytes':>14} {'rows/s':>12}",
+        ]
+        for record in sorted(self.records, key=lambda r: r["stage"]):
+            rows_per_second = record["rows"] / record["seconds"] \
+                if record["seconds"] and record["rows"] else 0
+            rows.append(
+                f"{record['stage']:<40} {record['seconds']:>10.3f} "
+                f"{record['rows']:>12} {record['bytes']:>14} {rows_per_second:>12.1f}"
+            )
+        return "\n".join(rows)
+
+    def emf_lines(self):
+        """
+        CloudWatch Logs 가 별도 PutMetricData 호출 없이 지표로 추출하는
+        Embedded Metric Format 라인을 만듭니다.
+        """
+        timestamp = int(time.time() * 1000)
+        return [
+            json.dumps({
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [{
+                        "Namespace": self.emf_namespace,
+                        "Dimensions": [["Task", "Stage"]],
+                        "Metrics": [
+                            {"Name": "Duration", "Unit": "Seconds"},
+                            {"Name": "Rows", "Unit": "Count"},
+                            {"Name": "Bytes", "Unit": "Bytes"},
+                        ],
+                    }],
+                },
+                "Task": self.task,
+                "Stage": record["stage"],
+                "JobName": self.job_name,
+                "Duration": record["seconds"],
+                "Rows": record["rows"],
+                "Bytes": record["bytes"],
+            })
+            for record in self.records
+        ]
+
+    def emit(self):
+        for record in self.records:
+            logging.info(json.dumps({
+                "event": "stage",
+                "job_name": self.job_name,
+                "task": self.task,
+                **record,
+            }))
+        logging.info("\n" + self.summary_table())
+
+        if self.emf_namespace:
+            # EMF 는 로그 라인 전체가 JSON 이어야 하므로 logging 포맷을 거치지 않습니다
+            for line in self.emf_lines():
+                print(line, flush=True)
+
+
+profiler = Profiler()
+
+
+def profile_task(func):
+    """
+    main.py 의 run_*_task(args, tasks) 에 적용하는 데코레이터.
+    작업 전체를 하나의 단계로 기록하고 종료 시 결과를 출력합니다.
+    """
+    @functools.wraps(func)
+    def wrapper(args, *rest, **kwargs):
+        profiler.configure(
+            job_name=getattr(args, "job_name", None),
+            task=args.task,
+            mode=getattr(args, "profile", "none"),
+            profile_dir=getattr(args, "profile_dir", None),
+            emf_namespace=getattr(args, "emf_namespace", None),
+        )
+        profiler.start()
+        try:
+            with profiler.stage(args.task):
+                return func(args, *rest, **kwargs)
+        finally:
+            profiler.stop()
+            profiler.emit()
+    return wrapper
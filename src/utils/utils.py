@@ -1,4 +1,8 @@
+import os
 import datetime
+from os import path
+
+
 def make_s3_dataset_path(
     base_dir, 
     dataset_name, 
@@ -24,3 +28,8 @@ def make_s3_model_output_path(base_dir, model_name, base_date: datetime.datetime
         base_date.strftime("month=%m"),
         base_date.strftime("day=%d"),
     )
+
+
+def init_dirs(*dirs):
+    for target_dir in dirs:
+        os.makedirs(target_dir, exist_ok=True)
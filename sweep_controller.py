@@ -0,0 +1,708 @@
+import os
+import sys
+import json
+import math
+import time
+import shlex
+import random
+import logging
+import itertools
+import subprocess
+
+import fire
+
+from config_controller import get_config, make_argv, get_task_params, project_dir
+
+
+logging.basicConfig(level=logging.INFO)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+STOPPED = "stopped"
+# 조기 중단이 아니라 탐색이 중단되어 멈춘 시도. 다시 실행하면 이어서 수행합니다
+INTERRUPTED = "sweep interrupted"
+# 정상 종료했지만 학습 지표를 하나도 남기지 않은 시도
+NO_METRICS = "no metrics reported"
+
+STRATEGIES = ("grid", "random", "halving")
+SAGEMAKER_METRIC_NAMESPACE = "/aws/sagemaker/TrainingJobs"
+# 로컬 실행의 학습 지표 파일 이름 (common.sweep.TrialReporter 가 기록)
+METRICS_FILE = "metrics.jsonl"
+
+
+def load_sweep_config(namespace, service_name):
+    """ 설정 파일의 sweep 섹션. 없으면 빈 dict """
+    return get_config(namespace=namespace, service_name=service_name).get("sweep", {})
+
+
+def expand_grid(space):
+    """
+    :param space: {파라미터: 값 목록}. 목록이 아닌 값은 고정값으로 취급합니다.
+    :return: 모든 조합
+    """
+    names = list(space)
+    values = [space[name] if isinstance(space[name], list) else [space[name]] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def sample_value(rng, spec):
+    """
+    - 목록: 그 중 하나
+    - {"low", "high", "log", "type"}: 구간에서 균등(log=True 면 로그 균등) 샘플링
+    - 그 외: 고정값
+    """
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    if not isinstance(spec, dict):
+        return spec
+    low, high = spec["low"], spec["high"]
+    if spec.get("log"):
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    if spec.get("type") == "int":
+        return int(round(value))
+    return float(f"{value:.6g}")
+
+
+def sample_random(space, num_trials, seed=0):
+    rng = random.Random(seed)
+    return [
+        {name: sample_value(rng, spec) for name, spec in space.items()}
+        for _ in range(num_trials)
+    ]
+
+
+def make_trials(strategy, space, num_trials, seed=0):
+    if strategy not in STRATEGIES:
+        raise ValueError(f"지원하지 않는 탐색 방식입니다 : {strategy} (지원 {STRATEGIES})")
+    if strategy == "grid":
+        if any(isinstance(spec, dict) for spec in space.values()):
+            raise ValueError("grid 탐색은 값 목록만 지원합니다")
+        trials = expand_grid(space)
+        return trials[:num_trials] if num_trials else trials
+    return sample_random(space, num_trials, seed=seed)
+
+
+def rung_epochs(min_epochs, max_epochs, eta):
+    """ successive halving 의 판정 에폭 (min_epochs * eta^k < max_epochs) """
+    rungs = []
+    epoch = min_epochs
+    while epoch < max_epochs:
+        rungs.append(epoch)
+        epoch *= eta
+    return rungs
+
+
+def make_job_name(namespace, model_name, sweep_name, trial_id, attempt):
+    # SageMaker 작업 이름은 63자 이하의 영문/숫자/하이픈만 허용됩니다
+    return f"{namespace}-{model_name}-sweep-{sweep_name}-{trial_id}-a{attempt}"[:63]
+
+
+class EarlyStopping:
+    """
+    중간 검증 지표로 가망 없는 시도를 중단합니다.
+
+    - halving: 비동기 successive halving. 시도가 판정 에폭에 도달하면 같은 에폭에 도달한
+      시도들 중 상위 1/eta 에 들지 못할 때 중단합니다. (먼저 도달한 시도는 비교 대상이 모일 때까지 통과)
+    - median: grace_epochs 이후 매 에폭, 지금까지의 최고값이 같은 에폭의 다른 시도들
+      최고값의 중앙값보다 나쁘면 중단합니다.
+    """
+    def __init__(self, rule, metric, mode, max_epochs, min_epochs=1, eta=3, grace_epochs=2):
+        self.rule = rule
+        self.metric = metric
+        self.mode = mode
+        self.eta = eta
+        self.grace_epochs = grace_epochs
+        self.rungs = rung_epochs(min_epochs, max_epochs, eta) if rule == "halving" else []
+
+    def is_better(self, a, b):
+        return a > b if self.mode == "max" else a < b
+
+    def best_until(self, history, epoch):
+        values = [
+            record[self.metric] for record in history
+            if record["epoch"] <= epoch and self.metric in record
+        ]
+        if not values:
+            return None
+        return max(values) if self.mode == "max" else min(values)
+
+    def value_at(self, history, epoch):
+        for record in history:
+            if record["epoch"] == epoch and self.metric in record:
+                return record[self.metric]
+        return None
+
+    def should_stop(self, trial, trials):
+        """ :return: 중단 사유. 계속하면 None """
+        history = trial["history"]
+        if not history:
+            return None
+        others = [other for other in trials if other["id"] != trial["id"]]
+
+        if self.rule == "halving":
+            for rung in self.rungs:
+                if rung in trial["rungs"]:
+                    continue
+                value = self.value_at(history, rung)
+                if value is None:
+                    break
+                trial["rungs"].append(rung)
+                values = [value] + [
+                    self.value_at(other["history"], rung) for other in others
+                ]
+                values = sorted(
+                    [v for v in values if v is not None], reverse=self.mode == "max"
+                )
+                keep = len(values) // self.eta
+                if keep and self.is_better(values[keep - 1], value) \
+                        and values[keep - 1] != value:
+                    return f"rung {rung}: {self.metric}={value:.4f}, top 1/{self.eta} cut " \
+                           f"{values[keep - 1]:.4f} ({len(values)} trials)"
+            return None
+
+        if self.rule == "median":
+            epoch = history[-1]["epoch"]
+            if epoch < self.grace_epochs:
+                return None
+            value = self.best_until(history, epoch)
+            values = sorted(
+                best for best in (self.best_until(other["history"], epoch) for other in others
+                                  if other["epochs"] >= epoch)
+                if best is not None
+            )
+            if len(values) < 3 or value is None:
+                return None
+            median = values[len(values) // 2] if len(values) % 2 \
+                else (values[len(values) // 2 - 1] + values[len(values) // 2]) / 2
+            if self.is_better(median, value):
+                return f"epoch {epoch}: best {self.metric}={value:.4f} " \
+                       f"worse than median {median:.4f}"
+        return None
+
+
+class LocalRunner:
+    """
+    시도를 로컬 프로세스로 수행합니다. 기본 명령은 src/main.py (컨테이너 진입점) 이며
+    학습 지표는 --sweep_metrics_path 의 JSON lines 파일에서 읽습니다.
+    """
+    def __init__(self, trial_dir, log_dir, command=None):
+        self.trial_dir = trial_dir
+        self.log_dir = log_dir
+        self.command = shlex.split(command) if command else [sys.executable, "main.py"]
+
+    def metrics_path(self, trial):
+        return os.path.abspath(os.path.join(self.trial_dir, trial["id"], METRICS_FILE))
+
+    def make_command(self, trial, argv):
+        return [
+            *self.command, *argv,
+            "--checkpoint_dir", os.path.dirname(self.metrics_path(trial)),
+            "--sweep_trial_id", trial["id"],
+            "--sweep_metrics_path", self.metrics_path(trial),
+        ]
+
+    def start(self, trial, argv):
+        # 같은 시도를 다시 수행하면 이전 지표는 지웁니다
+        if os.path.exists(self.metrics_path(trial)):
+            os.remove(self.metrics_path(trial))
+        log = open(os.path.join(self.log_dir, f"{trial['job_name']}.log"), "w")
+        process = subprocess.Popen(
+            self.make_command(trial, argv),
+            cwd=os.path.join(project_dir, "src"),
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        log.close()
+        return process
+
+    def metrics(self, trial):
+        path = self.metrics_path(trial)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+        # 기록 중인 마지막 줄은 건너뜁니다
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+        return records
+
+    def stop(self, trial, process):
+        process.terminate()
+
+
+class SageMakerRunner:
+    """
+    시도를 main_with_sagemaker.py 학습 작업으로 수행합니다.
+    학습 지표는 Estimator metric_definitions 로 수집된 CloudWatch 지표에서 읽으며
+    데이터 포인트 순서를 에폭으로 사용합니다. (에폭 간격이 1분 이상이라고 가정)
+    """
+    def __init__(self, log_dir, metrics):
+        import boto3
+
+        self.log_dir = log_dir
+        self.metric_names = metrics
+        self.sagemaker = boto3.client("sagemaker")
+        self.cloudwatch = boto3.client("cloudwatch")
+
+    def make_command(self, trial, argv):
+        return [
+            "python", "main_with_sagemaker.py", *argv,
+            "--sweep_trial_id", trial["id"],
+            "--sweep_metrics_path", f"/opt/ml/checkpoints/{METRICS_FILE}",
+        ]
+
+    def start(self, trial, argv):
+        log = open(os.path.join(self.log_dir, f"{trial['job_name']}.log"), "w")
+        process = subprocess.Popen(
+            self.make_command(trial, argv),
+            cwd=os.path.join(project_dir, "src"),
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        log.close()
+        return process
+
+    def metrics(self, trial):
+        response = self.cloudwatch.get_metric_data(
+            MetricDataQueries=[
+                {
+                    "Id": f"m{i}",
+                    "MetricStat": {
+                        "Metric": {
+                            "Namespace": SAGEMAKER_METRIC_NAMESPACE,
+                            "MetricName": name,
+                            "Dimensions": [
+                                {"Name": "TrainingJobName", "Value": trial["job_name"]}
+                            ],
+                        },
+                        "Period": 60,
+                        "Stat": "Average",
+                    },
+                    "Label": name,
+                }
+                for i, name in enumerate(self.metric_names)
+            ],
+            StartTime=trial["started_at"] - 60,
+            EndTime=time.time() + 60,
+            ScanBy="TimestampAscending",
+        )
+        records = {}
+        for result in response["MetricDataResults"]:
+            for epoch, value in enumerate(result["Values"], start=1):
+                records.setdefault(epoch, {"epoch": epoch})[result["Label"]] = value
+        return [records[epoch] for epoch in sorted(records)]
+
+    def stop(self, trial, process):
+        try:
+            self.sagemaker.stop_training_job(TrainingJobName=trial["job_name"])
+        except self.sagemaker.exceptions.ClientError as e:
+            logging.warning(f"{trial['id']} stop failed : {e}")
+        process.terminate()
+
+
+class Sweep:
+    """
+    train 태스크의 하이퍼파라미터 탐색을 동시성/예산 제한 하에 병렬로 수행합니다.
+
+    설정 파일의 train 파라미터를 기본값으로 시도별 파라미터만 덮어쓰며, 중간 검증 지표로
+    가망 없는 시도를 조기 중단합니다. 결과는 state_dir 의 리더보드 파일 하나로 모입니다.
+    진행 상태는 state 파일에 기록되며 중단 이후 같은 명령으로 이어서 수행합니다.
+    (탐색 공간을 바꿔 새로 시작하려면 다른 name 을 쓰거나 state 파일을 지웁니다)
+    """
+    def __init__(
+        self,
+        namespace,
+        service_name,
+        base_date,
+        name=None,
+        strategy=None,
+        space=None,
+        metric=None,
+        mode=None,
+        num_trials=None,
+        max_epochs=None,
+        min_epochs=1,
+        eta=3,
+        early_stopping=None,
+        max_concurrency=2,
+        max_total_epochs=None,
+        max_seconds=None,
+        runner="local",
+        command=None,
+        task="train",
+        poll_seconds=5,
+        seed=0,
+        state_dir=".sweep",
+        dry_run=False
+    ):
+        sweep_config = load_sweep_config(namespace, service_name)
+        self.namespace = namespace
+        self.base_date = base_date
+        self.name = name or sweep_config.get("name", "hp")
+        self.strategy = strategy or sweep_config.get("strategy", "random")
+        self.metric = metric or sweep_config.get("metric", "valid_ndcg")
+        self.mode = mode or sweep_config.get("mode", "max")
+        self.task = task
+        self.task_params = dict(get_task_params(
+            get_config(namespace=namespace, service_name=service_name), task
+        ))
+        self.max_epochs = int(max_epochs or self.task_params.get("epoch", 10))
+        self.max_concurrency = max_concurrency
+        self.max_total_epochs = max_total_epochs
+        self.max_seconds = max_seconds
+        self.poll_seconds = poll_seconds
+        self.dry_run = dry_run
+
+        space = space or sweep_config.get("space")
+        if not space:
+            raise ValueError("탐색 공간이 없습니다. --space 또는 설정 파일의 sweep.space 를 지정하세요")
+        if isinstance(space, str):
+            with open(space, "r") as f:
+                space = json.load(f)
+        num_trials = num_trials or sweep_config.get("num_trials", 8)
+        if early_stopping is None:
+            early_stopping = "halving" if self.strategy == "halving" else "median"
+        self.early_stopping = EarlyStopping(
+            rule=early_stopping,
+            metric=self.metric,
+            mode=self.mode,
+            max_epochs=self.max_epochs,
+            min_epochs=min_epochs,
+            eta=eta,
+        )
+
+        self.state_path = os.path.join(state_dir, f"{namespace}-{service_name}-sweep-{self.name}.json")
+        self.leaderboard_path = os.path.join(
+            state_dir, f"{namespace}-{service_name}-sweep-{self.name}-leaderboard.json"
+        )
+        self.log_dir = os.path.join(state_dir, "logs")
+        os.makedirs(self.log_dir, exist_ok=True)
+        if runner == "local":
+            self.runner = LocalRunner(os.path.join(state_dir, "trials"), self.log_dir, command)
+        elif runner == "sagemaker":
+            self.runner = SageMakerRunner(self.log_dir, [self.metric])
+        else:
+            raise ValueError(f"지원하지 않는 실행 방식입니다 : {runner} (local / sagemaker)")
+
+        self.trials = self.load_state()
+        if self.trials is not None:
+            return
+        self.trials = [
+            {
+                "id": f"t{i:03d}",
+                "params": params,
+                "status": PENDING,
+                "attempt": 0,
+                "job_name": None,
+                "epochs": 0,
+                "best": None,
+                "history": [],
+                "rungs": [],
+                "stopped_reason": None,
+                "started_at": None,
+                "finished_at": None,
+            }
+            for i, params in enumerate(make_trials(self.strategy, space, num_trials, seed=seed))
+        ]
+        self.save_state()
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, "r") as f:
+            trials = json.load(f)
+        for trial in trials:
+            # 중단 시점에 수행 중이던 시도는 처음부터 다시 수행합니다
+            if trial["status"] == RUNNING or trial["stopped_reason"] == INTERRUPTED:
+                trial.update(
+                    status=PENDING, epochs=0, best=None, history=[], rungs=[],
+                    stopped_reason=None, started_at=None, finished_at=None,
+                )
+        logging.info(f"resume sweep : {self.state_path}")
+        return trials
+
+    def save_state(self):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.trials, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def make_argv(self, trial):
+        params = {**self.task_params, **trial["params"], "epoch": self.max_epochs}
+        return make_argv(
+            namespace=self.namespace,
+            task_name=self.task,
+            base_date=self.base_date,
+            job=trial["job_name"],
+            dependency_job=None,
+            params=params,
+        )
+
+    def spent_epochs(self):
+        return sum(trial["epochs"] for trial in self.trials)
+
+    def has_budget(self, running, started_at):
+        """ 새 시도를 시작해도 되는지. 수행 중인 시도는 max_epochs 까지 간다고 보고 계산합니다. """
+        if len(running) >= self.max_concurrency:
+            return False
+        if self.max_seconds and time.time() - started_at >= self.max_seconds:
+            return False
+        if self.max_total_epochs is None:
+            return True
+        reserved = sum(self.max_epochs - trial["epochs"] for trial in running.values())
+        return self.spent_epochs() + reserved + self.max_epochs <= self.max_total_epochs
+
+    def update_metrics(self, trial):
+        try:
+            history = self.runner.metrics(trial)
+        except Exception as e:
+            logging.warning(f"{trial['id']} metrics : {e}")
+            return
+        if not history:
+            return
+        trial["history"] = history
+        trial["epochs"] = max(record["epoch"] for record in history)
+        trial["best"] = self.early_stopping.best_until(history, trial["epochs"])
+
+    def start(self, trial):
+        trial["job_name"] = make_job_name(
+            namespace=self.namespace,
+            model_name=self.task_params.get("model_name"),
+            sweep_name=self.name,
+            trial_id=trial["id"],
+            attempt=trial["attempt"] + 1,
+        )
+        trial["status"] = RUNNING
+        trial["started_at"] = time.time()
+        argv = self.make_argv(trial)
+        logging.info(f"start {trial['id']} {trial['params']}")
+        if self.dry_run:
+            logging.info(f"{trial['id']} : {' '.join(self.runner.make_command(trial, argv))}")
+            trial["status"] = PENDING
+            return None
+        trial["attempt"] += 1
+        return self.runner.start(trial, argv)
+
+    def stop(self, trial, process, reason):
+        logging.info(f"stop {trial['id']} : {reason}")
+        self.runner.stop(trial, process)
+        try:
+            process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        trial["status"] = STOPPED
+        trial["stopped_reason"] = reason
+        trial["finished_at"] = time.time()
+
+    def poll(self, running, started_at):
+        for process, trial in list(running.items()):
+            self.update_metrics(trial)
+            returncode = process.poll()
+            if returncode is not None:
+                running.pop(process)
+                # 종료 직후 남은 지표까지 읽습니다
+                self.update_metrics(trial)
+                trial["status"] = SUCCEEDED if returncode == 0 else FAILED
+                trial["finished_at"] = time.time()
+                if returncode == 0 and not trial["history"]:
+                    # 지표가 없으면 순위를 매길 수 없으므로 성공으로 두지 않습니다
+                    logging.error(
+                        f"{trial['id']} finished without metrics. "
+                        f"the command must report {self.metric} (common.sweep.TrialReporter)"
+                    )
+                    trial["status"] = FAILED
+                    trial["stopped_reason"] = NO_METRICS
+                logging.info(f"{trial['status']} {trial['id']} best {self.metric}={trial['best']}")
+                continue
+
+            reason = self.early_stopping.should_stop(trial, self.trials)
+            if reason is None and self.max_seconds \
+                    and time.time() - started_at >= self.max_seconds:
+                reason = f"max_seconds {self.max_seconds} exceeded"
+            if reason is None and self.max_total_epochs \
+                    and self.spent_epochs() >= self.max_total_epochs:
+                reason = f"max_total_epochs {self.max_total_epochs} exceeded"
+            if reason:
+                running.pop(process)
+                self.stop(trial, process, reason)
+
+    def leaderboard(self):
+        """ 지표가 좋은 순서. 지표가 없는 시도는 뒤에 둡니다. """
+        reverse = self.mode == "max"
+        scored = sorted(
+            [trial for trial in self.trials if trial["best"] is not None],
+            key=lambda trial: trial["best"], reverse=reverse,
+        )
+        rows = []
+        for rank, trial in enumerate(
+            scored + [trial for trial in self.trials if trial["best"] is None], start=1
+        ):
+            rows.append({
+                "rank": rank if trial["best"] is not None else None,
+                "id": trial["id"],
+                "params": trial["params"],
+                "status": trial["status"],
+                "epochs": trial["epochs"],
+                self.metric: trial["best"],
+                "last": trial["history"][-1] if trial["history"] else None,
+                "stopped_reason": trial["stopped_reason"],
+                "job_name": trial["job_name"],
+                "seconds": round(trial["finished_at"] - trial["started_at"], 1)
+                if trial["started_at"] and trial["finished_at"] else None,
+            })
+        return rows
+
+    def write_leaderboard(self, started_at):
+        counts = {}
+        for trial in self.trials:
+            counts[trial["status"]] = counts.get(trial["status"], 0) + 1
+        result = {
+            "name": self.name,
+            "strategy": self.strategy,
+            "early_stopping": self.early_stopping.rule,
+            "metric": self.metric,
+            "mode": self.mode,
+            "max_epochs": self.max_epochs,
+            "max_concurrency": self.max_concurrency,
+            "spent_epochs": self.spent_epochs(),
+            "seconds": round(time.time() - started_at, 1),
+            "counts": counts,
+            "trials": self.leaderboard(),
+        }
+        tmp_path = f"{self.leaderboard_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f, indent=2)
+        os.replace(tmp_path, self.leaderboard_path)
+        return result
+
+    def run(self):
+        started_at = time.time()
+        running = {}
+        pending = [trial for trial in self.trials if trial["status"] == PENDING]
+        if self.dry_run:
+            for trial in pending:
+                self.start(trial)
+            return self.write_leaderboard(started_at)
+
+        try:
+            while pending or running:
+                while pending and self.has_budget(running, started_at):
+                    trial = pending.pop(0)
+                    running[self.start(trial)] = trial
+                if pending and not running:
+                    # 예산이 남지 않아 더 시작할 수 없습니다
+                    logging.info(f"budget exhausted : {len(pending)} trials not started")
+                    break
+                time.sleep(self.poll_seconds)
+                self.poll(running, started_at)
+                self.save_state()
+                self.write_leaderboard(started_at)
+        finally:
+            for process, trial in running.items():
+                self.stop(trial, process, INTERRUPTED)
+            self.save_state()
+
+        result = self.write_leaderboard(started_at)
+        logging.info(
+            f"sweep {self.name} : {result['counts']}, {result['spent_epochs']} epochs, "
+            f"{result['seconds']}s -> {self.leaderboard_path}"
+        )
+        return result
+
+
+def plan(namespace, service_name, strategy=None, space=None, num_trials=None, seed=0):
+    """ 시도 목록만 출력합니다. """
+    sweep_config = load_sweep_config(namespace, service_name)
+    trials = make_trials(
+        strategy or sweep_config.get("strategy", "random"),
+        space or sweep_config.get("space"),
+        num_trials or sweep_config.get("num_trials", 8),
+        seed=seed,
+    )
+    for i, params in enumerate(trials):
+        print(f"t{i:03d} {json.dumps(params)}")
+    return len(trials)
+
+
+def run(
+    namespace,
+    service_name,
+    base_date,
+    name=None,
+    strategy=None,
+    space=None,
+    metric=None,
+    mode=None,
+    num_trials=None,
+    max_epochs=None,
+    min_epochs=1,
+    eta=3,
+    early_stopping=None,
+    max_concurrency=2,
+    max_total_epochs=None,
+    max_seconds=None,
+    runner="local",
+    command=None,
+    poll_seconds=5,
+    seed=0,
+    state_dir=".sweep",
+    dry_run=False
+):
+    """
+    :param strategy: grid / random / halving (기본값은 설정 파일의 sweep.strategy)
+    :param space: {파라미터: 값 목록 또는 {"low", "high", "log", "type"}} 또는 JSON 파일 경로
+    :param early_stopping: halving / median / none (기본값은 halving 탐색이면 halving, 그 외 median)
+    :param max_total_epochs: 모든 시도의 에폭 합 상한
+    :param max_seconds: 전체 수행 시간 상한
+    :param runner: local (src/main.py 프로세스) / sagemaker (main_with_sagemaker.py 학습 작업)
+    :param command: local 실행 명령 (기본 "python main.py", src 에서 실행)
+
+    현재 학습 태스크는 TrialReporter 지표나 name=value 로그를 남기지 않으며,
+    지표를 보고하는 학습은 benchmark/sweep_trainer.py 뿐입니다.
+    (local: --command "python -m benchmark.sweep_trainer")
+    지표 없이 종료한 시도는 실패로 기록되어 명령이 0 이 아닌 코드로 끝납니다.
+    """
+    result = Sweep(
+        namespace=namespace,
+        service_name=service_name,
+        base_date=base_date,
+        name=name,
+        strategy=strategy,
+        space=space,
+        metric=metric,
+        mode=mode,
+        num_trials=num_trials,
+        max_epochs=max_epochs,
+        min_epochs=min_epochs,
+        eta=eta,
+        early_stopping=early_stopping,
+        max_concurrency=max_concurrency,
+        max_total_epochs=max_total_epochs,
+        max_seconds=max_seconds,
+        runner=runner,
+        command=command,
+        poll_seconds=poll_seconds,
+        seed=seed,
+        state_dir=state_dir,
+        dry_run=dry_run,
+    ).run()
+    for row in result["trials"][:5]:
+        print(f"{row['rank'] or '-':>3} {row['id']} {row['status']:<9} "
+              f"epochs {row['epochs']:>3} {result['metric']}={row[result['metric']]} {row['params']}")
+    if result["counts"].get(FAILED):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    fire.Fire({
+        "plan": plan,
+        "run": run,
+    })
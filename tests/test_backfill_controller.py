@@ -0,0 +1,37 @@
+import os
+import subprocess
+
+import backfill_controller
+from backfill_controller import SUCCEEDED, Backfill
+
+
+def make_backfill(state_dir, dry_run):
+    return Backfill(
+        namespace="dev",
+        service_name="like-movie",
+        start_date="2024-03-01",
+        end_date="2024-03-02",
+        state_dir=str(state_dir),
+        dry_run=dry_run,
+    )
+
+
+def test_dry_run_does_not_cancel_real_run(tmp_path, monkeypatch):
+    """ dry_run 뒤의 실제 수행도 모든 작업을 수행해야 합니다. """
+    commands = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0)
+
+    monkeypatch.setattr(backfill_controller.subprocess, "run", fake_run)
+
+    dry_run = make_backfill(tmp_path, dry_run=True)
+    dry_run.run()
+    assert commands == []
+    assert not os.path.exists(dry_run.state_path)
+
+    backfill = make_backfill(tmp_path, dry_run=False)
+    counts = backfill.run()
+    assert len(commands) == len(backfill.jobs)
+    assert counts == {SUCCEEDED: len(backfill.jobs)}
@@ -0,0 +1,110 @@
+import os
+import sys
+import copy
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "mlops-dags"))
+from ecs_task_definition import TaskDefinitionRegistry, make_task_definition  # noqa: E402
+
+
+FAMILY = "dev-like-movie"
+LATEST_ARN = f"arn:aws:ecs:ap-northeast-2:123456789012:task-definition/{FAMILY}:3"
+NEW_ARN = f"arn:aws:ecs:ap-northeast-2:123456789012:task-definition/{FAMILY}:4"
+
+
+def make_definition(**kwargs):
+    params = dict(
+        family=FAMILY,
+        container_name="like-movie",
+        image_uri="123456789012.dkr.ecr.ap-northeast-2.amazonaws.com/like-movie:1.0.0",
+        cpu=1024,
+        memory=2048,
+        task_role_arn="arn:aws:iam::123456789012:role/task",
+        execution_role_arn="arn:aws:iam::123456789012:role/execution",
+    )
+    params.update(kwargs)
+    return make_task_definition(**params)
+
+
+def describe_response(task_definition):
+    """ describe_task_definition 응답처럼 기본값과 메타데이터가 붙은 리비전 """
+    latest = copy.deepcopy(task_definition)
+    latest.update({
+        "taskDefinitionArn": LATEST_ARN,
+        "revision": 3,
+        "status": "ACTIVE",
+        "compatibilities": ["EC2", "FARGATE"],
+    })
+    for container in latest["containerDefinitions"]:
+        container["systemControls"] = []
+    return {"taskDefinition": latest}
+
+
+@pytest.fixture
+def ecs():
+    client = boto3.client(
+        "ecs", region_name="ap-northeast-2",
+        aws_access_key_id="testing", aws_secret_access_key="testing",
+    )
+    with Stubber(client) as stubber:
+        yield client, stubber
+        stubber.assert_no_pending_responses()
+
+
+def test_unchanged_definition_is_not_registered(ecs):
+    client, stubber = ecs
+    stubber.add_response(
+        "describe_task_definition", describe_response(make_definition()),
+        {"taskDefinition": FAMILY},
+    )
+
+    registry = TaskDefinitionRegistry(client)
+    assert registry.ensure(make_definition()) == (LATEST_ARN, False)
+    # 같은 프로세스의 두 번째 확인은 캐시를 사용해 API 를 호출하지 않습니다
+    assert registry.ensure(make_definition()) == (LATEST_ARN, False)
+
+
+@pytest.mark.parametrize("change", [
+    lambda d: d["containerDefinitions"][0].update(image=d["containerDefinitions"][0]["image"] + "1"),
+    lambda d: d.update(cpu="2048"),
+    lambda d: d.update(memory="4096"),
+    lambda d: d["containerDefinitions"][0]["logConfiguration"]["options"].update(
+        {"awslogs-stream-prefix": "batch"}
+    ),
+], ids=["image", "cpu", "memory", "log_config"])
+def test_changed_definition_is_registered_once(ecs, change):
+    client, stubber = ecs
+    desired = make_definition()
+    change(desired)
+    stubber.add_response(
+        "describe_task_definition", describe_response(make_definition()),
+        {"taskDefinition": FAMILY},
+    )
+    stubber.add_response(
+        "register_task_definition",
+        {"taskDefinition": {"taskDefinitionArn": NEW_ARN, "revision": 4}},
+        desired,
+    )
+
+    registry = TaskDefinitionRegistry(client)
+    assert registry.ensure(desired) == (NEW_ARN, True)
+    assert registry.ensure(desired) == (NEW_ARN, False)
+
+
+def test_first_registration_of_family(ecs):
+    client, stubber = ecs
+    stubber.add_client_error(
+        "describe_task_definition", service_error_code="ClientException",
+        service_message="Unable to describe task definition.",
+    )
+    stubber.add_response(
+        "register_task_definition",
+        {"taskDefinition": {"taskDefinitionArn": NEW_ARN, "revision": 1}},
+        make_definition(),
+    )
+
+    registry = TaskDefinitionRegistry(client)
+    assert registry.ensure(make_definition()) == (NEW_ARN, True)
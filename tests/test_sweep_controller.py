@@ -0,0 +1,20 @@
+import sys
+
+from sweep_controller import FAILED, NO_METRICS, Sweep
+
+
+def test_trial_without_metrics_fails(tmp_path):
+    """ 지표를 남기지 않고 정상 종료한 시도는 성공으로 기록하지 않습니다. """
+    sweep = Sweep(
+        namespace="dev",
+        service_name="like-movie",
+        base_date="2024-03-01",
+        strategy="grid",
+        space={"learning_rate": [0.01]},
+        command=f"{sys.executable} -c pass",
+        poll_seconds=0.1,
+        state_dir=str(tmp_path),
+    )
+    result = sweep.run()
+    assert result["counts"] == {FAILED: 1}
+    assert result["trials"][0]["stopped_reason"] == NO_METRICS